@@ -0,0 +1,129 @@
+"""Seeded generator of synthetic OPML documents.
+
+The same arguments (seed included) always generate the same document, so benchmark results can be compared between
+runs and releases.
+
+Usage: python benchmarks/corpus.py [--outlines N] [--depth N] [--fan-out N] [--mix rss=70,link=20,...] [--seed N] output.opml
+"""
+from datetime import datetime, timedelta, timezone
+from opml import OpmlDocument
+import argparse
+import random
+
+# Relative weights of the kind of leaf outlines generated
+DEFAULT_MIX = {
+    'rss': 70,
+    'link': 20,
+    'include': 5,
+    'text': 5,
+}
+
+WORDS = (
+    'intelligence', 'campus', 'operations', 'news', 'world', 'feed', 'analysis', 'report', 'daily', 'security',
+    'markets', 'science', 'politics', 'technology', 'culture', 'sports', 'weather', 'travel', 'review', 'digest',
+)
+
+HOSTS = ('hendley-associates.com', 'example.com', 'example.org', 'news.example.net', 'feeds.example.io')
+LANGUAGES = ('en_US', 'en_GB', 'fr_FR', 'de_DE', 'es_ES')
+VERSIONS = ('RSS', 'RSS1', 'RSS2', 'scriptingNews')
+CATEGORIES = ('/Intelligence/USA', '/Intelligence/Russia', '/News/World', '/News/Europe', 'intelligence', 'news', 'tech')
+
+
+def generate(outlines=10000, depth=3, fan_out=10, mix=None, seed=0):
+    """Generate a document containing ``outlines`` outlines.
+
+    The document is made of as many top-level outlines as needed, each one being the root of a subtree ``depth``
+    levels deep in which every outline has ``fan_out`` children (the last subtree may be incomplete). Outlines at the
+    last level are leaves whose kind is randomly picked according to the ``mix`` weights, the other ones are folders.
+    """
+    rand = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    kinds = list(mix.keys())
+    weights = list(mix.values())
+    base_date = datetime(2021, 9, 16, 20, 7, 59, tzinfo=timezone.utc)
+    dates = [base_date - timedelta(days=i) for i in range(16)]
+
+    document = OpmlDocument(
+        title='Synthetic document ({} outlines, seed {})'.format(outlines, seed),
+        date_created=base_date,
+        date_modified=base_date,
+        owner_name='Gerry Hendley',
+        owner_email='gerry@hendley-associates.com'
+    )
+
+    count = 0
+
+    while count < outlines:
+        parents = [document]
+
+        for level in range(1, depth + 1):
+            children = []
+
+            for parent in parents:
+                for i in range(1 if level == 1 else fan_out):
+                    if count >= outlines:
+                        break
+
+                    count += 1
+
+                    text = '{} #{}'.format(' '.join(rand.sample(WORDS, 3)).title(), count)
+
+                    if level < depth:
+                        children.append(parent.add_outline(text))
+                    else:
+                        add_leaf(rand, parent, text, count, rand.choices(kinds, weights)[0], dates)
+
+            parents = children
+
+    return document
+
+
+def add_leaf(rand, parent, text, count, kind, dates):
+    host = rand.choice(HOSTS)
+    kvargs = {
+        'created': rand.choice(dates) if rand.random() < 0.5 else None,
+        'categories': rand.sample(CATEGORIES, rand.randint(0, 2)),
+    }
+
+    if kind == 'rss':
+        parent.add_rss(
+            text,
+            'https://{}/feeds/{}.rss'.format(host, count),
+            description=text if rand.random() < 0.5 else None,
+            html_url='https://{}/'.format(host),
+            language=rand.choice(LANGUAGES),
+            title=text,
+            version=rand.choice(VERSIONS),
+            **kvargs
+        )
+    elif kind == 'link':
+        parent.add_link(text, 'https://{}/articles/{}.html'.format(host, count), **kvargs)
+    elif kind == 'include':
+        parent.add_include(text, 'https://{}/opml/{}.opml'.format(host, count), **kvargs)
+    else:
+        parent.add_outline(text, **kvargs)
+
+
+def parse_mix(value):
+    return {
+        kind: int(weight) for kind, weight in (pair.split('=') for pair in value.split(','))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic OPML document.')
+    parser.add_argument('output')
+    parser.add_argument('--outlines', type=int, default=10000)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--fan-out', type=int, default=10)
+    parser.add_argument('--mix', type=parse_mix, default=None, help='Comma-separated kind=weight pairs, kind being one of rss, link, include or text')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pretty', action='store_true')
+
+    args = parser.parse_args()
+
+    generate(args.outlines, args.depth, args.fan_out, args.mix, args.seed).dump(args.output, pretty=args.pretty)
+
+
+if __name__ == '__main__':
+    main()
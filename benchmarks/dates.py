@@ -0,0 +1,38 @@
+"""Compare opml.dates with the email.utils functions it replaces, on date-times as found in exports: many outlines
+sharing a few distinct values, and all distinct values (i.e. without any help from the caches).
+
+Usage: python benchmarks/dates.py
+"""
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timedelta
+from opml import dates
+import timeit
+
+
+def measure(name, func, values, number=5):
+    def run():
+        dates.clear()
+
+        for value in values:
+            func(value)
+
+    best = min(timeit.repeat(run, number=1, repeat=number))
+
+    print('{:<40} {:>10.0f} values/s'.format(name, len(values) / best))
+
+
+def main():
+    start = datetime(2021, 9, 16, 20, 7, 59)
+
+    for label, distinct in (('10 distinct', 10), ('all distinct', 100000)):
+        values = [start + timedelta(minutes=i % distinct) for i in range(100000)]
+        strings = [format_datetime(value) for value in values]
+
+        measure('email.utils.format_datetime ({})'.format(label), format_datetime, values)
+        measure('opml.dates.datetime_to_rfc2822 ({})'.format(label), dates.datetime_to_rfc2822, values)
+        measure('email.utils.parsedate_to_datetime ({})'.format(label), parsedate_to_datetime, strings)
+        measure('opml.dates.rfc2822_to_datetime ({})'.format(label), dates.rfc2822_to_datetime, strings)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Measure opml.diff.diff and opml.diff.merge on synthetic documents in which a small share of outlines changed.
+
+Usage: python benchmarks/diff.py
+"""
+from opml.packed import pack, unpack
+from opml.diff import diff, merge
+from corpus import generate
+import random
+import timeit
+
+
+def edit(document, count, seed):
+    rand = random.Random(seed)
+    folders = list(document.outlines)
+
+    for i in range(count):
+        folder = rand.choice(folders)
+        outlines = folder.outlines
+
+        if not outlines:
+            continue
+
+        outline = rand.choice(outlines)
+        action = i % 4
+
+        if action == 0:
+            outline.title = 'Edited #{}'.format(i)
+        elif action == 1:
+            folder.remove_outline(outline)
+        elif action == 2:
+            folder.add_rss('Added #{}'.format(i), 'https://example.com/added/{}.rss'.format(i))
+        else:
+            target = rand.choice(folders)
+
+            folder.remove_outline(outline)
+            target.outlines.append(outline)
+
+            outline.parent = target
+
+    return document
+
+
+def measure(count, number=3):
+    base = generate(count, depth=2, fan_out=100)
+    packed = pack(base)
+    ours = edit(unpack(packed), count // 100, 1)
+    theirs = edit(unpack(packed), count // 100, 2)
+
+    diff_time = min(timeit.repeat(lambda: diff(base, theirs), number=1, repeat=number))
+    merge_time = min(timeit.repeat(lambda: merge(base, unpack(pack(ours)), theirs), number=1, repeat=number))
+    copy_time = min(timeit.repeat(lambda: unpack(pack(ours)), number=1, repeat=number))
+
+    print('{:>8} outlines: diff {:.3f}s, merge {:.3f}s'.format(count, diff_time, merge_time - copy_time))
+
+
+def main():
+    measure(10000)
+    measure(100000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""Measure how many bytes each OpmlOutline instance costs once a document has been loaded.
+
+Usage: python benchmarks/outline_memory.py [number of outlines]
+"""
+from opml import OpmlDocument
+from corpus import generate
+import tracemalloc
+import sys
+
+
+def main(count):
+    root = generate(count, depth=2, fan_out=100).build_tree()
+
+    tracemalloc.start()
+
+    before = tracemalloc.get_traced_memory()[0]
+    document = OpmlDocument.unbuild_tree(root)
+    after = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+
+    print('{} outlines: {:.1f} bytes per outline (attribute values included)'.format(count, (after - before) / count))
+
+    return document
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
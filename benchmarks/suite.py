@@ -0,0 +1,181 @@
+"""Throughput and memory benchmark suite for loading and dumping OPML documents.
+
+Each phase is measured separately on documents generated by corpus.py:
+
+* parse: XML parsing by lxml (etree.fromstring)
+* unbuild: building OpmlDocument / OpmlOutline instances from the XML tree (OpmlDocument.unbuild_tree)
+* validate: validating all the outlines (OpmlOutline.validate)
+* build: building the XML tree from OpmlDocument / OpmlOutline instances (OpmlDocument.build_tree)
+* serialize: XML serialization by lxml (etree.tostring)
+* loads / dumps: the whole thing, end to end
+* loads-collect / dumps-collect: the same with an OpmlValidator collecting errors instead of raising them
+* loads-off / dumps-off: the same with validation turned off
+* dumps-incremental: OpmlDocument.dumps(incremental=True) after changing a single outline
+* dumps-parallel: OpmlDocument.dumps(workers=...) with one worker process per processor
+* selects: OpmlDocument.selects() of the outlines of type "rss" having a given category
+
+Timings are the best of several rounds to limit noise. Peak memory is measured in a separate round using tracemalloc,
+so it only accounts for memory allocated by Python (not by libxml2).
+
+Usage:
+
+    python benchmarks/suite.py [--rounds N] [--save results.json] [--compare results.json] [--tolerance 0.2]
+
+With --compare, the process exits with status 1 when any phase's throughput is lower than the saved one by more than
+the given tolerance.
+"""
+from opml import OpmlDocument, OpmlOutline
+from opml.exceptions import OpmlWriteError
+from opml.validation import OpmlValidator
+from opml.query import where, category
+from corpus import generate
+from lxml import etree
+import tracemalloc
+import argparse
+import json
+import os
+import sys
+import time
+
+CORPORA = {
+    'flat': dict(outlines=50000, depth=1, fan_out=1),
+    'folders': dict(outlines=50000, depth=2, fan_out=100),
+    'nested': dict(outlines=50000, depth=6, fan_out=4),
+}
+
+
+def validate_all(outlines):
+    for outline in outlines:
+        OpmlOutline.validate(OpmlWriteError, outline.text, outline.type, outline.xml_url, outline.version, outline.url)
+
+
+def edit_and_dump(document, outline):
+    outline.title = 'Edited' if outline.title != 'Edited' else None
+
+    return document.dumps(incremental=True)
+
+
+def make_phases(document):
+    data = document.dumps().encode()
+    root = etree.fromstring(data)
+    outlines = list(document.iter_outlines())
+    tree = document.build_tree()
+    string = data.decode()
+    query = where(type='rss') & category('news')
+
+    return len(data), [
+        ('parse', lambda: etree.fromstring(data)),
+        ('unbuild', lambda: OpmlDocument.unbuild_tree(root)),
+        ('validate', lambda: validate_all(outlines)),
+        ('build', document.build_tree),
+        ('serialize', lambda: etree.tostring(tree, encoding='UTF-8', xml_declaration=True)),
+        ('loads', lambda: OpmlDocument.loads(string)),
+        ('dumps', document.dumps),
+        ('loads-collect', lambda: OpmlDocument.loads(string, validation=OpmlValidator())),
+        ('dumps-collect', lambda: document.dumps(validation=OpmlValidator())),
+        ('loads-off', lambda: OpmlDocument.loads(string, validation='off')),
+        ('dumps-off', lambda: document.dumps(validation='off')),
+        ('dumps-incremental', lambda: edit_and_dump(document, outlines[len(outlines) // 2])),
+        ('dumps-parallel', lambda: document.dumps(workers=os.cpu_count())),
+        ('selects', lambda: OpmlDocument.selects(string, query)),
+    ]
+
+
+def measure(func, rounds):
+    best = None
+
+    for i in range(rounds):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+
+    try:
+        func()
+
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return best, peak
+
+
+def run(rounds):
+    results = {}
+
+    for corpus, kvargs in CORPORA.items():
+        size, phases = make_phases(generate(**kvargs))
+        count = kvargs['outlines']
+
+        for phase, func in phases:
+            elapsed, peak = measure(func, rounds)
+
+            results['{}/{}'.format(corpus, phase)] = {
+                'outlines_per_second': count / elapsed,
+                'mb_per_second': size / elapsed / 1024 / 1024,
+                'peak_memory_mb': peak / 1024 / 1024,
+            }
+
+    return results
+
+
+def report(results, baseline=None):
+    print('{:<20} {:>14} {:>10} {:>12} {:>10}'.format('benchmark', 'outlines/s', 'MB/s', 'peak MB', 'change'))
+
+    for name, result in results.items():
+        change = ''
+
+        if baseline and name in baseline:
+            change = '{:+.1%}'.format(result['outlines_per_second'] / baseline[name]['outlines_per_second'] - 1)
+
+        print('{:<20} {:>14,.0f} {:>10.1f} {:>12.1f} {:>10}'.format(
+            name,
+            result['outlines_per_second'],
+            result['mb_per_second'],
+            result['peak_memory_mb'],
+            change
+        ))
+
+
+def find_regressions(results, baseline, tolerance):
+    return [
+        name for name, result in results.items() if name in baseline and result['outlines_per_second'] < baseline[name]['outlines_per_second'] * (1 - tolerance)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the benchmark suite.')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--save', help='Save results to this JSON file')
+    parser.add_argument('--compare', help='Compare results with the ones saved in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed throughput decrease when comparing')
+
+    args = parser.parse_args()
+
+    results = run(args.rounds)
+    baseline = None
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+
+    report(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if baseline:
+        regressions = find_regressions(results, baseline, args.tolerance)
+
+        if regressions:
+            print('Regressions: {}'.format(', '.join(regressions)))
+
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Measure OpmlDocument.build_tree and OpmlDocument.unbuild_tree on deep, wide and balanced synthetic trees.
+
+Usage: python benchmarks/traversal.py
+"""
+from opml import OpmlDocument
+from corpus import generate
+import timeit
+
+
+def measure(name, document, count, number=3):
+    try:
+        build = min(timeit.repeat(document.build_tree, number=1, repeat=number))
+        root = document.build_tree()
+        unbuild = min(timeit.repeat(lambda: OpmlDocument.unbuild_tree(root), number=1, repeat=number))
+    except RecursionError:
+        print('{:<10} {:>8} outlines: RecursionError'.format(name, count))
+
+        return
+
+    print('{:<10} {:>8} outlines: build {:>8.0f} outlines/s, unbuild {:>8.0f} outlines/s'.format(
+        name,
+        count,
+        count / build,
+        count / unbuild
+    ))
+
+
+def main():
+    measure('deep', generate(400, depth=400, fan_out=1), 400)
+    measure('deep', generate(10000, depth=10000, fan_out=1), 10000)
+    measure('wide', generate(100000, depth=1), 100000)
+    measure('balanced', generate(100000, depth=9, fan_out=4), 100000)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 from opml.document import OpmlDocument
 from opml.outline import OpmlOutline
+from opml.stream import OpmlWriter
 
 __version__ = '1.0.0'
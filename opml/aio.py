@@ -0,0 +1,50 @@
+from functools import partial
+import asyncio
+import inspect
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def run(executor, func, *args, **kvargs):
+    """Run a function in an executor (or in the loop's default one if ``None``) and return its result."""
+    return await asyncio.get_event_loop().run_in_executor(executor, partial(func, *args, **kvargs))
+
+
+async def call(func, *args):
+    """Call a file-like object's method: directly if it's a coroutine function (e.g. for async file objects), in the
+    loop's default executor otherwise."""
+    result = func(*args) if inspect.iscoroutinefunction(func) else await run(None, func, *args)
+
+    if inspect.isawaitable(result):
+        result = await result
+
+    return result
+
+
+async def read_chunks(fp, chunk_size=CHUNK_SIZE):
+    """Asynchronously read a filename or (sync or async) file-like object chunk by chunk."""
+    f = await run(None, open, fp, 'rb') if isinstance(fp, str) else fp
+
+    try:
+        while True:
+            chunk = await call(f.read, chunk_size)
+
+            if not chunk:
+                break
+
+            yield chunk
+    finally:
+        if f is not fp:
+            await run(None, f.close)
+
+
+async def write_chunks(fp, data, chunk_size=CHUNK_SIZE):
+    """Asynchronously write data to a filename or (sync or async) file-like object chunk by chunk."""
+    f = await run(None, open, fp, 'wb') if isinstance(fp, str) else fp
+
+    try:
+        for i in range(0, len(data), chunk_size):
+            await call(f.write, data[i:i + chunk_size])
+    finally:
+        if f is not fp:
+            await run(None, f.close)
@@ -0,0 +1,125 @@
+"""Compressed OPML documents, read and written chunk by chunk through the codec's file object.
+
+Supported codecs are ``gzip``, ``bz2``, ``xz`` and ``zstd``. The latter requires the
+`zstandard <https://pypi.org/project/zstandard/>`__ package (``pip install pyopml[zstd]``).
+"""
+from contextlib import contextmanager
+import os
+
+CODECS = ('gzip', 'bz2', 'xz', 'zstd')
+
+EXTENSIONS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+    '.zst': 'zstd',
+}
+
+MAGIC_NUMBERS = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+
+
+def detect(fp):
+    """Detect the codec a filename or file-like object is compressed with, from its first bytes. File-like objects
+    must support either ``peek`` or ``seek``, otherwise they are assumed not to be compressed.
+
+    :param fp: A filename or file-like object
+    :rtype: str or None
+    """
+    if isinstance(fp, str):
+        with open(fp, 'rb') as f:
+            header = f.read(6)
+    elif hasattr(fp, 'peek'):
+        header = fp.peek(6)[:6]
+    elif hasattr(fp, 'seekable') and fp.seekable():
+        position = fp.tell()
+        header = fp.read(6)
+
+        fp.seek(position)
+    else:
+        return None
+
+    if not isinstance(header, bytes):
+        return None
+
+    for magic_number, codec in MAGIC_NUMBERS:
+        if header.startswith(magic_number):
+            return codec
+
+    return None
+
+
+def infer(fp):
+    """Infer the codec a filename should be compressed with from its extension.
+
+    :param fp: A filename or file-like object
+    :rtype: str or None
+    """
+    if not isinstance(fp, str):
+        return None
+
+    return EXTENSIONS.get(os.path.splitext(fp)[1].lower())
+
+
+@contextmanager
+def open_compressed(fp, mode, compression='infer'):
+    """Context manager which opens a filename or file-like object through a codec. Yields ``fp`` itself if it isn't
+    compressed. File-like objects are left open.
+
+    :raises ValueError: If the codec isn't supported
+    :param fp: A filename or file-like object
+    :param str mode: ``rb`` or ``wb``
+    :param str compression: One of :data:`CODECS`, ``infer`` to detect it (from the first bytes when reading, from the filename's extension when writing) or ``None``
+    """
+    if compression == 'infer':
+        compression = detect(fp) if mode == 'rb' else infer(fp)
+
+    if compression is None:
+        yield fp
+
+        return
+
+    # Codecs are imported when used, as Python may be built without some of them
+    if compression == 'gzip':
+        import gzip
+
+        f = gzip.open(fp, mode)
+    elif compression == 'bz2':
+        import bz2
+
+        f = bz2.open(fp, mode)
+    elif compression == 'xz':
+        import lzma
+
+        f = lzma.open(fp, mode)
+    elif compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('The "zstandard" package is required to handle zstd compression')
+
+        f = zstandard.open(fp, mode, closefd=False)
+    else:
+        raise ValueError('Unsupported compression: "{}". Must be one of {}'.format(compression, ', '.join(CODECS)))
+
+    with f:
+        yield f
+
+
+def write_data(fp, data, compression='infer'):
+    """Write bytes to a filename or file-like object through a codec.
+
+    :param fp: A filename or file-like object
+    :param bytes data: The data to write
+    :param str compression: See :func:`open_compressed`
+    """
+    with open_compressed(fp, 'wb', compression) as f:
+        if isinstance(f, str):
+            with open(f, 'wb') as output:
+                output.write(data)
+        else:
+            f.write(data)
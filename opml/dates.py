@@ -0,0 +1,143 @@
+"""RFC 2822 date-times, as used by the ``created``, ``dateCreated`` and ``dateModified`` attributes and nodes.
+
+:func:`rfc2822_to_datetime` and :func:`datetime_to_rfc2822` give the same results as ``email.utils``'s
+``parsedate_to_datetime`` and ``format_datetime``, but handle the format written by this package (e.g.
+``Thu, 16 Sep 2021 20:07:59 -0000``) without going through their general-purpose code, which is only used for any
+other format. Documents often share a handful of distinct date-times across all their outlines, so results are
+memoized as well.
+
+Caches live as long as the process, so each one is bounded: once full, it's emptied and starts over.
+"""
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timedelta, timezone
+import re
+
+MAX_SIZE = 4096
+
+DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+MONTH_NUMBERS = {
+    month.lower(): number for number, month in enumerate(MONTHS, start=1)
+}
+
+RFC2822_RE = re.compile(
+    r'(?:[A-Za-z]{3}, )?(\d{1,2}) ([A-Za-z]{3}) (\d{4}) (\d{2}):(\d{2}):(\d{2}) ([+-])(\d{2})(\d{2})'
+)
+
+parsed = {}
+formatted = {}
+
+
+def parse_any_date(value):
+    try:
+        result = parsedate_to_datetime(value)
+    except TypeError:
+        # Raised instead of ValueError by Python < 3.10
+        result = None
+
+    if result is None:
+        raise ValueError('Invalid RFC 2822 date-time: "{}"'.format(value))
+
+    return result
+
+
+def parse_date(value):
+    match = RFC2822_RE.fullmatch(value)
+
+    if match is None:
+        return parse_any_date(value)
+
+    day, month, year, hour, minute, second, sign, offset_hours, offset_minutes = match.groups()
+    month = MONTH_NUMBERS.get(month.lower())
+    year = int(year)
+
+    # email.utils turns years lower than 100 into 19xx or 20xx ones
+    if month is None or year < 100:
+        return parse_any_date(value)
+
+    offset = int(offset_hours) * 3600 + int(offset_minutes) * 60
+
+    # Like email.utils, -0000 means that the time zone is unknown
+    if sign == '-':
+        if not offset:
+            return datetime(year, month, int(day), int(hour), int(minute), int(second))
+
+        offset = -offset
+
+    return datetime(
+        year, month, int(day), int(hour), int(minute), int(second),
+        tzinfo=timezone(timedelta(seconds=offset))
+    )
+
+
+def format_date(value):
+    if value.tzinfo is None:
+        zone = '-0000'
+    else:
+        offset = value.utcoffset()
+
+        if offset is None or offset.microseconds or offset.seconds % 60:
+            return format_datetime(value)
+
+        minutes = offset.days * 1440 + offset.seconds // 60
+        zone = '%s%02d%02d' % ('-' if minutes < 0 else '+', abs(minutes) // 60, abs(minutes) % 60)
+
+    return '%s, %02d %s %04d %02d:%02d:%02d %s' % (
+        DAYS[value.weekday()],
+        value.day,
+        MONTHS[value.month - 1],
+        value.year,
+        value.hour,
+        value.minute,
+        value.second,
+        zone
+    )
+
+
+def rfc2822_to_datetime(value):
+    """Parse an RFC 2822 date-time. Date-times without time zone (``-0000``) are returned naive.
+
+    :raises ValueError: If the value isn't a valid date-time
+    :param str value: The date-time to parse
+    :rtype: datetime.datetime
+    """
+    result = parsed.get(value)
+
+    if result is None:
+        result = parse_date(value)
+
+        if len(parsed) >= MAX_SIZE:
+            parsed.clear()
+
+        parsed[value] = result
+
+    return result
+
+
+def datetime_to_rfc2822(value):
+    """Format a date-time as RFC 2822. Naive date-times are written without time zone (``-0000``).
+
+    :param datetime.datetime value: The date-time to format
+    :rtype: str
+    """
+    # Aware date-times are equal when they represent the same instant, whatever their time zone: it is part of the key
+    key = (value, value.tzinfo, value.fold)
+    result = formatted.get(key)
+
+    if result is None:
+        result = format_date(value)
+
+        if len(formatted) >= MAX_SIZE:
+            formatted.clear()
+
+        formatted[key] = result
+
+    return result
+
+
+def clear():
+    """Empty the caches."""
+    parsed.clear()
+    formatted.clear()
@@ -0,0 +1,314 @@
+"""Compare documents and merge changes between them.
+
+Outlines are matched between documents by key rather than by position: ``('xml_url', xml_url)`` for outlines having an
+URL to a feed, ``('url', url)`` for the other ones having an URL, ``('text', text)`` otherwise. The occurrence number of
+the key in the document (``0`` for its first occurrence, in document order) is appended so duplicates stay distinct:
+``('text', 'News', 1)`` is the second outline with text "News" and no URL. Documents are walked once and outlines are
+looked up in dicts, so both diffing and merging take linear time.
+"""
+from opml.outline import OpmlOutline
+from operator import attrgetter
+
+ATTRIBUTES = (
+    'text',
+    'type',
+    'is_comment',
+    'is_breakpoint',
+    'created',
+    'xml_url',
+    'description',
+    'html_url',
+    'language',
+    'title',
+    'version',
+    'url',
+    'categories',
+)
+
+get_values = attrgetter(*ATTRIBUTES[:-1])
+
+
+def get_attributes(outline):
+    """Return the attributes of an outline, in the order of :data:`ATTRIBUTES`. Categories are returned as a tuple, or
+    ``None`` if there isn't any.
+
+    :param opml.OpmlOutline outline: The outline
+    :rtype: tuple
+    """
+    return get_values(outline) + (tuple(outline._categories) if outline._categories else None,)
+
+
+def map_outlines(document):
+    """Return the outlines of a document by key, as ``(outline, parent_key, previous_key)`` tuples in document order.
+    ``parent_key`` is ``None`` for top-level outlines, ``previous_key`` is ``None`` for first children.
+
+    :param opml.OpmlDocument document: The document
+    :rtype: dict
+    """
+    outlines = {}
+    occurrences = {}
+    previous_keys = {}
+    stack = [(outline, None) for outline in reversed(document._outlines or ())]
+
+    while stack:
+        outline, parent_key = stack.pop()
+
+        if outline.xml_url:
+            key = ('xml_url', outline.xml_url, 0)
+        elif outline.url:
+            key = ('url', outline.url, 0)
+        else:
+            key = ('text', outline.text, 0)
+
+        if key in outlines:
+            occurrence = occurrences.get(key, 1)
+            occurrences[key] = occurrence + 1
+            key = key[:2] + (occurrence,)
+
+        outlines[key] = (outline, parent_key, previous_keys.get(parent_key))
+        previous_keys[parent_key] = key
+
+        if outline._outlines:
+            stack.extend([(child, key) for child in reversed(outline._outlines)])
+
+    return outlines
+
+
+class OpmlDiff:
+    """Differences between two documents, as returned by :func:`diff`. Lists are in document order.
+
+    :ivar added: ``(key, outline)`` tuples of the outlines only found in the new document. Descendants of an added outline are added as well
+    :vartype added: list
+    :ivar removed: ``(key, outline)`` tuples of the outlines only found in the old document. Descendants of a removed outline are removed as well
+    :vartype removed: list
+    :ivar moved: ``(key, old_outline, new_outline)`` tuples of the outlines whose parent isn't the same in both documents
+    :vartype moved: list
+    :ivar changed: ``(key, old_outline, new_outline)`` tuples of the outlines whose attributes aren't the same in both documents
+    :vartype changed: list
+    """
+    def __init__(self, old, new):
+        self.old = old
+        self.new = new
+        self.added = []
+        self.removed = []
+        self.moved = []
+        self.changed = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.moved or self.changed)
+
+    def apply(self, document, prefer='theirs'):
+        """Apply the differences, in place, to a document: the old document, or a document derived from it (three-way
+        merge).
+
+        Only attributes which differ between the old and the new documents are set, so changes made to the target
+        document since the old one are kept. An attribute changed differently in both is a conflict, as is an outline
+        which can't be added or moved because its new parent isn't in the target document, or an outline changed in the
+        new document but removed from the target one.
+
+        :param opml.OpmlDocument document: The target document
+        :param str prefer: Which value to keep on conflicting attributes: ``theirs`` (the new document's) or ``ours`` (the target document's)
+        :return: ``(key, message)`` tuples describing the conflicts
+        :rtype: list
+        """
+        conflicts = []
+        targets = {
+            key: outline for key, (outline, parent_key, previous_key) in map_outlines(document).items()
+        }
+        new_outlines = map_outlines(self.new)
+
+        for key, old_outline, new_outline in self.changed:
+            target = targets.get(key)
+
+            if target is None:
+                conflicts.append((key, 'Changed outline not found in the target document'))
+
+                continue
+
+            for attribute, old_value, new_value, value in zip(ATTRIBUTES, get_attributes(old_outline), get_attributes(new_outline), get_attributes(target)):
+                if old_value == new_value or value == new_value:
+                    continue
+
+                if value != old_value:
+                    conflicts.append((key, 'Attribute "{}" changed in both documents'.format(attribute)))
+
+                    if prefer == 'ours':
+                        continue
+
+                if attribute == 'categories':
+                    target._categories = list(new_value) if new_value else None
+                else:
+                    setattr(target, attribute, new_value)
+
+        # Outlines to remove from their current parent, by ID of their parent
+        detached = {}
+        # Outlines to insert in their new parent as (key, outline, previous_key) tuples, by ID of their parent
+        inserted = {}
+        parents = {}
+
+        for key, old_outline in self.removed:
+            target = targets.pop(key, None)
+
+            if target is not None:
+                detached.setdefault(id(target.parent), set()).add(id(target))
+
+                parents[id(target.parent)] = target.parent
+                target.parent = None
+
+        moved_keys = {
+            key for key, old_outline, new_outline in self.moved
+        }
+
+        added_keys = {
+            key for key, outline in self.added
+        }
+
+        for key, (new_outline, parent_key, previous_key) in new_outlines.items():
+            if key not in moved_keys and key not in added_keys:
+                continue
+
+            parent = document if parent_key is None else targets.get(parent_key)
+
+            if parent is None:
+                conflicts.append((key, 'Parent outline not found in the target document'))
+
+                continue
+
+            if key in added_keys:
+                if key in targets:
+                    # Added to the target document as well
+                    continue
+
+                attributes = dict(zip(ATTRIBUTES, get_attributes(new_outline)))
+                attributes['categories'] = list(attributes['categories'] or ())
+
+                target = OpmlOutline(**attributes)
+
+                targets[key] = target
+            else:
+                target = targets.get(key)
+
+                if target is None:
+                    conflicts.append((key, 'Moved outline not found in the target document'))
+
+                    continue
+
+                detached.setdefault(id(target.parent), set()).add(id(target))
+
+                parents[id(target.parent)] = target.parent
+
+            target.parent = parent
+
+            inserted.setdefault(id(parent), []).append((key, target, previous_key))
+
+            parents[id(parent)] = parent
+
+        keys = {
+            id(outline): key for key, outline in targets.items()
+        }
+
+        for parent_id, parent in parents.items():
+            outlines = parent._outlines or []
+
+            if parent_id in detached:
+                ids = detached[parent_id]
+
+                outlines = [
+                    outline for outline in outlines if id(outline) not in ids
+                ]
+
+            if parent_id in inserted:
+                outlines = self.insert(outlines, inserted[parent_id], keys)
+
+            parent._outlines = outlines or None
+
+        if document.index is not None:
+            document.build_index(categories='category' in document.index.tables)
+
+        return conflicts
+
+    @staticmethod
+    def insert(outlines, items, keys):
+        present = {
+            keys.get(id(outline)) for outline in outlines
+        }
+
+        present.update(key for key, outline, previous_key in items)
+
+        first = []
+        last = []
+        following = {}
+
+        for item in items:
+            key, outline, previous_key = item
+
+            if previous_key is None:
+                first.append(item)
+            elif previous_key in present:
+                following.setdefault(previous_key, []).append(item)
+            else:
+                last.append(item)
+
+        result = []
+        stack = list(reversed(
+            [item[1] for item in first] + outlines + [item[1] for item in last]
+        ))
+
+        while stack:
+            outline = stack.pop()
+
+            result.append(outline)
+
+            stack.extend(reversed([
+                item[1] for item in following.pop(keys.get(id(outline)), ())
+            ]))
+
+        return result
+
+
+def diff(old, new):
+    """Compare two documents.
+
+    :param opml.OpmlDocument old: The old document
+    :param opml.OpmlDocument new: The new document
+    :rtype: opml.diff.OpmlDiff
+    """
+    result = OpmlDiff(old, new)
+    old_outlines = map_outlines(old)
+    new_outlines = map_outlines(new)
+
+    for key, (old_outline, parent_key, previous_key) in old_outlines.items():
+        if key not in new_outlines:
+            result.removed.append((key, old_outline))
+
+    for key, (new_outline, parent_key, previous_key) in new_outlines.items():
+        old_item = old_outlines.get(key)
+
+        if old_item is None:
+            result.added.append((key, new_outline))
+
+            continue
+
+        old_outline = old_item[0]
+
+        if old_item[1] != parent_key:
+            result.moved.append((key, old_outline, new_outline))
+
+        if get_attributes(old_outline) != get_attributes(new_outline):
+            result.changed.append((key, old_outline, new_outline))
+
+    return result
+
+
+def merge(base, ours, theirs, prefer='theirs'):
+    """Three-way merge: apply, in place, the changes made between ``base`` and ``theirs`` to ``ours``, a document also
+    derived from ``base``. See :meth:`OpmlDiff.apply`.
+
+    :param opml.OpmlDocument base: The common ancestor
+    :param opml.OpmlDocument ours: The document to merge changes into
+    :param opml.OpmlDocument theirs: The document to merge changes from
+    :param str prefer: Which value to keep on conflicting attributes: ``theirs`` or ``ours``
+    :return: ``(key, message)`` tuples describing the conflicts
+    :rtype: list
+    """
+    return diff(base, theirs).apply(ours, prefer)
@@ -1,7 +1,10 @@
-from email.utils import format_datetime as datetime_to_rfc2822, parsedate_to_datetime as rfc2822_to_datetime
+from opml.dates import datetime_to_rfc2822, rfc2822_to_datetime
 from opml.exceptions import OpmlReadError
+from opml.validation import STRICT, OFF, check as check_validation
+from opml.parser import default_parser
 from opml.outlinable import Outlinable
 from lxml import etree
+import os
 
 
 class OpmlDocument(Outlinable):
@@ -54,6 +57,9 @@ class OpmlDocument(Outlinable):
     :param int window_right: Pixel location of the right edge of the window
     :ivar window_right: Pixel location of the right edge of the window
     :vartype window_right: int
+
+    :ivar index: Lookup tables of the outlines of this document, if built by :meth:`build_index`
+    :vartype index: opml.index.OpmlIndex
     """
     def __init__(self, **kvargs):
         super(OpmlDocument, self).__init__()
@@ -70,63 +76,472 @@ class OpmlDocument(Outlinable):
         self.window_left = kvargs.get('window_left')
         self.window_bottom = kvargs.get('window_bottom')
         self.window_right = kvargs.get('window_right')
+        self.index = None
+
+    def build_index(self, categories=False):
+        """Index all the outlines of this document so :meth:`find_by_xml_url`, :meth:`find_by_url` and
+        :meth:`find_by_text` (as well as :meth:`find_by_category` if requested) don't have to scan the whole document
+        anymore, then return the index.
+
+        :param bool categories: Whether to index outlines by category or not
+        :rtype: opml.index.OpmlIndex
+        """
+        from opml.index import OpmlIndex
+
+        self.index = OpmlIndex(categories)
+
+        if self._outlines:
+            for outline in self._outlines:
+                self.index.add(outline)
+
+        return self.index
+
+    def build_lines(self):
+        """Flatten the outlines of this document into the lines an outliner displays according to
+        :attr:`expansion_state`, then return them. See :mod:`opml.lines`.
+
+        :rtype: opml.lines.OpmlLines
+        """
+        from opml.lines import OpmlLines
+
+        return OpmlLines(self)
 
-    def dumps(self, pretty=False, encoding='UTF-8'):
+    def resolve_includes(self, fetcher=None, max_workers=8, max_depth=8, base_url=None, parser=None):
+        """Expand, in place, all the outlines of type "include" of this document by appending the outlines of the OPML
+        documents they point at to them. Include outlines which already have child outlines are left untouched. See
+        :class:`opml.includes.IncludeResolver`.
+
+        :raises opml.exceptions.OpmlReadError:
+        :param fetcher: A callable taking an URL and returning the content of the OPML document, as bytes. Defaults to :class:`opml.includes.HttpFetcher`
+        :param int max_workers: Maximum number of documents fetched at the same time
+        :param int max_depth: Maximum number of nested includes to expand
+        :param str base_url: URL of this document, relative URLs will be resolved against it
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :rtype: opml.OpmlDocument
+        """
+        from opml.includes import IncludeResolver
+
+        return IncludeResolver(fetcher, max_workers, max_depth, parser).resolve(self, base_url)
+
+    def find_by_xml_url(self, xml_url):
+        """Find outlines by URL to the feed.
+
+        :param str xml_url: URL to the feed
+        :return: A list of ``(outline, path)`` tuples, ``path`` being the ancestor outlines of ``outline`` (see :meth:`opml.OpmlOutline.get_path`)
+        :rtype: list
+        """
+        return self.find('xml_url', xml_url)
+
+    def find_by_url(self, url):
+        """Find outlines by URL.
+
+        :param str url: URL to a web page or to an OPML document
+        :return: A list of ``(outline, path)`` tuples, ``path`` being the ancestor outlines of ``outline`` (see :meth:`opml.OpmlOutline.get_path`)
+        :rtype: list
+        """
+        return self.find('url', url)
+
+    def find_by_text(self, text):
+        """Find outlines by text.
+
+        :param str text: Text of the outline
+        :return: A list of ``(outline, path)`` tuples, ``path`` being the ancestor outlines of ``outline`` (see :meth:`opml.OpmlOutline.get_path`)
+        :rtype: list
+        """
+        return self.find('text', text)
+
+    def find_by_category(self, category):
+        """Find outlines by category. Hierarchical categories match their prefixes: outlines of category
+        ``/Intelligence/USA`` are found by looking up ``/Intelligence`` as well.
+
+        :param str category: The category, or a prefix of it
+        :return: A list of ``(outline, path)`` tuples, ``path`` being the ancestor outlines of ``outline`` (see :meth:`opml.OpmlOutline.get_path`)
+        :rtype: list
+        """
+        return self.find('category', category)
+
+    def find(self, field, value):
+        from opml.index import OpmlIndex, get_category_keys
+
+        if self.index is not None and field in self.index.tables:
+            outlines = self.index.find(field, value)
+        elif field == 'category':
+            outlines = []
+
+            for top_level_outline in self._outlines or ():
+                outlines.extend(
+                    outline for outline in OpmlIndex.iter_tree(top_level_outline) if outline._categories and value in get_category_keys(outline._categories)
+                )
+        else:
+            outlines = []
+
+            for top_level_outline in self._outlines or ():
+                outlines.extend(
+                    outline for outline in OpmlIndex.iter_tree(top_level_outline) if getattr(outline, field) == value
+                )
+
+        return [
+            (outline, outline.get_path()) for outline in outlines
+        ]
+
+    def dumps(self, pretty=False, encoding='UTF-8', validation=STRICT, incremental=False, workers=None, stats=None):
         """Serialize this document to a string.
 
         :raises opml.exceptions.OpmlWriteError:
         :param bool pretty: Whether to pretty print the outputted XML code or not
         :param str encoding: The encoding to use. Will also define the XML's encoding declaration
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param bool incremental: Whether to reuse the serialization of the outlines which didn't change since the previous incremental serialization of this document or not. See :mod:`opml.incremental`
+        :param int workers: Number of worker processes to serialize top-level outlines with. Serialization is done in the calling process by default. See :mod:`opml.parallel`
+        :param opml.profiling.OpmlStats stats: Stats to add the time spent in each phase as well as counters to. See :mod:`opml.profiling`
         :rtype: str
         """
-        return etree.tostring(
-            self.build_tree(),
-            pretty_print=pretty,
-            encoding=encoding,
-            xml_declaration=True
-        ).decode(encoding)
+        if stats is not None:
+            from opml import profiling
 
-    def dump(self, fp, pretty=False, encoding='UTF-8'):
+            return profiling.serialize(self, stats, pretty, encoding, validation, incremental, workers).decode(encoding)
+
+        return self.serialize(pretty, encoding, validation, incremental, workers).decode(encoding)
+
+    def dump(self, fp, pretty=False, encoding='UTF-8', validation=STRICT, incremental=False, compression='infer', workers=None, stats=None):
         """Serialize this document to a filename or file-like object.
 
         :raises opml.exceptions.OpmlWriteError:
         :param fp: A filename or file-like object
         :param bool pretty: Whether to pretty print the outputted XML code or not
         :param str encoding: The encoding to use. Will also define the XML's encoding declaration
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param bool incremental: Whether to reuse the serialization of the outlines which didn't change since the previous incremental serialization of this document or not. See :mod:`opml.incremental`
+        :param str compression: Codec to compress the data with, one of ``gzip``, ``bz2``, ``xz`` or ``zstd``. Inferred from the filename's extension by default. See :mod:`opml.compression`
+        :param int workers: Number of worker processes to serialize top-level outlines with. Serialization is done in the calling process by default. See :mod:`opml.parallel`
+        :param opml.profiling.OpmlStats stats: Stats to add the time spent in each phase as well as counters to. See :mod:`opml.profiling`
         """
-        etree.ElementTree(self.build_tree()).write(
-            fp,
+        from opml.compression import write_data
+
+        if stats is not None:
+            from opml import profiling
+
+            return profiling.dump(self, fp, stats, pretty, encoding, validation, incremental, compression, workers)
+
+        if incremental or workers:
+            write_data(fp, self.serialize(pretty, encoding, validation, incremental, workers), compression)
+        else:
+            self.write_tree(self.build_tree(validation), fp, pretty, encoding, compression)
+
+    @staticmethod
+    def write_tree(root, fp, pretty=False, encoding='UTF-8', compression='infer'):
+        """Serialize an XML tree to a filename or file-like object, as it's serialized."""
+        from opml.compression import open_compressed
+
+        with open_compressed(fp, 'wb', compression) as f:
+            etree.ElementTree(root).write(
+                f,
+                pretty_print=pretty,
+                encoding=encoding,
+                xml_declaration=True
+            )
+
+    async def adumps(self, pretty=False, encoding='UTF-8', validation=STRICT, incremental=False, executor=None):
+        """Serialize this document to a string without blocking the event loop. Serialization is run in ``executor``.
+
+        :raises opml.exceptions.OpmlWriteError:
+        :param bool pretty: Whether to pretty print the outputted XML code or not
+        :param str encoding: The encoding to use. Will also define the XML's encoding declaration
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param bool incremental: Whether to reuse the serialization of the outlines which didn't change since the previous incremental serialization of this document or not. See :mod:`opml.incremental`
+        :param concurrent.futures.Executor executor: The executor to run serialization in. Defaults to the loop's default executor
+        :rtype: str
+        """
+        from opml import aio
+
+        return await aio.run(executor, self.dumps, pretty=pretty, encoding=encoding, validation=validation, incremental=incremental)
+
+    async def adump(self, fp, pretty=False, encoding='UTF-8', validation=STRICT, incremental=False, executor=None):
+        """Serialize this document to a filename or file-like object without blocking the event loop. Serialization is
+        run in ``executor``, then data is written chunk by chunk.
+
+        :raises opml.exceptions.OpmlWriteError:
+        :param fp: A filename, a file-like object (opened in binary mode) or an asynchronous file-like object (i.e. whose ``write`` method is a coroutine)
+        :param bool pretty: Whether to pretty print the outputted XML code or not
+        :param str encoding: The encoding to use. Will also define the XML's encoding declaration
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param bool incremental: Whether to reuse the serialization of the outlines which didn't change since the previous incremental serialization of this document or not. See :mod:`opml.incremental`
+        :param concurrent.futures.Executor executor: The executor to run serialization in. Defaults to the loop's default executor
+        """
+        from opml import aio
+
+        data = await aio.run(executor, self.serialize, pretty=pretty, encoding=encoding, validation=validation, incremental=incremental)
+
+        await aio.write_chunks(fp, data)
+
+    def serialize(self, pretty=False, encoding='UTF-8', validation=STRICT, incremental=False, workers=None):
+        if incremental or workers:
+            from opml.fragments import is_supported
+
+            if is_supported(encoding, validation):
+                if incremental:
+                    from opml.incremental import serialize
+
+                    return serialize(self, pretty, encoding, validation)
+
+                from opml.parallel import serialize
+
+                return serialize(self, pretty, encoding, validation, workers)
+
+        return self.serialize_tree(self.build_tree(validation), pretty, encoding)
+
+    @staticmethod
+    def serialize_tree(root, pretty=False, encoding='UTF-8'):
+        """Serialize an XML tree to bytes."""
+        return etree.tostring(
+            root,
             pretty_print=pretty,
             encoding=encoding,
             xml_declaration=True
         )
 
     @classmethod
-    def loads(cls, s):
+    def loads(cls, s, lazy=False, validation=STRICT, parser=None, stats=None):
         """Unserialize OPML 2.0 data from a string.
 
         :raises opml.exceptions.OpmlReadError:
         :param str s: The string to unserialize from
+        :param bool lazy: Whether to decode and validate outlines only when they are first accessed or not. See :class:`opml.outline.LazyOpmlOutline`
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :param opml.profiling.OpmlStats stats: Stats to add the time spent in each phase as well as counters to. See :mod:`opml.profiling`
         :rtype: opml.OpmlDocument
         """
+        if stats is not None:
+            from opml import profiling
+
+            return profiling.loads(cls, s, stats, lazy, validation, parser)
+
         return cls.unbuild_tree(
-            etree.fromstring(s.encode())
+            cls.parse_string(s, parser),
+            lazy=lazy,
+            validation=validation
         )
 
+    @staticmethod
+    def parse_string(s, parser=None):
+        """Parse XML data from a string and return its root node."""
+        return (parser or default_parser).fromstring(s.encode())
+
     @classmethod
-    def load(cls, fp):
+    def load(cls, fp, lazy=False, validation=STRICT, cache_dir=None, compression='infer', parser=None, stats=None):
         """Unserialize OPML 2.0 data from a filename or file-like object.
 
         :raises opml.exceptions.OpmlReadError:
         :param fp: A filename or file-like object
+        :param bool lazy: Whether to decode and validate outlines only when they are first accessed or not. See :class:`opml.outline.LazyOpmlOutline`
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param str cache_dir: Directory of binary snapshots to load the document from when it hasn't changed since it was last loaded. See :class:`opml.snapshot.SnapshotCache`. Ignored when ``lazy`` is ``True`` or ``validation`` is an :class:`opml.validation.OpmlValidator` instance
+        :param str compression: Codec the data is compressed with, one of ``gzip``, ``bz2``, ``xz`` or ``zstd``. Detected from the first bytes by default. See :mod:`opml.compression`
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :param opml.profiling.OpmlStats stats: Stats to add the time spent in each phase as well as counters to. See :mod:`opml.profiling`
         :rtype: opml.OpmlDocument
         """
+        if stats is not None:
+            from opml import profiling
+
+            return profiling.load(cls, fp, stats, lazy, validation, cache_dir, compression, parser)
+
+        if cache_dir is not None and not lazy and validation in (STRICT, OFF):
+            from opml.snapshot import SnapshotCache
+
+            return SnapshotCache(cache_dir).load(cls, fp, validation, compression, parser)
+
         return cls.unbuild_tree(
-            etree.parse(fp).getroot()
+            cls.parse(fp, compression, parser),
+            lazy=lazy,
+            validation=validation
         )
 
+    @staticmethod
+    def parse(fp, compression='infer', parser=None):
+        """Parse XML data from a filename or file-like object, decompressing it if needed, and return its root node."""
+        from opml.compression import open_compressed
+
+        with open_compressed(fp, 'rb', compression) as f:
+            return (parser or default_parser).parse(f)
+
     @classmethod
-    def unbuild_tree(cls, root):
+    async def aloads(cls, s, lazy=False, validation=STRICT, executor=None, parser=None):
+        """Unserialize OPML 2.0 data from a string without blocking the event loop. Unserialization is run in
+        ``executor``.
+
+        :raises opml.exceptions.OpmlReadError:
+        :param str s: The string to unserialize from
+        :param bool lazy: Whether to decode and validate outlines only when they are first accessed or not. See :class:`opml.outline.LazyOpmlOutline`
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param concurrent.futures.Executor executor: The executor to run unserialization in. Defaults to the loop's default executor
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :rtype: opml.OpmlDocument
+        """
+        from opml import aio
+
+        return await aio.run(executor, cls.loads, s, lazy=lazy, validation=validation, parser=parser)
+
+    @classmethod
+    async def aload(cls, fp, lazy=False, validation=STRICT, executor=None, parser=None):
+        """Unserialize OPML 2.0 data from a filename or file-like object without blocking the event loop. Data is read
+        chunk by chunk and incrementally parsed in ``executor`` as it comes, then outlines are unserialized there as well.
+
+        :raises opml.exceptions.OpmlReadError:
+        :param fp: A filename, a file-like object or an asynchronous file-like object (i.e. whose ``read`` method is a coroutine)
+        :param bool lazy: Whether to decode and validate outlines only when they are first accessed or not. See :class:`opml.outline.LazyOpmlOutline`
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param concurrent.futures.Executor executor: The executor to run parsing and unserialization in (must be a thread pool). Defaults to the loop's default executor
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :rtype: opml.OpmlDocument
+        """
+        from opml import aio
+
+        # A parser of its own, as other coroutines may be feeding the shared one
+        parser = (parser or default_parser).create()
+
+        async for chunk in aio.read_chunks(fp):
+            await aio.run(executor, parser.feed, chunk)
+
+        root = await aio.run(executor, parser.close)
+
+        return await aio.run(executor, cls.unbuild_tree, root, lazy=lazy, validation=validation)
+
+    @classmethod
+    def load_many(cls, paths, workers=None, ordered=True, cache_dir=None):
+        """Unserialize OPML 2.0 data from many filenames at once, using a pool of processes.
+
+        Documents are transferred from the worker processes in a compact form (see :mod:`opml.packed`) and aren't
+        validated again once received.
+
+        :param paths: An iterable of filenames
+        :param int workers: Number of worker processes. Defaults to the number of processors
+        :param bool ordered: Whether to yield documents in the order of ``paths`` or as soon as they are loaded
+        :param str cache_dir: Directory of binary snapshots the worker processes load documents from when they haven't changed. See :class:`opml.snapshot.SnapshotCache`
+        :return: A generator of ``(path, document)`` tuples. ``document`` is an :class:`opml.exceptions.OpmlReadError` instance if the file couldn't be loaded
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        from opml.packed import load_packed, unpack
+        from functools import partial
+
+        load = partial(load_packed, cache_dir=cache_dir)
+        paths = list(paths)
+        workers = workers or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            if ordered:
+                results = zip(paths, executor.map(load, paths, chunksize=max(1, len(paths) // (workers * 4))))
+            else:
+                futures = {
+                    executor.submit(load, path): path for path in paths
+                }
+
+                results = ((futures[future], future.result()) for future in as_completed(futures))
+
+            for path, result in results:
+                yield path, result if isinstance(result, OpmlReadError) else unpack(result, cls)
+
+    @classmethod
+    def iterload(cls, fp, compression='infer', parser=None):
+        """Unserialize OPML 2.0 data from a filename or file-like object, one outline at a time.
+
+        Contrary to :meth:`opml.OpmlDocument.load`, the whole document is never held in memory: the ``head`` node is
+        parsed first, then each outline is yielded as soon as it has been entirely parsed (i.e. after its own child
+        outlines) and the underlying XML node is freed. The ``head`` node must thus come before the ``body`` node.
+
+        :raises opml.exceptions.OpmlReadError:
+        :param fp: A filename or file-like object
+        :param str compression: Codec the data is compressed with, one of ``gzip``, ``bz2``, ``xz`` or ``zstd``. Detected from the first bytes by default. See :mod:`opml.compression`
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :rtype: opml.stream.OpmlIterator
+        """
+        from opml.stream import OpmlIterator
+
+        return OpmlIterator(cls, fp, compression, parser)
+
+    @classmethod
+    def select(cls, fp, query, lazy=False, validation=STRICT, compression='infer', parser=None):
+        """Return the outlines of OPML 2.0 data read from a filename or file-like object which match a query, in
+        document order.
+
+        The query is run against the XML tree, so only the matching outlines (and their child outlines) are
+        unserialized, and validated. Returned outlines don't have any parent.
+
+        :raises opml.exceptions.OpmlReadError:
+        :param fp: A filename or file-like object
+        :param opml.query.OpmlQuery query: The query. See :mod:`opml.query`
+        :param bool lazy: Whether to decode and validate outlines only when they are first accessed or not. See :class:`opml.outline.LazyOpmlOutline`
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param str compression: Codec the data is compressed with, one of ``gzip``, ``bz2``, ``xz`` or ``zstd``. Detected from the first bytes by default. See :mod:`opml.compression`
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :rtype: list
+        """
+        from opml.compression import open_compressed
+
+        with open_compressed(fp, 'rb', compression) as f:
+            root = (parser or default_parser).parse(f)
+
+        return cls.select_tree(root, query, lazy, validation)
+
+    @classmethod
+    def selects(cls, s, query, lazy=False, validation=STRICT, parser=None):
+        """Return the outlines of OPML 2.0 data given as a string which match a query, in document order. See
+        :meth:`select`.
+
+        :raises opml.exceptions.OpmlReadError:
+        :param str s: The OPML 2.0 data
+        :param opml.query.OpmlQuery query: The query. See :mod:`opml.query`
+        :param bool lazy: Whether to decode and validate outlines only when they are first accessed or not. See :class:`opml.outline.LazyOpmlOutline`
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :rtype: list
+        """
+        return cls.select_tree((parser or default_parser).fromstring(s.encode()), query, lazy, validation)
+
+    @classmethod
+    def select_tree(cls, root, query, lazy=False, validation=STRICT):
+        from opml.outline import OpmlOutline, LazyOpmlOutline
+
+        check_validation(validation)
+        cls.check_root(root)
+
+        if root.find('body') is None:
+            raise OpmlReadError('"body" node not found')
+
+        if lazy:
+            return [
+                LazyOpmlOutline(node, validation=validation) for node in query.select(root)
+            ]
+
+        return [
+            OpmlOutline.unbuild_tree(node, validation=validation) for node in query.select(root)
+        ]
+
+    @classmethod
+    def unbuild_tree(cls, root, lazy=False, validation=STRICT):
+        check_validation(validation)
+        cls.check_root(root)
+
+        head = root.find('head')
+
+        if head is None:
+            raise OpmlReadError('"head" node not found')
+
+        document = cls()
+        document.unbuild_head(head)
+
+        body = root.find('body')
+
+        if body is None:
+            raise OpmlReadError('"body" node not found')
+
+        document.unbuild_outlines_tree(body, lazy=lazy, validation=validation)
+
+        return document
+
+    @staticmethod
+    def check_root(root):
         if root.tag != 'opml':
             raise OpmlReadError('Not an OPML document')
 
@@ -137,86 +552,80 @@ class OpmlDocument(Outlinable):
         elif version != '2.0':
             raise OpmlReadError('This package only supports OPML 2.0 specification')
 
-        document = cls()
-
-        head = root.find('head')
-
-        if head is None:
-            raise OpmlReadError('"head" node not found')
-
+    def unbuild_head(self, head):
         title = head.findtext('title')
 
         if title:
-            document.title = title
+            self.title = title
 
         date_created = head.findtext('dateCreated')
 
         if date_created:
-            document.date_created = rfc2822_to_datetime(date_created)
+            self.date_created = rfc2822_to_datetime(date_created)
 
         date_modified = head.findtext('dateModified')
 
         if date_modified:
-            document.date_modified = rfc2822_to_datetime(date_modified)
+            self.date_modified = rfc2822_to_datetime(date_modified)
 
         owner_name = head.findtext('ownerName')
 
         if owner_name:
-            document.owner_name = owner_name
+            self.owner_name = owner_name
 
         owner_email = head.findtext('ownerEmail')
 
         if owner_email:
-            document.owner_email = owner_email
+            self.owner_email = owner_email
 
         owner_id = head.findtext('ownerId')
 
         if owner_id:
-            document.owner_id = owner_id
+            self.owner_id = owner_id
 
         expansion_state = head.findtext('expansionState')
 
         if expansion_state:
-            document.expansion_state = expansion_state.split(',')
+            self.expansion_state = expansion_state.split(',')
 
         vert_scroll_state = head.findtext('vertScrollState')
 
         if vert_scroll_state:
-            document.vert_scroll_state = vert_scroll_state
+            self.vert_scroll_state = vert_scroll_state
 
         window_top = head.findtext('windowTop')
 
         if window_top:
-            document.window_top = window_top
+            self.window_top = window_top
 
         window_left = head.findtext('windowLeft')
 
         if window_left:
-            document.window_left = window_left
+            self.window_left = window_left
 
         window_bottom = head.findtext('windowBottom')
 
         if window_bottom:
-            document.window_bottom = window_bottom
+            self.window_bottom = window_bottom
 
         window_right = head.findtext('windowRight')
 
         if window_right:
-            document.window_right = window_right
+            self.window_right = window_right
 
-        body = root.find('body')
+    def build_tree(self, validation=STRICT):
+        check_validation(validation)
 
-        if body is None:
-            raise OpmlReadError('"body" node not found')
+        root = etree.Element('opml', version='2.0')
+        root.append(self.build_head())
+        body = etree.SubElement(root, 'body')
 
-        document.unbuild_outlines_tree(body)
+        self.build_outlines_tree(body, validation)
 
-        return document
+        return root
 
-    def build_tree(self):
-        root = etree.Element('opml', version='2.0')
-        head = etree.SubElement(root, 'head')
-        body = etree.SubElement(root, 'body')
+    def build_head(self):
+        head = etree.Element('head')
 
         if self.title:
             etree.SubElement(head, 'title').text = self.title
@@ -258,9 +667,7 @@ class OpmlDocument(Outlinable):
 
         etree.SubElement(head, 'docs').text = 'http://opml.org/spec2.opml'
 
-        self.build_outlines_tree(body)
-
-        return root
+        return head
 
     def __str__(self):
         return self.dumps(pretty=True)
@@ -0,0 +1,83 @@
+"""Serialization of documents from the already serialized outlines of their body, shared by :mod:`opml.incremental` and
+:mod:`opml.parallel`, and pretty print indentation as written by libxml2, shared by :mod:`opml.incremental` and
+:mod:`opml.stream`.
+"""
+from opml.validation import STRICT, OFF
+from lxml import etree
+
+# libxml2 doesn't indent nodes any further past this level (60 spaces)
+MAX_INDENT_LEVEL = 30
+
+
+def indentation(level):
+    """Return the line break and indentation libxml2 writes before a node of the given level when pretty printing.
+
+    :param int level: The level of the node, ``0`` being the root node
+    :rtype: str
+    """
+    return '\n' + '  ' * min(level, MAX_INDENT_LEVEL)
+
+
+def indent(node, level=0):
+    """Indent the descendants of a node in place, like :func:`lxml.etree.indent` does, but capping indentation like
+    libxml2 does when pretty printing.
+
+    :param lxml.etree._Element node: The node
+    :param int level: The level of the node, ``0`` being the root node
+    """
+    stack = [(node, level)]
+
+    while stack:
+        node, level = stack.pop()
+
+        if not len(node) or (node.text and node.text.strip()):
+            continue
+
+        node.text = indentation(level + 1)
+
+        for child in node:
+            child.tail = indentation(level + 1)
+
+            stack.append((child, level + 1))
+
+        child.tail = indentation(level)
+
+
+def is_supported(encoding, validation):
+    """Return whether serializing outlines apart from their document supports the given arguments of
+    :meth:`opml.OpmlDocument.serialize`. Validators collecting errors need all outlines to be validated by the calling
+    process every time, and tags and separators between outlines are searched for and written as ASCII.
+
+    :rtype: bool
+    """
+    if validation not in (STRICT, OFF):
+        return False
+
+    try:
+        return '\n </body>'.encode(encoding) == b'\n </body>'
+    except LookupError:
+        return False
+
+
+def serialize_document(document, body, pretty=False, encoding='UTF-8'):
+    """Serialize a document to bytes, its body being made of the given serialized outlines.
+
+    :param opml.OpmlDocument document: The document
+    :param bytes body: The serialized top-level outlines. When pretty printed, they must be separated and indented like in the whole document, except the first one
+    :param bool pretty: Whether to pretty print the outputted XML code or not
+    :param str encoding: The encoding to use. Will also define the XML's encoding declaration
+    :rtype: bytes
+    """
+    root = etree.Element('opml', version='2.0')
+    root.append(document.build_head())
+    body_node = etree.SubElement(root, 'body')
+
+    if not body:
+        return etree.tostring(root, pretty_print=pretty, encoding=encoding, xml_declaration=True)
+
+    # Placeholder replaced by the actual outlines, it can't be confused with anything else as text is escaped
+    etree.SubElement(body_node, 'outline')
+
+    data = etree.tostring(root, pretty_print=pretty, encoding=encoding, xml_declaration=True)
+
+    return data.replace(b'<outline/>', body, 1)
@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+from opml.exceptions import OpmlReadError
+from opml.parser import default_parser
+from opml.document import OpmlDocument
+from urllib.parse import urljoin, urlparse
+from urllib.request import url2pathname, urlopen
+from lxml import etree
+import os
+
+
+class FileFetcher:
+    """Fetch OPML documents from the local filesystem. ``file://`` URLs and plain paths are supported.
+
+    :param str base_dir: Directory relative paths are resolved against. Defaults to the current working directory
+    """
+    def __init__(self, base_dir=None):
+        self.base_dir = base_dir
+
+    def __call__(self, url):
+        path = url2pathname(urlparse(url).path) if url.startswith('file:') else url
+
+        if self.base_dir:
+            path = os.path.join(self.base_dir, path)
+
+        with open(path, 'rb') as f:
+            return f.read()
+
+
+class DictFetcher:
+    """Fetch OPML documents from a dict mapping URLs to their content (as a string or as bytes). Mainly meant for
+    testing purposes.
+
+    :param dict documents: Content of the OPML documents, by URL
+    """
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __call__(self, url):
+        try:
+            content = self.documents[url]
+        except KeyError:
+            raise OpmlReadError('Included document not found')
+
+        return content.encode() if isinstance(content, str) else content
+
+
+class HttpFetcher:
+    """Fetch OPML documents over HTTP(S).
+
+    :param float timeout: Timeout of each request, in seconds
+    """
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+
+    def __call__(self, url):
+        with urlopen(url, timeout=self.timeout) as response:
+            return response.read()
+
+
+class IncludeResolver:
+    """Expand outlines of type "include" by appending the outlines of the OPML documents they point at to them.
+    Include outlines which already have child outlines are considered expanded and are left untouched, so that
+    resolving includes twice (or once again after dumping and loading an expanded document) changes nothing.
+
+    Included documents are fetched and parsed concurrently, level by level, and cached by URL so a document included
+    several times is only fetched once. Relative URLs are resolved against the URL of the including document.
+
+    :param fetcher: A callable taking an URL and returning the content of the OPML document, as bytes. Defaults to :class:`opml.includes.HttpFetcher`
+    :param int max_workers: Maximum number of documents fetched at the same time
+    :param int max_depth: Maximum number of nested includes to expand
+    :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+    """
+    def __init__(self, fetcher=None, max_workers=8, max_depth=8, parser=None):
+        self.fetcher = fetcher if fetcher is not None else HttpFetcher()
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.parser = parser or default_parser
+        self.cache = {}
+
+    def resolve(self, document, base_url=None):
+        """Expand, in place, all the outlines of type "include" of a document, as well as the ones of the included
+        documents. Expanded outlines keep their attributes.
+
+        :raises opml.exceptions.OpmlReadError: When an include cycle is detected, when includes are nested deeper than ``max_depth`` or when an included document is invalid
+        :param opml.OpmlDocument document: The document to expand
+        :param str base_url: URL of the document, relative URLs will be resolved against it
+        :rtype: opml.OpmlDocument
+        """
+        pending = self.find_includes(document._outlines or (), base_url, (base_url,) if base_url else ())
+        depth = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending:
+                depth += 1
+
+                for outline, url, chain in pending:
+                    if url in chain:
+                        raise OpmlReadError('Include cycle detected: {}'.format(' -> '.join(chain + (url,))))
+
+                    if depth > self.max_depth:
+                        raise OpmlReadError('Includes are nested deeper than {} levels: {}'.format(self.max_depth, ' -> '.join(chain + (url,))))
+
+                urls = list({url for outline, url, chain in pending if url not in self.cache})
+
+                for url, body in zip(urls, executor.map(self.fetch, urls)):
+                    self.cache[url] = body
+
+                next_pending = []
+
+                for outline, url, chain in pending:
+                    count = len(outline._outlines or ())
+
+                    outline.unbuild_outlines_tree(self.cache[url])
+
+                    included_outlines = outline.outlines[count:]
+
+                    if document.index is not None:
+                        for included_outline in included_outlines:
+                            document.index.add(included_outline)
+
+                    next_pending.extend(self.find_includes(included_outlines, url, chain + (url,)))
+
+                pending = next_pending
+
+        return document
+
+    def fetch(self, url):
+        try:
+            try:
+                root = self.parser.fromstring(self.fetcher(url))
+            except (etree.LxmlError, OSError, ValueError) as e:
+                raise OpmlReadError(str(e)) from e
+
+            OpmlDocument.check_root(root)
+
+            body = root.find('body')
+
+            if body is None:
+                raise OpmlReadError('"body" node not found')
+        except OpmlReadError as e:
+            # Tell which one of the included documents is broken
+            raise OpmlReadError('Could not include "{}": {}'.format(url, e)) from e
+
+        return body
+
+    @staticmethod
+    def find_includes(outlines, base_url, chain):
+        includes = []
+        stack = list(reversed(outlines))
+
+        while stack:
+            outline = stack.pop()
+
+            if outline.type == 'include' and outline.url and not outline._outlines:
+                includes.append((outline, urljoin(base_url, outline.url) if base_url else outline.url, chain))
+
+            if outline._outlines:
+                stack.extend(reversed(outline._outlines))
+
+        return includes
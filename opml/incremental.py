@@ -0,0 +1,188 @@
+"""Incremental serialization, which reuses the previous serialization of the outlines that haven't changed since then.
+
+Each serialized outline keeps, in its ``_cache`` attribute, a snapshot of its attributes and child outlines as well as
+the position of its serialization in the one of its parent. The document keeps the serialization of its body. On the
+next serialization, outlines whose attributes or child outlines (at any level) changed since then are serialized again,
+the serialization of the others being copied from the previous one. Change detection thus still visits every outline,
+but doesn't build nor serialize any XML element for the unchanged ones.
+
+Outlines moved to another parent are serialized again entirely, as their indentation may have changed.
+"""
+from opml.fragments import indentation, serialize_document
+from opml.validation import STRICT
+from opml.diff import get_attributes
+from lxml import etree
+
+
+def find_changes(document):
+    """Return the outlines which, or whose descendants, changed since the previous serialization, as a dict mapping
+    their ID to a snapshot of their attributes.
+
+    :param opml.OpmlDocument document: The document
+    :rtype: dict
+    """
+    # Outlines come before their descendants in this list, so reading it backwards visits children before their parent
+    outlines = []
+    stack = [(outline, None) for outline in document._outlines or ()]
+
+    while stack:
+        item = stack.pop()
+        outline = item[0]
+
+        outlines.append(item)
+
+        if outline._outlines:
+            stack.extend([(child, outline) for child in outline._outlines])
+
+    changes = {}
+    changed_parents = set()
+
+    for outline, parent in reversed(outlines):
+        cache = outline._cache
+        attributes = get_attributes(outline)
+
+        if (
+            cache is None
+            or cache[0] != attributes
+            or cache[1] != (tuple(outline._outlines) if outline._outlines else None)
+            or id(outline) in changed_parents
+        ):
+            changes[id(outline)] = attributes
+
+            if parent is not None:
+                changed_parents.add(id(parent))
+
+    return changes
+
+
+def serialize(document, pretty=False, encoding='UTF-8', validation=STRICT):
+    """Serialize a document to bytes, like :meth:`opml.OpmlDocument.serialize` does, reusing the previous
+    serialization of the outlines which haven't changed since then.
+
+    :raises opml.exceptions.OpmlWriteError:
+    :param opml.OpmlDocument document: The document
+    :param bool pretty: Whether to pretty print the outputted XML code or not
+    :param str encoding: The encoding to use. Will also define the XML's encoding declaration
+    :param validation: ``strict`` or ``off``. Outlines serialized without validation are serialized again by a strict serialization
+    :rtype: bytes
+    """
+    key = (pretty, encoding, validation == STRICT)
+    cache = document._cache
+
+    if cache is not None and cache[0][:2] == key[:2] and (cache[0][2] or not key[2]):
+        old_body, old_children = cache[1], cache[2]
+    else:
+        old_body = old_children = None
+
+    try:
+        body = serialize_outlines(document, old_body, old_children, find_changes(document), pretty, encoding, validation)
+    except Exception:
+        # Some outlines may now point to positions in the unfinished serialization
+        document._cache = None
+
+        raise
+
+    document._cache = (key, body, tuple(document._outlines) if document._outlines else None)
+
+    return serialize_document(document, body, pretty, encoding)
+
+
+def serialize_outlines(document, old_body, old_children, changes, pretty, encoding, validation):
+    view = memoryview(old_body) if old_body is not None else None
+    pieces = []
+    position = 0
+
+    # Each frame is an outline (or the document) being serialized: its position in the new serialization, its
+    # position in the old one (None if its children can't be reused) and the IDs of its old children
+    root_frame = (0, 0 if old_body is not None else None, set(map(id, old_children)) if old_children else set())
+
+    # Each item is either an outline to serialize as ``(outline, parent_frame, level)``, or the closing tag of an
+    # outline whose children have been serialized as ``(closing_tag, outline, attributes, children, start, parent_position)``
+    stack = [(outline, root_frame, 2) for outline in reversed(document._outlines or ())]
+    first = True
+
+    while stack:
+        item = stack.pop()
+
+        if len(item) == 6:
+            closing, outline, attributes, children, start, parent_position = item
+
+            pieces.append(closing)
+            position += len(closing)
+
+            outline._cache = (attributes, children, start, position - parent_position)
+
+            continue
+
+        outline, parent_frame, level = item
+        parent_position, parent_old_position, parent_old_ids = parent_frame
+
+        if pretty:
+            if first:
+                # The first top-level outline is indented by the placeholder
+                first = False
+            else:
+                separator = indentation(level).encode()
+
+                pieces.append(separator)
+                position += len(separator)
+
+        cache = outline._cache
+        attributes = changes.get(id(outline))
+        start = position
+
+        if cache is not None and parent_old_position is not None and id(outline) in parent_old_ids:
+            old_position = parent_old_position + cache[2]
+        else:
+            old_position = None
+
+        if old_position is not None and attributes is None:
+            data = view[old_position:parent_old_position + cache[3]]
+
+            pieces.append(data)
+            position += len(data)
+
+            outline._cache = (cache[0], cache[1], start - parent_position, position - parent_position)
+
+            continue
+
+        if attributes is None:
+            # Unchanged, but its previous serialization can't be found
+            attributes = cache[0]
+
+        tag = etree.tostring(outline.build_node(validation=validation), encoding=encoding, xml_declaration=False)
+        children = tuple(outline._outlines) if outline._outlines else None
+
+        if not children:
+            pieces.append(tag)
+            position += len(tag)
+
+            outline._cache = (attributes, None, start - parent_position, position - parent_position)
+
+            continue
+
+        opening = tag[:-2] + b'>'
+
+        pieces.append(opening)
+        position += len(opening)
+
+        frame = (
+            start,
+            old_position,
+            set(map(id, cache[1])) if old_position is not None and cache[1] else set()
+        )
+
+        stack.append((
+            (indentation(level).encode() if pretty else b'') + b'</outline>',
+            outline,
+            attributes,
+            children,
+            start - parent_position,
+            parent_position
+        ))
+
+        stack.extend(
+            (child, frame, level + 1) for child in reversed(children)
+        )
+
+    return b''.join(pieces)
@@ -0,0 +1,119 @@
+def get_category_keys(categories):
+    """Return the categories as well as all their hierarchical prefixes: ``/Intelligence`` and ``/Intelligence/USA``
+    for ``/Intelligence/USA``.
+
+    :param list categories: The categories
+    :rtype: set
+    """
+    keys = set()
+
+    for category in categories:
+        keys.add(category)
+
+        position = category.find('/', 1)
+
+        while position != -1:
+            keys.add(category[:position])
+
+            position = category.find('/', position + 1)
+
+    return keys
+
+
+class OpmlIndex:
+    """Lookup tables of the outlines of a document, by URL to the feed, by URL and by text, as well as by category if
+    requested. The category table is an inverted index: outlines are indexed under each of their categories and each
+    hierarchical prefix of them, so looking up ``/Intelligence`` finds outlines of category ``/Intelligence/USA``.
+
+    Instances of this class are created by :meth:`opml.OpmlDocument.build_index`. They are kept up to date as outlines
+    are added or removed through :meth:`opml.OpmlDocument.add_outline` (as well as its variants) and
+    :meth:`opml.OpmlDocument.remove_outline`. Outlines whose attributes are modified afterwards, or which are added to
+    or removed from :attr:`opml.OpmlDocument.outlines` directly, must be re-indexed by calling :meth:`remove` then
+    :meth:`add`, or by rebuilding the index.
+
+    :param bool categories: Whether to index outlines by category or not
+    """
+    fields = ('xml_url', 'url', 'text')
+
+    def __init__(self, categories=False):
+        self.tables = {
+            field: {} for field in self.fields
+        }
+
+        if categories:
+            self.tables['category'] = {}
+
+    def add(self, outline):
+        """Index an outline as well as all of its child outlines.
+
+        :param opml.OpmlOutline outline: The outline to index
+        """
+        tables = [(field, table) for field, table in self.tables.items() if field != 'category']
+        categories = self.tables.get('category')
+
+        for outline in self.iter_tree(outline):
+            outline.index = self
+
+            for field, table in tables:
+                value = getattr(outline, field)
+
+                if value:
+                    table.setdefault(value, []).append(outline)
+
+            if categories is not None and outline._categories:
+                for key in get_category_keys(outline._categories):
+                    categories.setdefault(key, []).append(outline)
+
+    def remove(self, outline):
+        """Unindex an outline as well as all of its child outlines.
+
+        :param opml.OpmlOutline outline: The outline to unindex
+        """
+        tables = [(field, table) for field, table in self.tables.items() if field != 'category']
+        categories = self.tables.get('category')
+
+        for outline in self.iter_tree(outline):
+            if outline.index is self:
+                outline.index = None
+
+            for field, table in tables:
+                self.remove_value(table, getattr(outline, field), outline)
+
+            if categories is not None and outline._categories:
+                for key in get_category_keys(outline._categories):
+                    self.remove_value(categories, key, outline)
+
+    @staticmethod
+    def remove_value(table, value, outline):
+        outlines = table.get(value)
+
+        if not outlines:
+            return
+
+        outlines[:] = [
+            indexed_outline for indexed_outline in outlines if indexed_outline is not outline
+        ]
+
+        if not outlines:
+            del table[value]
+
+    def find(self, field, value):
+        """Return the outlines whose ``field`` attribute is ``value``, in the order they were indexed.
+
+        :param str field: One of ``xml_url``, ``url``, ``text`` or ``category`` (if outlines are indexed by category)
+        :param str value: The value to look for
+        :rtype: list
+        """
+        return list(self.tables[field].get(value, ()))
+
+    @staticmethod
+    def iter_tree(outline):
+        stack = [outline]
+
+        while stack:
+            outline = stack.pop()
+
+            yield outline
+
+            if outline._outlines:
+                stack.extend(reversed(outline._outlines))
@@ -0,0 +1,71 @@
+"""Interning of the attribute values of outlines.
+
+lxml returns a new string every time an attribute is read, so without interning, each outline of a loaded document
+holds its own copy of values such as ``rss`` or ``en_US``. Outlines unserialized by :meth:`opml.OpmlDocument.load`
+(and its variants) instead share one string per distinct value of the attributes listed in :data:`TABLES`.
+
+Each table holds at most ``max_size`` distinct strings, and forgets all of them when a new one would exceed that. Values
+such as ``type`` or ``version`` only take a few distinct strings and are never forgotten, while a table of ``htmlUrl``
+values of a large document is reset now and then, outlines loaded before keeping the strings they already share.
+"""
+
+
+class InternTable:
+    """Table of shared strings.
+
+    :param int max_size: Maximum number of strings held by the table
+    :ivar intern: Function returning the shared string equal to a value (or ``None``), which becomes the shared one if there isn't any yet
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.values = values = {}
+
+        get = values.get
+
+        # A closure rather than a method, as it's called for most attributes of every outline
+        def intern(value):
+            shared = get(value)
+
+            if shared is not None:
+                return shared
+
+            if value is None:
+                return None
+
+            if len(values) >= max_size:
+                values.clear()
+
+            values[value] = value
+
+            return value
+
+        self.intern = intern
+
+    def __len__(self):
+        return len(self.values)
+
+    def clear(self):
+        """Empty the table."""
+        self.values.clear()
+
+
+# Tables by outline attribute name
+TABLES = {
+    'type': InternTable(256),
+    'language': InternTable(1024),
+    'version': InternTable(256),
+    'html_url': InternTable(16384),
+    'categories': InternTable(65536),
+}
+
+intern_type = TABLES['type'].intern
+intern_language = TABLES['language'].intern
+intern_version = TABLES['version'].intern
+intern_html_url = TABLES['html_url'].intern
+intern_category = TABLES['categories'].intern
+
+
+def clear():
+    """Empty all the tables, e.g. to release the memory they hold once large documents have been processed."""
+    for table in TABLES.values():
+        table.clear()
@@ -0,0 +1,244 @@
+"""Flattened view of a document as the lines an outliner displays, according to its expansion state.
+
+Outlines are stored in document order along with their depth and where their subtree ends. Visible lines are counted
+by a Fenwick tree (binary indexed tree) over these positions, so the outline displayed on a given line and the line of
+a given outline are both found in ``O(log n)``. Expanding or collapsing an outline only updates the outlines it shows or
+hides, skipping the subtrees of collapsed outlines.
+
+Line numbers start at ``1`` (the first top-level outline), like ``expansionState`` and ``vertScrollState``.
+"""
+
+
+class OpmlLines:
+    """Visible lines of a document, initialized from its ``expansion_state`` and ``vert_scroll_state``.
+
+    Instances of this class are created by :meth:`opml.OpmlDocument.build_lines`. They aren't kept up to date as
+    outlines are added to or removed from the document: build them again once it has changed.
+
+    :param opml.OpmlDocument document: The document
+    :ivar scroll_line: Line displayed on the top line of the window
+    :vartype scroll_line: int
+    """
+    def __init__(self, document):
+        self.outlines = []
+        self.depths = []
+        self.ends = []
+        self.positions = {}
+
+        # Outlines whose subtree hasn't ended yet, from the top-most one
+        open_positions = []
+
+        for outline, depth, parent in document.walk():
+            position = len(self.outlines)
+
+            while len(open_positions) > depth:
+                self.ends[open_positions.pop()] = position
+
+            self.positions[id(outline)] = position
+            self.outlines.append(outline)
+            self.depths.append(depth)
+            self.ends.append(position + 1)
+
+            open_positions.append(position)
+
+        for position in open_positions:
+            self.ends[position] = len(self.outlines)
+
+        size = len(self.outlines)
+
+        self.expanded = bytearray(size)
+        self.visible = bytearray(1 if depth == 0 else 0 for depth in self.depths)
+
+        # Fenwick tree of the visible outlines, built in linear time. Item i covers positions ]i - lowbit(i), i]
+        self.tree = tree = [0] + list(self.visible)
+
+        for i in range(1, size + 1):
+            j = i + (i & -i)
+
+            if j <= size:
+                tree[j] += tree[i]
+
+        self.count = sum(self.visible)
+        self.top_bit = 1 << (size.bit_length() - 1) if size else 0
+
+        for line in document.expansion_state or ():
+            line = int(line)
+
+            if 1 <= line <= self.count:
+                self.expand(self.outlines[self.find(line)])
+
+        scroll_line = int(document.vert_scroll_state) if document.vert_scroll_state else 1
+
+        self.scroll_line = min(max(scroll_line, 1), max(self.count, 1))
+
+    def __len__(self):
+        return self.count
+
+    def find(self, line):
+        """Return the position of the outline displayed on a line."""
+        position = 0
+        remaining = line
+        bit = self.top_bit
+        tree = self.tree
+
+        while bit:
+            next_position = position + bit
+
+            if next_position < len(tree) and tree[next_position] < remaining:
+                position = next_position
+                remaining -= tree[next_position]
+
+            bit >>= 1
+
+        return position
+
+    def update(self, position, delta):
+        tree = self.tree
+        i = position + 1
+
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def get_outline(self, line):
+        """Return the outline displayed on a line.
+
+        :param int line: The line number
+        :raises IndexError: If there's no such line
+        :rtype: opml.OpmlOutline
+        """
+        if not 1 <= line <= self.count:
+            raise IndexError('Line {} out of range'.format(line))
+
+        return self.outlines[self.find(line)]
+
+    def get_line(self, outline):
+        """Return the line an outline is displayed on, or ``None`` if it's hidden because one of its ancestors is
+        collapsed.
+
+        :param opml.OpmlOutline outline: The outline
+        :raises KeyError: If the outline isn't part of the document
+        :rtype: int or None
+        """
+        position = self.positions[id(outline)]
+
+        if not self.visible[position]:
+            return None
+
+        line = 0
+        i = position + 1
+        tree = self.tree
+
+        while i:
+            line += tree[i]
+            i -= i & -i
+
+        return line
+
+    def is_expanded(self, outline):
+        """Return whether an outline is expanded or not.
+
+        :param opml.OpmlOutline outline: The outline
+        :raises KeyError: If the outline isn't part of the document
+        :rtype: bool
+        """
+        return bool(self.expanded[self.positions[id(outline)]])
+
+    def expand(self, outline):
+        """Expand an outline, showing its child outlines (and theirs, if expanded) if the outline is visible itself.
+
+        :param opml.OpmlOutline outline: The outline
+        :raises KeyError: If the outline isn't part of the document
+        """
+        self.set_expanded(self.positions[id(outline)], 1)
+
+    def collapse(self, outline):
+        """Collapse an outline, hiding all of its child outlines. Their own expansion state is kept.
+
+        :param opml.OpmlOutline outline: The outline
+        :raises KeyError: If the outline isn't part of the document
+        """
+        self.set_expanded(self.positions[id(outline)], 0)
+
+    def set_expanded(self, position, expanded):
+        if self.expanded[position] == expanded:
+            return
+
+        self.expanded[position] = expanded
+
+        if not self.visible[position]:
+            return
+
+        delta = 1 if expanded else -1
+        visible = self.visible
+        ends = self.ends
+        end = ends[position]
+        child = position + 1
+
+        # Descendants shown or hidden are those whose ancestors (below this outline) are all expanded
+        while child < end:
+            visible[child] = expanded
+
+            self.update(child, delta)
+            self.count += delta
+
+            child = child + 1 if self.expanded[child] else ends[child]
+
+    def visible_window(self, start=None, count=50):
+        """Return the outlines displayed from a line on, up to a number of lines.
+
+        :param int start: The first line. Defaults to :attr:`scroll_line`
+        :param int count: Maximum number of lines
+        :return: A list of ``(outline, depth)`` tuples. ``depth`` is ``0`` for top-level outlines
+        :rtype: list
+        """
+        if start is None:
+            start = self.scroll_line
+
+        if start < 1:
+            count += start - 1
+            start = 1
+
+        if start > self.count or count <= 0:
+            return []
+
+        outlines = self.outlines
+        depths = self.depths
+        expanded = self.expanded
+        ends = self.ends
+        position = self.find(start)
+        window = []
+
+        while position < len(outlines) and len(window) < count:
+            window.append((outlines[position], depths[position]))
+
+            position = position + 1 if expanded[position] else ends[position]
+
+        return window
+
+    def get_expansion_state(self):
+        """Return the line numbers of the visible outlines that are expanded and have child outlines, e.g. to be saved
+        as :attr:`opml.OpmlDocument.expansion_state`.
+
+        :rtype: list
+        """
+        state = []
+        outlines = self.outlines
+        expanded = self.expanded
+        ends = self.ends
+        position = 0
+        line = 1
+
+        while position < len(outlines):
+            has_children = ends[position] > position + 1
+
+            if expanded[position] and has_children:
+                state.append(line)
+
+                position += 1
+            else:
+                position = ends[position]
+
+            line += 1
+
+        return state
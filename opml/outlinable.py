@@ -1,6 +1,37 @@
+from opml.validation import STRICT
+from collections import deque
+
+PRE_ORDER = 'pre'
+POST_ORDER = 'post'
+BREADTH_FIRST = 'breadth'
+
+
 class Outlinable:
+    # The index is kept by every outline of an indexed document, so adding or removing outlines at any depth doesn't
+    # have to look for the document first
+    __slots__ = ('_outlines', '_cache', 'index')
+
     def __init__(self):
-        self.outlines = []
+        self._outlines = None
+        self._cache = None
+        self.index = None
+
+    @property
+    def outlines(self):
+        """Child outlines of this object.
+
+        The list is only allocated the first time it's accessed, so outlines without children don't cost one.
+
+        :rtype: list
+        """
+        if self._outlines is None:
+            self._outlines = []
+
+        return self._outlines
+
+    @outlines.setter
+    def outlines(self, outlines):
+        self._outlines = outlines
 
     def add_outline(self, text, **kvargs):
         """Create a new outline, append it to this object's outlines and return it.
@@ -23,11 +54,111 @@ class Outlinable:
         from opml.outline import OpmlOutline
 
         outline = OpmlOutline(text, **kvargs)
+        outline.parent = self
 
         self.outlines.append(outline)
 
+        index = self.index
+
+        if index is not None:
+            index.add(outline)
+
         return outline
 
+    def remove_outline(self, outline):
+        """Remove an outline (as well as all of its child outlines) from this object's outlines.
+
+        :param opml.OpmlOutline outline: The outline to remove
+        :raises ValueError: If the outline isn't one of this object's outlines
+        """
+        self.outlines.remove(outline)
+
+        index = self.index
+
+        if index is not None:
+            index.remove(outline)
+
+        outline.parent = None
+
+    def walk(self, order=PRE_ORDER, prune=None):
+        """Iterate over the outlines below this object, at any level, without recursion.
+
+        :param str order: ``pre`` (parents before their children, i.e. document order, the default), ``post`` (children before their parents) or ``breadth`` (level by level)
+        :param prune: A function called with each outline having children and its depth before these are visited, returning whether to skip them. The outline itself is still yielded
+        :return: A generator of ``(outline, depth, parent)`` tuples. ``depth`` is ``0`` for the outlines of this object
+        :raises ValueError: If the order isn't supported
+        """
+        if order == PRE_ORDER:
+            return self._walk_pre_order(prune)
+        elif order == POST_ORDER:
+            return self._walk_post_order(prune)
+        elif order == BREADTH_FIRST:
+            return self._walk_breadth_first(prune)
+
+        raise ValueError('Unsupported order: "{}". Must be one of {}, {} or {}'.format(order, PRE_ORDER, POST_ORDER, BREADTH_FIRST))
+
+    def iter_outlines(self, order=PRE_ORDER, prune=None):
+        """Iterate over the outlines below this object, at any level, without recursion. See :meth:`walk`.
+
+        :return: A generator of :class:`opml.OpmlOutline`
+        """
+        return (
+            outline for outline, depth, parent in self.walk(order, prune)
+        )
+
+    def _walk_pre_order(self, prune):
+        stack = [(outline, 0, self) for outline in reversed(self._outlines or ())]
+
+        while stack:
+            item = stack.pop()
+
+            yield item
+
+            outline, depth, parent = item
+
+            if outline._outlines and not (prune and prune(outline, depth)):
+                stack.extend((child, depth + 1, outline) for child in reversed(outline._outlines))
+
+    def _walk_post_order(self, prune):
+        # Each item tells whether the children of the outline have already been pushed onto the stack
+        stack = [(outline, 0, self, False) for outline in reversed(self._outlines or ())]
+
+        while stack:
+            outline, depth, parent, visited = stack.pop()
+
+            if visited or not outline._outlines or (prune and prune(outline, depth)):
+                yield outline, depth, parent
+
+                continue
+
+            stack.append((outline, depth, parent, True))
+            stack.extend((child, depth + 1, outline, False) for child in reversed(outline._outlines))
+
+    def _walk_breadth_first(self, prune):
+        queue = deque((outline, 0, self) for outline in self._outlines or ())
+
+        while queue:
+            item = queue.popleft()
+
+            yield item
+
+            outline, depth, parent = item
+
+            if outline._outlines and not (prune and prune(outline, depth)):
+                queue.extend((child, depth + 1, outline) for child in outline._outlines)
+
+    def get_root(self):
+        """Return the top-most object this object has been added to (usually a :class:`opml.OpmlDocument`).
+
+        :rtype: opml.OpmlDocument or opml.OpmlOutline
+        """
+        outlinable = self
+
+        while getattr(outlinable, 'parent', None) is not None:
+            outlinable = outlinable.parent
+
+        return outlinable
+
     def add_rss(self, text, xml_url, description=None, html_url=None, language=None, title=None, version=None, is_comment=False, is_breakpoint=False, created=None, categories=[]):
         """Create a new outline of type "rss", append it to this object's outlines and return it.
 
@@ -101,14 +232,46 @@ class Outlinable:
             categories=categories
         )
 
-    def build_outlines_tree(self, parent):
-        for outline in self.outlines:
-            parent.append(outline.build_tree())
+    def build_outlines_tree(self, parent, validation=STRICT):
+        stack = [(self, parent)]
 
-    def unbuild_outlines_tree(self, parent):
-        from opml.outline import OpmlOutline
+        while stack:
+            outlinable, parent = stack.pop()
+
+            if not outlinable._outlines:
+                continue
+
+            for outline in outlinable._outlines:
+                node = outline.build_node(parent, validation)
+
+                stack.append((outline, node))
+
+    def unbuild_outlines_tree(self, parent, lazy=False, validation=STRICT):
+        from opml.outline import OpmlOutline, LazyOpmlOutline
+
+        if lazy:
+            outlines = [
+                LazyOpmlOutline(node, self, validation) for node in parent.iterchildren(tag='outline')
+            ]
+
+            if outlines:
+                self.outlines.extend(outlines)
+
+            return
+
+        stack = [(self, parent)]
+
+        while stack:
+            outlinable, parent = stack.pop()
+            outlines = []
+
+            for node in parent.iterchildren(tag='outline'):
+                outline = OpmlOutline.unbuild_node(node, outlinable, validation)
+
+                outlines.append(outline)
+
+                if len(node):
+                    stack.append((outline, node))
 
-        for node in parent.iterchildren(tag='outline'):
-            self.outlines.append(
-                OpmlOutline.unbuild_tree(node)
-            )
+            if outlines:
+                outlinable.outlines.extend(outlines)
@@ -1,6 +1,8 @@
-from email.utils import format_datetime as datetime_to_rfc2822, parsedate_to_datetime as rfc2822_to_datetime
+from opml.dates import datetime_to_rfc2822, rfc2822_to_datetime
+from opml.exceptions import OpmlReadError, OpmlWriteError
+from opml.validation import STRICT, OFF, check as check_validation
 from opml.outlinable import Outlinable
-from opml import exceptions
+from opml import interning
 from lxml import etree
 
 
@@ -57,11 +59,35 @@ class OpmlOutline(Outlinable):
 
     :param list categories: A list of `RSS 2.0 <https://validator.w3.org/feed/docs/rss2.html#ltcategorygtSubelementOfLtitemgt>`__ categories. To represent a "tag", the category string should contain no slashes
     :ivar categories: A list of `RSS 2.0 <https://validator.w3.org/feed/docs/rss2.html#ltcategorygtSubelementOfLtitemgt>`__ categories. To represent a "tag", the category string should contain no slashes
-    :vartype categories:
+    :vartype categories: list
+
+    :ivar parent: The outline or document this outline has been added to, if any
+    :vartype parent: opml.OpmlOutline or opml.OpmlDocument
+
+    :ivar index: Lookup tables of the outlines of the document this outline has been added to, if built by :meth:`opml.OpmlDocument.build_index`
+    :vartype index: opml.index.OpmlIndex
     """
+    __slots__ = (
+        'parent',
+        'text',
+        'type',
+        'is_comment',
+        'is_breakpoint',
+        'created',
+        'xml_url',
+        'description',
+        'html_url',
+        'language',
+        'title',
+        'version',
+        'url',
+        '_categories',
+    )
+
     def __init__(self, text, **kvargs):
         super(OpmlOutline, self).__init__()
 
+        self.parent = None
         self.text = text
         self.type = kvargs.get('type')
         self.is_comment = kvargs.get('is_comment', False)
@@ -74,94 +100,114 @@ class OpmlOutline(Outlinable):
         self.title = kvargs.get('title')
         self.version = kvargs.get('version')
         self.url = kvargs.get('url')
-        self.categories = kvargs.get('categories', [])
+        self._categories = kvargs.get('categories') or None
 
-    @classmethod
-    def unbuild_tree(cls, node):
-        text = node.get('text')
-        type = node.get('type')
-        xml_url = node.get('xmlUrl')
-        version = node.get('version')
-        url = node.get('url')
-
-        OpmlOutline.validate(
-            'OpmlReadError',
-            text,
-            type,
-            xml_url,
-            version,
-            url
-        )
+    @property
+    def categories(self):
+        if self._categories is None:
+            self._categories = []
 
-        outline = cls(text)
+        return self._categories
 
-        if type:
-            outline.type = type
+    @categories.setter
+    def categories(self, categories):
+        self._categories = categories
 
-        is_comment = node.get('isComment', 'false')
+    def get_path(self):
+        """Return the ancestor outlines of this outline, from the top-level one to its direct parent.
 
-        if is_comment == 'true':
-            outline.is_comment = True
+        :rtype: tuple
+        """
+        path = []
+        outline = self.parent
 
-        is_breakpoint = node.get('isBreakpoint', 'false')
+        while isinstance(outline, OpmlOutline):
+            path.append(outline)
 
-        if is_breakpoint == 'true':
-            outline.is_breakpoint = True
+            outline = outline.parent
 
-        created = node.get('created')
+        return tuple(reversed(path))
 
-        if created:
-            outline.created = rfc2822_to_datetime(created)
+    @classmethod
+    def unbuild_tree(cls, node, parent=None, validation=STRICT):
+        outline = cls.unbuild_node(node, parent, validation)
 
-        if xml_url:
-            outline.xml_url = xml_url
+        outline.unbuild_outlines_tree(node, validation=validation)
 
-        description = node.get('description')
+        return outline
 
-        if description:
-            outline.description = description
+    @classmethod
+    def unbuild_node(cls, node, parent=None, validation=STRICT):
+        outline = cls.__new__(cls)
 
-        html_url = node.get('htmlUrl')
+        Outlinable.__init__(outline)
 
-        if html_url:
-            outline.html_url = html_url
+        outline.parent = parent
+        outline.unbuild_attributes(node, validation)
 
-        language = node.get('language')
+        return outline
 
-        if language:
-            outline.language = language
+    def unbuild_attributes(self, node, validation=STRICT):
+        text = node.get('text')
+        type = node.get('type')
+        xml_url = node.get('xmlUrl')
+        version = node.get('version')
+        url = node.get('url')
 
-        title = node.get('title')
+        parse_date = rfc2822_to_datetime
 
-        if title:
-            outline.title = title
+        if validation == STRICT:
+            OpmlOutline.validate(OpmlReadError, text, type, xml_url, version, url)
+        elif validation != OFF:
+            check_validation(validation)
 
-        if version:
-            outline.version = version
+            validation.validate(OpmlReadError, node, text, type, xml_url, version, url)
 
-        if url:
-            outline.url = url
+            # Validators may time date parsing, see opml.profiling
+            parse_date = getattr(validation, 'parse_date', parse_date)
 
+        created = node.get('created')
         categories = node.get('category')
 
-        if categories:
-            outline.categories = categories.split(',')
+        # Values shared by many outlines are interned, see opml.interning
+        self.text = text
+        self.type = interning.intern_type(type or None)
+        self.is_comment = node.get('isComment') == 'true'
+        self.is_breakpoint = node.get('isBreakpoint') == 'true'
+        self.created = parse_date(created) if created else None
+        self.xml_url = xml_url or None
+        self.description = node.get('description') or None
+        self.html_url = interning.intern_html_url(node.get('htmlUrl') or None)
+        self.language = interning.intern_language(node.get('language') or None)
+        self.title = node.get('title') or None
+        self.version = interning.intern_version(version or None)
+        self.url = url or None
+        self._categories = list(map(interning.intern_category, categories.split(','))) if categories else None
+
+    def build_tree(self, validation=STRICT):
+        node = self.build_node(validation=validation)
+
+        self.build_outlines_tree(node, validation)
+
+        return node
 
-        outline.unbuild_outlines_tree(node)
+    def build_node(self, parent=None, validation=STRICT):
+        format_date = datetime_to_rfc2822
 
-        return outline
+        if validation == STRICT:
+            OpmlOutline.validate(OpmlWriteError, self.text, self.type, self.xml_url, self.version, self.url)
+        elif validation != OFF:
+            check_validation(validation)
 
-    def build_tree(self):
-        OpmlOutline.validate(
-            'OpmlWriteError',
-            self.text,
-            self.type,
-            self.xml_url,
-            self.version,
-            self.url
-        )
+            validation.validate(OpmlWriteError, self, self.text, self.type, self.xml_url, self.version, self.url)
 
-        node = etree.Element('outline', text=self.text)
+            # Validators may time date formatting, see opml.profiling
+            format_date = getattr(validation, 'format_date', format_date)
+
+        if parent is None:
+            node = etree.Element('outline', text=self.text or '')
+        else:
+            node = etree.SubElement(parent, 'outline', text=self.text or '')
 
         if self.type:
             node.set('type', self.type)
@@ -173,7 +219,7 @@ class OpmlOutline(Outlinable):
             node.set('isBreakpoint', 'true')
 
         if self.created:
-            node.set('created', datetime_to_rfc2822(self.created))
+            node.set('created', format_date(self.created))
 
         if self.xml_url:
             node.set('xmlUrl', self.xml_url)
@@ -196,17 +242,13 @@ class OpmlOutline(Outlinable):
         if self.url:
             node.set('url', self.url)
 
-        if self.categories:
-            node.set('category', ','.join(self.categories))
-
-        self.build_outlines_tree(node)
+        if self._categories:
+            node.set('category', ','.join(self._categories))
 
         return node
 
     @staticmethod
-    def validate(exception_class, text, type, xml_url, version, url):
-        exception = getattr(exceptions, exception_class)
-
+    def validate(exception, text, type, xml_url, version, url):
         if not text:
             raise exception('Required outline attribute "text" not found')
 
@@ -221,3 +263,67 @@ class OpmlOutline(Outlinable):
                 raise exception('"version" attribute must be one of "RSS", "RSS1", "RSS2" or "scriptingNews" if set for outlines of type "rss" (outline: "{}")'.format(text))
         elif type in ('link', 'include') and not url:
             raise exception('"url" attribute is required for outlines of type "link" and "include" (outline: "{}")'.format(text))
+
+
+class LazyOpmlOutline(OpmlOutline):
+    """:class:`opml.OpmlOutline` which is a proxy over the XML node it has been unserialized from.
+
+    The node's attributes are only decoded and validated the first time one of the outline's attributes (child
+    outlines included) is read or written, then they are cached as regular attributes. Child outlines are themselves
+    instances of this class. Instances of this class are created by :meth:`opml.OpmlDocument.load` and
+    :meth:`opml.OpmlDocument.loads` when ``lazy`` is ``True``. They are validated according to the ``validation``
+    argument of these methods: validators collect the errors of outlines as they are decoded.
+
+    :param validation: ``strict``, ``off`` or an :class:`opml.validation.OpmlValidator` instance
+    """
+    __slots__ = ('_node', '_validation')
+
+    def __init__(self, node, parent=None, validation=STRICT):
+        object.__setattr__(self, '_node', node)
+        object.__setattr__(self, '_validation', validation)
+        object.__setattr__(self, '_cache', None)
+        object.__setattr__(self, 'parent', parent)
+        object.__setattr__(self, 'index', parent.index if parent is not None else None)
+
+    def __getattr__(self, name):
+        if name == '_outlines' or name in OpmlOutline.__slots__:
+            self.materialize()
+
+            return getattr(self, name)
+
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
+    def __setattr__(self, name, value):
+        if self._node is not None and name not in ('parent', 'index'):
+            self.materialize()
+
+        object.__setattr__(self, name, value)
+
+    def materialize(self):
+        """Decode and validate the attributes of this outline from its XML node, if not already done.
+
+        :raises opml.exceptions.OpmlReadError:
+        """
+        node = self._node
+
+        if node is None:
+            return
+
+        validation = self._validation
+
+        object.__setattr__(self, '_node', None)
+
+        try:
+            self.unbuild_attributes(node, validation)
+        except Exception:
+            object.__setattr__(self, '_node', node)
+
+            raise
+
+        object.__setattr__(self, '_validation', None)
+
+        outlines = [
+            LazyOpmlOutline(child, self, validation) for child in node.iterchildren(tag='outline')
+        ]
+
+        self._outlines = outlines or None
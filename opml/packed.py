@@ -0,0 +1,161 @@
+"""Compact representation of documents made of tuples and lists of plain values only.
+
+It's way cheaper to pickle than :class:`opml.OpmlDocument` / :class:`opml.OpmlOutline` instances, which makes it the
+format used to transfer documents between processes.
+
+A packed document is a ``(head, outlines)`` tuple. ``head`` is a tuple of the document's attributes, in the order of
+:data:`HEAD_ATTRIBUTES`. ``outlines`` is a flat list of all the outlines in document order (i.e. parents before their
+children), each outline being a tuple made of its depth (``0`` for top-level outlines) followed by its attributes in the
+order of :data:`OUTLINE_ATTRIBUTES`.
+"""
+from opml.exceptions import OpmlReadError
+from opml.outlinable import Outlinable
+from opml.outline import OpmlOutline
+from lxml import etree
+
+HEAD_ATTRIBUTES = (
+    'title',
+    'date_created',
+    'date_modified',
+    'owner_name',
+    'owner_email',
+    'owner_id',
+    'expansion_state',
+    'vert_scroll_state',
+    'window_top',
+    'window_left',
+    'window_bottom',
+    'window_right',
+)
+
+OUTLINE_ATTRIBUTES = (
+    'text',
+    'type',
+    'is_comment',
+    'is_breakpoint',
+    'created',
+    'xml_url',
+    'description',
+    'html_url',
+    'language',
+    'title',
+    'version',
+    'url',
+    'categories',
+)
+
+
+def pack(document):
+    """Pack a document.
+
+    :param opml.OpmlDocument document: The document to pack
+    :rtype: tuple
+    """
+    head = tuple(
+        getattr(document, attribute) for attribute in HEAD_ATTRIBUTES
+    )
+
+    return head, pack_outlines(document._outlines or ())
+
+
+def pack_outlines(outlines):
+    """Pack outlines, as well as all of their child outlines, as the ``outlines`` item of a packed document. The given
+    outlines are packed as top-level outlines.
+
+    :param list outlines: The outlines to pack
+    :rtype: list
+    """
+    packed = []
+    stack = [(outline, 0) for outline in reversed(outlines)]
+
+    while stack:
+        outline, depth = stack.pop()
+
+        packed.append((
+            depth,
+            outline.text,
+            outline.type,
+            outline.is_comment,
+            outline.is_breakpoint,
+            outline.created,
+            outline.xml_url,
+            outline.description,
+            outline.html_url,
+            outline.language,
+            outline.title,
+            outline.version,
+            outline.url,
+            tuple(outline._categories) if outline._categories else None,
+        ))
+
+        if outline._outlines:
+            stack.extend((child, depth + 1) for child in reversed(outline._outlines))
+
+    return packed
+
+
+def unpack(packed, document_class=None):
+    """Unpack a document. Outlines aren't validated.
+
+    :param tuple packed: The packed document
+    :param type document_class: Class of the returned document. Defaults to :class:`opml.OpmlDocument`
+    :rtype: opml.OpmlDocument
+    """
+    if document_class is None:
+        from opml.document import OpmlDocument
+
+        document_class = OpmlDocument
+
+    head, outlines = packed
+
+    document = document_class(**dict(zip(HEAD_ATTRIBUTES, head)))
+    parents = [document]
+
+    for depth, text, type, is_comment, is_breakpoint, created, xml_url, description, html_url, language, title, version, url, categories in outlines:
+        outline = OpmlOutline.__new__(OpmlOutline)
+
+        Outlinable.__init__(outline)
+
+        outline.text = text
+        outline.type = type
+        outline.is_comment = is_comment
+        outline.is_breakpoint = is_breakpoint
+        outline.created = created
+        outline.xml_url = xml_url
+        outline.description = description
+        outline.html_url = html_url
+        outline.language = language
+        outline.title = title
+        outline.version = version
+        outline.url = url
+        outline._categories = list(categories) if categories else None
+
+        del parents[depth + 1:]
+
+        parent = parents[depth]
+        outline.parent = parent
+
+        parent.outlines.append(outline)
+        parents.append(outline)
+
+    return document
+
+
+def load_packed(fp, cache_dir=None):
+    """Unserialize OPML 2.0 data from a filename or file-like object and return it packed. Errors are returned instead
+    of being raised, as :class:`opml.exceptions.OpmlReadError` instances.
+
+    :param fp: A filename or file-like object
+    :param str cache_dir: See :meth:`opml.OpmlDocument.load`
+    :rtype: tuple or opml.exceptions.OpmlReadError
+    """
+    from opml.document import OpmlDocument
+
+    try:
+        try:
+            return pack(OpmlDocument.load(fp, cache_dir=cache_dir))
+        except (etree.LxmlError, OSError, ValueError) as e:
+            # Invalid dates or encodings in one file mustn't stop the others from being loaded
+            raise OpmlReadError(str(e)) from e
+    except OpmlReadError as e:
+        return e
@@ -0,0 +1,97 @@
+"""Parallel serialization, which serializes the top-level outlines of a document in a pool of processes.
+
+Top-level outlines are packed (see :mod:`opml.packed`) then split in chunks holding about the same number of outlines.
+Each worker process unpacks a chunk and serializes it inside a ``body`` element with the same indentation as in the
+whole document, then returns the serialization of its outlines. These are eventually joined in place of the ``body``
+of the document, so that the output is the same as the one of a serial serialization.
+"""
+from opml.fragments import serialize_document
+from opml.validation import STRICT
+from lxml import etree
+import os
+
+
+def split(outlines, count):
+    """Split packed outlines in at most ``count`` chunks holding about the same number of outlines. Chunks are only
+    split before top-level outlines.
+
+    :param list outlines: The packed outlines, as returned by :func:`opml.packed.pack_outlines`
+    :param int count: Maximum number of chunks
+    :rtype: list
+    """
+    size = -(-len(outlines) // count)
+    chunks = []
+    start = 0
+
+    for position in range(size, len(outlines), size):
+        if position <= start:
+            continue
+
+        # Move forward to the next top-level outline
+        while position < len(outlines) and outlines[position][0] != 0:
+            position += 1
+
+        if position >= len(outlines):
+            break
+
+        chunks.append(outlines[start:position])
+        start = position
+
+    chunks.append(outlines[start:])
+
+    return chunks
+
+
+def serialize_chunk(outlines, pretty, encoding, validation):
+    """Serialize packed outlines, as well as all of their child outlines, as if they were the top-level outlines of a
+    document.
+
+    :raises opml.exceptions.OpmlWriteError:
+    :param list outlines: The packed outlines
+    :rtype: bytes
+    """
+    from opml.packed import unpack
+
+    document = unpack(((), outlines))
+
+    root = etree.Element('opml')
+    body = etree.SubElement(root, 'body')
+
+    document.build_outlines_tree(body, validation)
+
+    data = etree.tostring(root, pretty_print=pretty, encoding=encoding, xml_declaration=False)
+
+    # Indentation around the outlines is added back when joining chunks
+    return data[data.index(b'<body>') + 6:data.rindex(b'</body>')].strip()
+
+
+def serialize(document, pretty=False, encoding='UTF-8', validation=STRICT, workers=None):
+    """Serialize a document to bytes, like :meth:`opml.OpmlDocument.serialize` does, serializing its top-level
+    outlines in a pool of processes.
+
+    :raises opml.exceptions.OpmlWriteError:
+    :param opml.OpmlDocument document: The document
+    :param bool pretty: Whether to pretty print the outputted XML code or not
+    :param str encoding: The encoding to use. Will also define the XML's encoding declaration
+    :param validation: ``strict`` or ``off``
+    :param int workers: Number of worker processes. Defaults to the number of processors
+    :rtype: bytes
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from opml.packed import pack_outlines
+    from functools import partial
+
+    if not document._outlines:
+        return serialize_document(document, None, pretty, encoding)
+
+    workers = workers or os.cpu_count() or 1
+    chunks = split(pack_outlines(document._outlines), workers * 4)
+    serialize_chunk_ = partial(serialize_chunk, pretty=pretty, encoding=encoding, validation=validation)
+
+    if len(chunks) == 1:
+        bodies = [serialize_chunk_(chunks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            bodies = list(executor.map(serialize_chunk_, chunks))
+
+    return serialize_document(document, (b'\n    ' if pretty else b'').join(bodies), pretty, encoding)
@@ -0,0 +1,87 @@
+"""Configurable XML parsers used to read OPML documents.
+
+lxml parsers can be reused from a call to another, but not shared between threads. :class:`OpmlParser` holds the
+parsing options and lazily creates one lxml parser per thread, so a single instance can be created once (at import
+time, for example) and used by any number of threads.
+"""
+from lxml import etree
+import threading
+
+
+class OpmlParser:
+    """Parsing options of OPML documents, and the lxml parsers created from them.
+
+    Defaults are safe for untrusted documents: nothing is fetched from the network, entities aren't expanded (which
+    prevents both external entities attacks and entity expansion bombs) and neither DTDs nor documents larger than
+    libxml2's safety limits are loaded. Whitespace-only text between nodes, which OPML documents don't use, is
+    dropped so fewer text nodes are created, and IDs aren't collected.
+
+    :param bool huge_tree: Whether to disable libxml2's safety limits on the depth of the tree and the size of text nodes, for very large trusted documents
+    :param bool resolve_entities: Whether to expand entities or not
+    :param bool no_network: Whether to prevent network access when looking up external resources
+    :param bool load_dtd: Whether to load the DTD of documents or not
+    :param bool remove_blank_text: Whether to drop whitespace-only text between nodes or not
+    :param bool remove_comments: Whether to drop XML comments or not
+    """
+    def __init__(self, huge_tree=False, resolve_entities=False, no_network=True, load_dtd=False, remove_blank_text=True, remove_comments=True):
+        self.options = {
+            'huge_tree': huge_tree,
+            'resolve_entities': resolve_entities,
+            'no_network': no_network,
+            'load_dtd': load_dtd,
+            'remove_blank_text': remove_blank_text,
+            'remove_comments': remove_comments,
+            'collect_ids': False,
+        }
+
+        self.local = threading.local()
+
+    @property
+    def parser(self):
+        """The lxml parser of the current thread, created on first use.
+
+        :rtype: lxml.etree.XMLParser
+        """
+        parser = getattr(self.local, 'parser', None)
+
+        if parser is None:
+            parser = self.local.parser = self.create()
+
+        return parser
+
+    def create(self):
+        """Create a new lxml parser, e.g. for the feed interface which can't be shared between concurrent parsings
+        even in a single thread.
+
+        :rtype: lxml.etree.XMLParser
+        """
+        return etree.XMLParser(**self.options)
+
+    def create_pull_parser(self, events):
+        """Create a new lxml pull parser.
+
+        :param tuple events: The events to generate
+        :rtype: lxml.etree.XMLPullParser
+        """
+        return etree.XMLPullParser(events=events, **self.options)
+
+    def parse(self, fp):
+        """Parse XML data from a filename or file-like object.
+
+        :param fp: A filename or file-like object
+        :rtype: lxml.etree._Element
+        :return: The root node
+        """
+        return etree.parse(fp, self.parser).getroot()
+
+    def fromstring(self, data):
+        """Parse XML data from bytes.
+
+        :param bytes data: The XML data
+        :rtype: lxml.etree._Element
+        :return: The root node
+        """
+        return etree.fromstring(data, self.parser)
+
+
+default_parser = OpmlParser()
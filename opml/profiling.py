@@ -0,0 +1,371 @@
+"""Instrumented loading and dumping, which measures where time goes.
+
+Pass an :class:`OpmlStats` instance as the ``stats`` argument of :meth:`opml.OpmlDocument.load`,
+:meth:`opml.OpmlDocument.loads`, :meth:`opml.OpmlDocument.dump` or :meth:`opml.OpmlDocument.dumps` to load or dump
+through the functions of this module. They time the same parsing, building and serialization methods as the regular
+code path, which is left untouched when ``stats`` isn't given.
+
+Phases are:
+
+* ``parse``: reading (and decompressing) the data, and XML parsing by lxml. lxml reads data as it parses it
+* ``unbuild``: building :class:`opml.OpmlDocument` / :class:`opml.OpmlOutline` instances from the XML tree
+* ``build``: building the XML tree from :class:`opml.OpmlDocument` / :class:`opml.OpmlOutline` instances
+* ``serialize``: XML serialization by lxml, and writing (and compressing) the data, as lxml writes data as it serializes it. When serialization is incremental or parallel, the whole serialization
+* ``write``: writing (and compressing) the data of incremental or parallel serializations
+* ``validate``: validating outlines. This happens during ``unbuild`` and ``build``, so it is part of their time as well
+* ``dates``: parsing and formatting the ``created`` date of outlines. This happens during ``unbuild`` and ``build``, so it is part of their time as well
+* ``snapshot``: loading the document from a binary snapshot (see :class:`opml.snapshot.SnapshotCache`)
+"""
+from opml.dates import datetime_to_rfc2822, rfc2822_to_datetime
+from opml.validation import STRICT, OFF, check as check_validation
+from contextlib import contextmanager
+from lxml import etree
+import time
+import os
+
+
+class OpmlStats:
+    """Timings and counters of one or more loads and dumps. The same instance may be used several times, values
+    accumulating.
+
+    :ivar times: Wall time spent in each phase, in seconds
+    :vartype times: dict
+    :ivar loads: Number of documents loaded
+    :vartype loads: int
+    :ivar dumps: Number of documents dumped
+    :vartype dumps: int
+    :ivar outlines: Number of outlines loaded or dumped
+    :vartype outlines: int
+    :ivar dates: Number of outline dates (``created`` attribute) loaded or dumped
+    :vartype dates: int
+    :ivar max_depth: Deepest level of outlines loaded or dumped (``1`` for top-level outlines)
+    :vartype max_depth: int
+    :ivar bytes_in: Number of bytes loaded, as stored (i.e. compressed, if so)
+    :vartype bytes_in: int
+    :ivar bytes_out: Number of bytes dumped, as stored (i.e. compressed, if so)
+    :vartype bytes_out: int
+    """
+    def __init__(self):
+        self.times = {}
+        self.loads = 0
+        self.dumps = 0
+        self.outlines = 0
+        self.dates = 0
+        self.max_depth = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager which adds the wall time spent in its block to the given phase.
+
+        :param str name: Name of the phase
+        """
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        self.times[name] = self.times.get(name, 0.0) + seconds
+
+    def count(self, outlines, dates, max_depth):
+        self.outlines += outlines
+        self.dates += dates
+        self.max_depth = max(self.max_depth, max_depth)
+
+    def as_dict(self):
+        """Return all values as a flat dict, e.g. to be exported to a metrics system. Times are named after their
+        phase with a ``_seconds`` suffix (e.g. ``parse_seconds``).
+
+        :rtype: dict
+        """
+        values = {
+            '{}_seconds'.format(name): seconds for name, seconds in self.times.items()
+        }
+
+        values.update(
+            loads=self.loads,
+            dumps=self.dumps,
+            outlines=self.outlines,
+            dates=self.dates,
+            max_depth=self.max_depth,
+            bytes_in=self.bytes_in,
+            bytes_out=self.bytes_out,
+        )
+
+        return values
+
+    def __repr__(self):
+        return '<OpmlStats {}>'.format(' '.join(
+            '{}={}'.format(name, round(value, 6) if isinstance(value, float) else value) for name, value in self.as_dict().items()
+        ))
+
+
+class TimedValidator:
+    """Validator which adds the time spent validating outlines to the ``validate`` phase of an :class:`OpmlStats`, then
+    raises or collects errors like the wrapped validation does. Also times the parsing and formatting of outline dates
+    as the ``dates`` phase.
+
+    :raises ValueError: If ``validation`` isn't supported
+    :param OpmlStats stats: The stats
+    :param validation: ``strict``, ``off`` or an :class:`opml.validation.OpmlValidator` instance
+    """
+    def __init__(self, stats, validation):
+        # Once wrapped, the validation mode can't be checked anymore
+        check_validation(validation)
+
+        self.stats = stats
+        self.validation = validation
+
+    def validate(self, exception, source, text, type, xml_url, version, url):
+        from opml.outline import OpmlOutline
+
+        if self.validation == OFF:
+            return
+
+        start = time.perf_counter()
+
+        try:
+            if self.validation == STRICT:
+                OpmlOutline.validate(exception, text, type, xml_url, version, url)
+            else:
+                self.validation.validate(exception, source, text, type, xml_url, version, url)
+        finally:
+            self.stats.add_time('validate', time.perf_counter() - start)
+
+    def parse_date(self, value):
+        start = time.perf_counter()
+
+        try:
+            return rfc2822_to_datetime(value)
+        finally:
+            self.stats.add_time('dates', time.perf_counter() - start)
+
+    def format_date(self, value):
+        start = time.perf_counter()
+
+        try:
+            return datetime_to_rfc2822(value)
+        finally:
+            self.stats.add_time('dates', time.perf_counter() - start)
+
+
+class CountingFile:
+    """Proxy over a file-like object which counts the bytes read from or written to it. Characters of text files are
+    counted once encoded.
+
+    :param fp: The file-like object
+    """
+    def __init__(self, fp):
+        self.fp = fp
+        self.count = 0
+
+    def size(self, data):
+        if isinstance(data, str):
+            return len(data.encode(getattr(self.fp, 'encoding', None) or 'UTF-8'))
+
+        return len(data)
+
+    def read(self, *args):
+        data = self.fp.read(*args)
+
+        self.count += self.size(data)
+
+        return data
+
+    def write(self, data):
+        self.count += self.size(data)
+
+        return self.fp.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.fp, name)
+
+
+@contextmanager
+def counting(fp):
+    """Context manager yielding what to read from or write to instead of a filename or file-like object, and a
+    function returning the number of bytes read or written so far. Compressed data is counted as stored.
+    """
+    if isinstance(fp, str):
+        yield fp, lambda: os.path.getsize(fp)
+    elif hasattr(fp, 'seekable') and fp.seekable():
+        # Codecs may read the first bytes then seek back, which a proxy would count
+        start = fp.tell()
+
+        yield fp, lambda: fp.tell() - start
+    else:
+        proxy = CountingFile(fp)
+
+        yield proxy, lambda: proxy.count
+
+
+def timed(stats, validation):
+    return TimedValidator(stats, validation)
+
+
+def count_nodes(body):
+    """Return the number of outlines, of outline dates and the max depth of an XML ``body`` node.
+
+    :rtype: tuple
+    """
+    outlines = dates = max_depth = depth = 0
+
+    for event, node in etree.iterwalk(body, events=('start', 'end'), tag='outline'):
+        if event == 'end':
+            depth -= 1
+
+            continue
+
+        depth += 1
+        outlines += 1
+
+        if node.get('created'):
+            dates += 1
+
+        if depth > max_depth:
+            max_depth = depth
+
+    return outlines, dates, max_depth
+
+
+def count_outlines(document):
+    """Return the number of outlines, of outline dates and the max depth of a document.
+
+    :rtype: tuple
+    """
+    outlines = dates = max_depth = 0
+    stack = [(outline, 1) for outline in document._outlines or ()]
+
+    while stack:
+        outline, depth = stack.pop()
+
+        outlines += 1
+
+        if outline.created:
+            dates += 1
+
+        if depth > max_depth:
+            max_depth = depth
+
+        if outline._outlines:
+            stack.extend((child, depth + 1) for child in outline._outlines)
+
+    return outlines, dates, max_depth
+
+
+def unbuild(cls, root, stats, lazy, validation):
+    with stats.phase('unbuild'):
+        document = cls.unbuild_tree(root, lazy=lazy, validation=timed(stats, validation))
+
+    stats.count(*count_nodes(root.find('body')))
+    stats.loads += 1
+
+    return document
+
+
+def loads(cls, s, stats, lazy=False, validation=STRICT, parser=None):
+    """Unserialize OPML 2.0 data from a string, like :meth:`opml.OpmlDocument.loads` does, measuring each phase.
+
+    :raises opml.exceptions.OpmlReadError:
+    :param type cls: Class of the returned document
+    :param str s: The string to unserialize from
+    :param OpmlStats stats: The stats to add measures to
+    :rtype: opml.OpmlDocument
+    """
+    with stats.phase('parse'):
+        root = cls.parse_string(s, parser)
+
+    stats.bytes_in += len(s.encode())
+
+    return unbuild(cls, root, stats, lazy, validation)
+
+
+def load(cls, fp, stats, lazy=False, validation=STRICT, cache_dir=None, compression='infer', parser=None):
+    """Unserialize OPML 2.0 data from a filename or file-like object, like :meth:`opml.OpmlDocument.load` does,
+    measuring each phase.
+
+    :raises opml.exceptions.OpmlReadError:
+    :param type cls: Class of the returned document
+    :param fp: A filename or file-like object
+    :param OpmlStats stats: The stats to add measures to
+    :rtype: opml.OpmlDocument
+    """
+    if cache_dir is not None and not lazy and validation in (STRICT, OFF):
+        from opml.snapshot import SnapshotCache
+
+        with stats.phase('snapshot'):
+            document = SnapshotCache(cache_dir).load(cls, fp, validation, compression, parser)
+
+        stats.count(*count_outlines(document))
+        stats.loads += 1
+
+        return document
+
+    with counting(fp) as (source, size):
+        with stats.phase('parse'):
+            root = cls.parse(source, compression, parser)
+
+        stats.bytes_in += size()
+
+    return unbuild(cls, root, stats, lazy, validation)
+
+
+def serialize(document, stats, pretty=False, encoding='UTF-8', validation=STRICT, incremental=False, workers=None):
+    """Serialize a document to bytes, like :meth:`opml.OpmlDocument.serialize` does, measuring each phase.
+
+    :raises opml.exceptions.OpmlWriteError:
+    :param opml.OpmlDocument document: The document
+    :param OpmlStats stats: The stats to add measures to
+    :rtype: bytes
+    """
+    if incremental or workers:
+        # Validation happens within the serialization, possibly in other processes
+        with stats.phase('serialize'):
+            data = document.serialize(pretty, encoding, validation, incremental, workers)
+    else:
+        with stats.phase('build'):
+            root = document.build_tree(timed(stats, validation))
+
+        with stats.phase('serialize'):
+            data = document.serialize_tree(root, pretty, encoding)
+
+    stats.count(*count_outlines(document))
+    stats.bytes_out += len(data)
+    stats.dumps += 1
+
+    return data
+
+
+def dump(document, fp, stats, pretty=False, encoding='UTF-8', validation=STRICT, incremental=False, compression='infer', workers=None):
+    """Serialize a document to a filename or file-like object, like :meth:`opml.OpmlDocument.dump` does, measuring each
+    phase.
+
+    :raises opml.exceptions.OpmlWriteError:
+    :param opml.OpmlDocument document: The document
+    :param fp: A filename or file-like object
+    :param OpmlStats stats: The stats to add measures to
+    """
+    from opml.compression import write_data
+
+    with counting(fp) as (target, size):
+        if incremental or workers:
+            with stats.phase('serialize'):
+                data = document.serialize(pretty, encoding, validation, incremental, workers)
+
+            with stats.phase('write'):
+                write_data(target, data, compression)
+        else:
+            with stats.phase('build'):
+                root = document.build_tree(timed(stats, validation))
+
+            with stats.phase('serialize'):
+                document.write_tree(root, target, pretty, encoding, compression)
+
+        stats.bytes_out += size()
+
+    stats.count(*count_outlines(document))
+    stats.dumps += 1
@@ -0,0 +1,169 @@
+"""Queries on the outlines of OPML documents, run against the XML tree.
+
+A query is a predicate on outlines compiled to an XPath expression, so selecting outlines only creates
+:class:`opml.OpmlOutline` instances for the matching ones instead of for the whole document. Queries are built with
+the functions of this module and combined with the ``&`` (and), ``|`` (or) and ``~`` (not) operators. For example,
+all the outlines of type "rss" tagged "/Intelligence/USA" in a "Feeds" top-level folder:
+
+.. code-block:: python
+
+    from opml.query import where, category, under, depth
+
+    query = where(type='rss') & category('/Intelligence/USA') & under(where(text='Feeds') & depth(max=0))
+
+Values are passed to XPath as variables, so they never need any escaping.
+"""
+from itertools import count
+from lxml import etree
+
+# XML attribute names, by name of the attribute of :class:`opml.OpmlOutline`
+ATTRIBUTES = {
+    'text': 'text',
+    'type': 'type',
+    'is_comment': 'isComment',
+    'is_breakpoint': 'isBreakpoint',
+    'created': 'created',
+    'xml_url': 'xmlUrl',
+    'description': 'description',
+    'html_url': 'htmlUrl',
+    'language': 'language',
+    'title': 'title',
+    'version': 'version',
+    'url': 'url',
+    'categories': 'category',
+}
+
+# next() on a count is atomic, unlike on a generator, so queries may be built from several threads at once
+variable_numbers = count()
+
+
+class OpmlQuery:
+    """Predicate on outlines, as an XPath expression evaluated with the ``outline`` node as the context node.
+
+    :param str expression: The XPath expression
+    :param dict variables: Values of the XPath variables the expression references, by name
+    """
+    def __init__(self, expression, variables=None):
+        self.expression = expression
+        self.variables = variables or {}
+        self.xpath = None
+
+    def __and__(self, other):
+        return OpmlQuery('({}) and ({})'.format(self.expression, other.expression), dict(self.variables, **other.variables))
+
+    def __or__(self, other):
+        return OpmlQuery('({}) or ({})'.format(self.expression, other.expression), dict(self.variables, **other.variables))
+
+    def __invert__(self):
+        return OpmlQuery('not({})'.format(self.expression), self.variables)
+
+    def __repr__(self):
+        return '<OpmlQuery {}>'.format(self.expression)
+
+    def select(self, root):
+        """Return the ``outline`` nodes of a parsed document matching this query, in document order.
+
+        :param lxml.etree._Element root: The ``opml`` node
+        :rtype: list
+        """
+        if self.xpath is None:
+            self.xpath = etree.XPath('body//outline[{}]'.format(self.expression), smart_strings=False)
+
+        return self.xpath(root, **self.variables)
+
+
+def variable(value):
+    name = 'v{}'.format(next(variable_numbers))
+
+    return '${}'.format(name), {name: value}
+
+
+def where(**attributes):
+    """Match outlines whose attributes have the given values. ``None`` matches a missing attribute.
+
+    :param attributes: Values by attribute name, as named in :class:`opml.OpmlOutline`. ``created`` and ``categories`` are compared to the raw XML value
+    :rtype: opml.query.OpmlQuery
+    """
+    expressions = []
+    variables = {}
+
+    for name, value in sorted(attributes.items()):
+        try:
+            attribute = '@' + ATTRIBUTES[name]
+        except KeyError:
+            raise ValueError('Unknown outline attribute: "{}"'.format(name))
+
+        if name in ('is_comment', 'is_breakpoint'):
+            expressions.append('{}="true"'.format(attribute) if value else 'not({}="true")'.format(attribute))
+        elif value is None:
+            expressions.append('not({}) or {}=""'.format(attribute, attribute))
+        else:
+            reference, value_variables = variable(value)
+
+            expressions.append('{}={}'.format(attribute, reference))
+            variables.update(value_variables)
+
+    return OpmlQuery(' and '.join('({})'.format(expression) for expression in expressions) or 'true()', variables)
+
+
+def contains(name, value):
+    """Match outlines whose attribute contains a substring.
+
+    :param str name: Name of the attribute, as named in :class:`opml.OpmlOutline`
+    :param str value: The substring
+    :rtype: opml.query.OpmlQuery
+    """
+    try:
+        attribute = '@' + ATTRIBUTES[name]
+    except KeyError:
+        raise ValueError('Unknown outline attribute: "{}"'.format(name))
+
+    reference, variables = variable(value)
+
+    return OpmlQuery('contains({}, {})'.format(attribute, reference), variables)
+
+
+def category(value):
+    """Match outlines having a category.
+
+    :param str value: The category
+    :rtype: opml.query.OpmlQuery
+    """
+    reference, variables = variable(',{},'.format(value))
+
+    return OpmlQuery('contains(concat(",", @category, ","), {})'.format(reference), variables)
+
+
+def depth(min=None, max=None):
+    """Match outlines whose nesting level is within bounds, ``0`` being a top-level outline.
+
+    :param int min: Minimum nesting level (included)
+    :param int max: Maximum nesting level (included)
+    :rtype: opml.query.OpmlQuery
+    """
+    expressions = []
+
+    if min is not None:
+        expressions.append('count(ancestor::outline) >= {:d}'.format(min))
+
+    if max is not None:
+        expressions.append('count(ancestor::outline) <= {:d}'.format(max))
+
+    return OpmlQuery(' and '.join(expressions) or 'true()')
+
+
+def under(query):
+    """Match outlines having an ancestor (at any level) matching a query.
+
+    :param opml.query.OpmlQuery query: The query the ancestor must match
+    :rtype: opml.query.OpmlQuery
+    """
+    return OpmlQuery('ancestor::outline[{}]'.format(query.expression), query.variables)
+
+
+def has_children():
+    """Match outlines having child outlines.
+
+    :rtype: opml.query.OpmlQuery
+    """
+    return OpmlQuery('outline')
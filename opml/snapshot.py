@@ -0,0 +1,228 @@
+"""Binary snapshots of parsed documents, which are much faster to load than the OPML documents themselves.
+
+A snapshot is a packed document (see :mod:`opml.packed`) serialized with :mod:`marshal`, date-times being stored as
+tuples, preceded by a header identifying the source document it has been created from. Snapshot files are
+memory-mapped when read.
+"""
+from datetime import datetime, timedelta, timezone
+from opml.packed import pack, unpack
+from opml.validation import STRICT, OFF
+import tempfile
+import hashlib
+import marshal
+import struct
+import mmap
+import io
+import os
+
+MAGIC = b'OPMLSNAP'
+VERSION = 1
+
+# Magic bytes followed by the length of the marshalled header
+PREFIX = struct.Struct('<8sI')
+
+
+def dumps(document, key=None, validated=True):
+    """Return a snapshot of a document.
+
+    :param opml.OpmlDocument document: The document
+    :param key: Marshallable value identifying the source of the document
+    :param bool validated: Whether the document's outlines have been validated
+    :rtype: bytes
+    """
+    head, outlines = pack(document)
+    dates = {}
+
+    def convert(value):
+        if not isinstance(value, datetime):
+            return value
+
+        date = dates.get(value)
+
+        if date is None:
+            offset = value.utcoffset()
+
+            date = dates[value] = (
+                value.year,
+                value.month,
+                value.day,
+                value.hour,
+                value.minute,
+                value.second,
+                value.microsecond,
+                None if offset is None else offset // timedelta(seconds=1),
+            )
+
+        return date
+
+    header = marshal.dumps((VERSION, key, validated))
+    body = marshal.dumps((
+        tuple(map(convert, head)),
+        [
+            outline[:5] + (convert(outline[5]),) + outline[6:] if outline[5] else outline for outline in outlines
+        ]
+    ))
+
+    return PREFIX.pack(MAGIC, len(header)) + header + body
+
+
+def loads(data, key=None, validated=False, document_class=None):
+    """Create a document from a snapshot. Outlines aren't validated.
+
+    :param data: The snapshot, as a bytes-like object
+    :param key: Value the snapshot's key must be equal to
+    :param bool validated: Whether the snapshot must have been created from a document whose outlines were validated
+    :param type document_class: Class of the returned document. Defaults to :class:`opml.OpmlDocument`
+    :rtype: opml.OpmlDocument or None
+    :return: ``None`` if the snapshot is invalid, has been created by another version of this module or doesn't match
+             ``key`` or ``validated``
+    """
+    data = memoryview(data)
+
+    try:
+        magic, length = PREFIX.unpack_from(data)
+        version, snapshot_key, snapshot_validated = marshal.loads(data[PREFIX.size:PREFIX.size + length])
+    except (struct.error, EOFError, ValueError, TypeError):
+        return None
+
+    if magic != MAGIC or version != VERSION or snapshot_key != key or (validated and not snapshot_validated):
+        return None
+
+    try:
+        head, outlines = marshal.loads(data[PREFIX.size + length:])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+    dates = {}
+    timezones = {}
+
+    def convert(value):
+        if not isinstance(value, tuple):
+            return value
+
+        date = dates.get(value)
+
+        if date is None:
+            offset = value[7]
+
+            if offset is None:
+                tzinfo = None
+            else:
+                tzinfo = timezones.get(offset)
+
+                if tzinfo is None:
+                    tzinfo = timezones[offset] = timezone(timedelta(seconds=offset))
+
+            date = dates[value] = datetime(*value[:7], tzinfo=tzinfo)
+
+        return date
+
+    return unpack((
+        tuple(map(convert, head)),
+        [
+            outline[:5] + (convert(outline[5]),) + outline[6:] if outline[5] else outline for outline in outlines
+        ]
+    ), document_class)
+
+
+def dump(document, filename, key=None, validated=True):
+    """Write a snapshot of a document to a file. The file is replaced atomically.
+
+    :param opml.OpmlDocument document: The document
+    :param str filename: The snapshot's filename
+    :param key: Marshallable value identifying the source of the document
+    :param bool validated: Whether the document's outlines have been validated
+    """
+    data = dumps(document, key, validated)
+    fd, temp_filename = tempfile.mkstemp(dir=os.path.dirname(filename) or None, suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+
+        os.replace(temp_filename, filename)
+    except BaseException:
+        os.unlink(temp_filename)
+
+        raise
+
+
+def load(filename, key=None, validated=False, document_class=None):
+    """Create a document from a snapshot file, which is memory-mapped. Outlines aren't validated.
+
+    :param str filename: The snapshot's filename
+    :param key: Value the snapshot's key must be equal to
+    :param bool validated: Whether the snapshot must have been created from a document whose outlines were validated
+    :param type document_class: Class of the returned document. Defaults to :class:`opml.OpmlDocument`
+    :rtype: opml.OpmlDocument or None
+    :return: ``None`` if the file doesn't exist, is invalid, has been created by another version of this module or
+             doesn't match ``key`` or ``validated``
+    """
+    try:
+        with open(filename, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return loads(data, key, validated, document_class)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+class SnapshotCache:
+    """Directory of snapshots of parsed OPML documents, used by :meth:`opml.OpmlDocument.load` when given a
+    ``cache_dir``.
+
+    Snapshots of documents given as filenames are keyed by the absolute path, size and modification time of the file.
+    Snapshots of documents given as file-like objects are keyed by the SHA-1 hash of their content. A snapshot whose key
+    doesn't match the source document anymore is stale: the document is parsed again and the snapshot replaced.
+
+    :param str cache_dir: Directory the snapshots are stored in. Created if needed
+    """
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def load(self, document_class, fp, validation=STRICT, compression='infer', parser=None):
+        """Load a document from its snapshot if it's fresh, or by parsing it then creating its snapshot otherwise.
+
+        :raises opml.exceptions.OpmlReadError:
+        :param type document_class: Class of the returned document
+        :param fp: A filename or file-like object
+        :param validation: ``strict`` or ``off``. A snapshot created without validation is stale for a strict load
+        :param str compression: Codec the document is compressed with. See :mod:`opml.compression`
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :rtype: opml.OpmlDocument
+        """
+        filename, key, content = self.identify(fp)
+        validated = validation != OFF
+
+        document = load(filename, key, validated, document_class)
+
+        if document is not None:
+            return document
+
+        if content is None:
+            document = document_class.load(fp, validation=validation, compression=compression, parser=parser)
+        else:
+            document = document_class.load(io.BytesIO(content), validation=validation, compression=compression, parser=parser)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        dump(document, filename, key, validated)
+
+        return document
+
+    def identify(self, fp):
+        if isinstance(fp, str):
+            path = os.path.abspath(fp)
+            stat = os.stat(path)
+
+            key = (path, stat.st_size, stat.st_mtime_ns)
+            name = hashlib.sha1(path.encode()).hexdigest()
+            content = None
+        else:
+            content = fp.read()
+
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+
+            key = name = hashlib.sha1(content).hexdigest()
+
+        return os.path.join(self.cache_dir, name + '.snapshot'), key, content
@@ -0,0 +1,252 @@
+from opml.fragments import indentation, indent
+from opml.compression import open_compressed
+from opml.exceptions import OpmlReadError
+from opml.parser import default_parser
+from opml.outline import OpmlOutline
+from contextlib import contextmanager
+from lxml import etree
+
+CHUNK_SIZE = 64 * 1024
+
+
+class OpmlIterator:
+    """Iterator over the outlines of an OPML 2.0 document which never holds the whole document in memory.
+
+    Instances of this class are returned by :meth:`opml.OpmlDocument.iterload`. The ``head`` node is parsed as soon as
+    the iterator is created, then iterating over it yields ``(outline, depth, path)`` tuples in the order the outlines
+    are finished, i.e. child outlines come before their parent:
+
+    * ``outline`` is a :class:`opml.OpmlOutline` instance, without its child outlines (they have already been yielded)
+    * ``depth`` is the nesting level of the outline, ``0`` being a top-level outline
+    * ``path`` is a tuple of the :class:`opml.OpmlOutline` ancestors of the outline, from the top-level one to its
+      direct parent (also without their child outlines)
+
+    :ivar document: The document, with its metadata populated from the ``head`` node but without any outline
+    :vartype document: opml.OpmlDocument
+    """
+    def __init__(self, document_class, fp, compression='infer', parser=None):
+        self.document_class = document_class
+        self.root = None
+        self.events = self.iterevents(fp, compression, parser)
+        self.document = self.read_head()
+        self.outlines = self.read_outlines()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.outlines)
+
+    @staticmethod
+    def iterevents(fp, compression='infer', parser=None):
+        parser = (parser or default_parser).create_pull_parser(('start', 'end'))
+
+        if isinstance(fp, str):
+            f = open(fp, 'rb')
+        else:
+            f = fp
+
+        try:
+            with open_compressed(f, 'rb', compression) as data:
+                while True:
+                    chunk = data.read(CHUNK_SIZE)
+
+                    if not chunk:
+                        break
+
+                    parser.feed(chunk)
+
+                    yield from parser.read_events()
+
+            parser.close()
+
+            yield from parser.read_events()
+        finally:
+            if f is not fp:
+                f.close()
+
+    def read_head(self):
+        for event, element in self.events:
+            if self.root is None:
+                self.root = element
+
+                self.document_class.check_root(element)
+            elif element.getparent() is not self.root:
+                continue
+            elif event == 'start' and element.tag == 'body':
+                break
+            elif event == 'end' and element.tag == 'head':
+                document = self.document_class()
+                document.unbuild_head(element)
+
+                element.clear()
+
+                return document
+
+        raise OpmlReadError('"head" node not found')
+
+    def read_outlines(self):
+        body = None
+        nodes = []
+        path = []
+
+        for event, element in self.events:
+            if event == 'start':
+                if body is None:
+                    if element.tag == 'body' and element.getparent() is self.root:
+                        body = element
+                elif element.tag == 'outline' and element.getparent() is (nodes[-1] if nodes else body):
+                    nodes.append(element)
+                    path.append(OpmlOutline.unbuild_node(element, path[-1] if path else self.document))
+            elif nodes and element is nodes[-1]:
+                nodes.pop()
+                outline = path.pop()
+
+                yield outline, len(path), tuple(path)
+
+                element.clear()
+
+                parent = element.getparent()
+
+                while element.getprevious() is not None:
+                    del parent[0]
+            elif body is not None and element is body:
+                self.events.close()
+
+                return
+
+        raise OpmlReadError('"body" node not found')
+
+
+class OpmlWriter:
+    """Context manager which serializes an OPML 2.0 document to a filename or file-like object incrementally.
+
+    Contrary to :meth:`opml.OpmlDocument.dump`, no XML tree of the whole document is built: the ``head`` node is
+    written from the given document when entering the context, then outlines are written one at a time as they are
+    given. The output is byte-identical to what :meth:`opml.OpmlDocument.dump` would have written.
+
+    :param fp: A filename or file-like object (opened in binary mode)
+    :param opml.OpmlDocument document: The document whose metadata will be written in the ``head`` node. Its outlines are ignored
+    :param bool pretty: Whether to pretty print the outputted XML code or not
+    :param str encoding: The encoding to use. Will also define the XML's encoding declaration
+    :param str compression: Codec to compress the data with, one of ``gzip``, ``bz2``, ``xz`` or ``zstd``. Inferred from the filename's extension by default. See :mod:`opml.compression`
+    """
+    def __init__(self, fp, document=None, pretty=False, encoding='UTF-8', compression='infer'):
+        from opml.document import OpmlDocument
+
+        self.fp = fp
+        self.document = document if document is not None else OpmlDocument()
+        self.pretty = pretty
+        self.encoding = encoding
+        self.compression = compression
+
+    def __enter__(self):
+        self.codec = open_compressed(self.fp, 'wb', self.compression)
+        output = self.codec.__enter__()
+        self.file = open(output, 'wb') if isinstance(output, str) else output
+        self.xmlfile = etree.xmlfile(self.file, encoding=self.encoding)
+        self.xf = self.xmlfile.__enter__()
+
+        self.xf.write_declaration()
+
+        self.root = self.xf.element('opml', version='2.0')
+        self.root.__enter__()
+
+        self.write_node(self.document.build_head(), 1)
+
+        # Each item is the node to write, the context of the opened node (None while it has no children) and its level
+        self.stack = [[etree.Element('body'), None, 1]]
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                while self.stack:
+                    self.close_node()
+
+                if self.pretty:
+                    self.xf.write('\n')
+
+                self.root.__exit__(None, None, None)
+
+            self.xmlfile.__exit__(exc_type, exc_value, traceback)
+
+            if exc_type is None and self.pretty:
+                self.file.write('\n'.encode(self.encoding))
+        finally:
+            if isinstance(self.fp, str):
+                self.file.close()
+
+            self.codec.__exit__(None, None, None)
+
+    def write(self, outline):
+        """Write an outline, as well as all of its child outlines, in the current outline (or in the body).
+
+        :raises opml.exceptions.OpmlWriteError:
+        :param opml.OpmlOutline outline: The outline to write
+        """
+        self.open_nodes()
+
+        self.write_node(outline.build_tree(), self.stack[-1][2] + 1)
+
+    def write_many(self, outlines):
+        """Write outlines, as well as all of their child outlines, in the current outline (or in the body).
+
+        :raises opml.exceptions.OpmlWriteError:
+        :param outlines: An iterable (a generator, for example) of :class:`opml.OpmlOutline`
+        """
+        for outline in outlines:
+            self.write(outline)
+
+    @contextmanager
+    def outline(self, text, **kvargs):
+        """Context manager which writes a new outline in the current outline (or in the body). Outlines written while
+        in this context will be children of this one.
+
+        Takes the same arguments as :meth:`opml.OpmlDocument.add_outline`.
+
+        :raises opml.exceptions.OpmlWriteError:
+        :rtype: opml.OpmlOutline
+        """
+        outline = OpmlOutline(text, **kvargs)
+
+        self.open_nodes()
+
+        self.stack.append([outline.build_node(), None, self.stack[-1][2] + 1])
+
+        yield outline
+
+        self.close_node()
+
+    def open_nodes(self):
+        for item in self.stack:
+            node, context, level = item
+
+            if context is not None:
+                continue
+
+            if self.pretty:
+                self.xf.write(indentation(level))
+
+            item[1] = self.xf.element(node.tag, dict(node.attrib))
+            item[1].__enter__()
+
+    def close_node(self):
+        node, context, level = self.stack.pop()
+
+        if context is None:
+            self.write_node(node, level)
+        else:
+            if self.pretty:
+                self.xf.write(indentation(level))
+
+            context.__exit__(None, None, None)
+
+    def write_node(self, node, level):
+        if self.pretty:
+            self.xf.write(indentation(level))
+
+            indent(node, level)
+
+        self.xf.write(node)
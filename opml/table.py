@@ -0,0 +1,414 @@
+"""Columnar representation of documents, meant for analytics over very large documents.
+
+Instead of one :class:`opml.OpmlOutline` instance per outline, :class:`OpmlTable` stores outlines as parallel columns
+(one item per outline, in document order) of integers. String attributes are dictionary-encoded: each distinct value
+is stored once in the table's string pool, and columns hold the codes of the values.
+"""
+from opml.dates import datetime_to_rfc2822, rfc2822_to_datetime
+from opml.exceptions import OpmlReadError
+from opml.validation import STRICT, OFF, check as check_validation
+from opml.parser import default_parser
+from opml.outline import OpmlOutline
+from opml.packed import HEAD_ATTRIBUTES, pack, unpack
+from itertools import compress
+from array import array
+from lxml import etree
+
+STRING_COLUMNS = (
+    'text',
+    'type',
+    'created',
+    'xml_url',
+    'description',
+    'html_url',
+    'language',
+    'title',
+    'version',
+    'url',
+    'categories',
+)
+
+XML_ATTRIBUTES = (
+    'text',
+    'type',
+    'created',
+    'xmlUrl',
+    'description',
+    'htmlUrl',
+    'language',
+    'title',
+    'version',
+    'url',
+    'category',
+)
+
+
+class OpmlTable:
+    """Outlines of a document stored as columns.
+
+    Rows are numbered in document order (i.e. parents before their children), so the descendants of an outline are
+    always the rows located between it and its :attr:`ends` item. Apart from the structural columns, each column is
+    an :class:`array.array` of codes of values stored in :attr:`strings`:
+
+    * ``created`` holds RFC 822 date-times as they appear in the XML
+    * ``categories`` holds comma-separated categories as they appear in the XML
+
+    :ivar document: The document's metadata, without any outline
+    :vartype document: opml.OpmlDocument
+    :ivar parents: Row of the parent outline of each outline, ``-1`` for top-level outlines
+    :vartype parents: array.array
+    :ivar depths: Nesting level of each outline, ``0`` being a top-level outline
+    :vartype depths: array.array
+    :ivar ends: Row following the last descendant of each outline
+    :vartype ends: array.array
+    :ivar is_comment: ``1`` for each outline that is commented, ``0`` otherwise
+    :vartype is_comment: array.array
+    :ivar is_breakpoint: ``1`` for each outline on which a breakpoint is set, ``0`` otherwise
+    :vartype is_breakpoint: array.array
+    :ivar columns: Code columns of the string attributes, by attribute name (see :data:`STRING_COLUMNS`)
+    :vartype columns: dict
+    :ivar strings: String pool. Code ``0`` is always ``None``, which empty strings are also encoded as
+    :vartype strings: list
+    """
+    def __init__(self, document=None):
+        if document is None:
+            from opml.document import OpmlDocument
+
+            document = OpmlDocument()
+
+        self.document = document
+        self.parents = array('i')
+        self.depths = array('i')
+        self.ends = array('i')
+        self.is_comment = array('b')
+        self.is_breakpoint = array('b')
+        self.columns = {
+            name: array('i') for name in STRING_COLUMNS
+        }
+        self.strings = [None]
+        self.codes = {None: 0, '': 0}
+
+    def __len__(self):
+        return len(self.parents)
+
+    def code(self, value):
+        """Return the code of a string value, adding it to the string pool if needed.
+
+        :param str value: The value
+        :rtype: int
+        """
+        code = self.codes.get(value)
+
+        if code is None:
+            code = self.codes[value] = len(self.strings)
+
+            self.strings.append(value)
+
+        return code
+
+    def get(self, row, attribute):
+        """Return the raw value of an outline's string attribute.
+
+        :param int row: Row of the outline
+        :param str attribute: One of :data:`STRING_COLUMNS`
+        :rtype: str
+        """
+        return self.strings[self.columns[attribute][row]]
+
+    def column(self, attribute):
+        """Return all the raw values of a string attribute, in row order.
+
+        :param str attribute: One of :data:`STRING_COLUMNS`
+        :rtype: list
+        """
+        return list(map(self.strings.__getitem__, self.columns[attribute]))
+
+    def children(self, row):
+        """Return the rows of the direct children of an outline, or of top-level outlines if ``row`` is ``-1``.
+
+        :param int row: Row of the outline
+        :rtype: list
+        """
+        start, stop = (0, len(self)) if row == -1 else (row + 1, self.ends[row])
+        children = []
+
+        while start < stop:
+            children.append(start)
+
+            start = self.ends[start]
+
+        return children
+
+    def path(self, row):
+        """Return the rows of the ancestors of an outline, from the top-level one to its direct parent.
+
+        :param int row: Row of the outline
+        :rtype: list
+        """
+        path = []
+        row = self.parents[row]
+
+        while row != -1:
+            path.append(row)
+
+            row = self.parents[row]
+
+        path.reverse()
+
+        return path
+
+    def select(self, under=None, **criteria):
+        """Return the rows of the outlines whose string attributes have the given raw values, in row order.
+
+        Columns are filtered as a whole instead of walking the tree. For example, all the outlines of type "rss" in the
+        folder at row ``12`` (at any level): ``table.select(under=12, type='rss')``.
+
+        :param int under: Only select descendants of the outline at this row
+        :param criteria: Raw values to look for, by attribute name (see :data:`STRING_COLUMNS`)
+        :rtype: list
+        """
+        start, stop = (0, len(self)) if under is None else (under + 1, self.ends[under])
+        rows = range(start, stop)
+
+        for attribute, value in criteria.items():
+            code = self.codes.get(value)
+
+            if code is None:
+                return []
+
+            column = self.columns[attribute]
+
+            if isinstance(rows, range):
+                rows = list(compress(rows, map(code.__eq__, column[start:stop])))
+            else:
+                rows = [row for row in rows if column[row] == code]
+
+        return list(rows)
+
+    def append(self, parent, depth, is_comment, is_breakpoint, values):
+        """Append an outline as the last row. Its ``ends`` item is set to the row following it, which must be
+        updated once its descendants have been appended.
+
+        :param int parent: Row of the parent outline, ``-1`` for a top-level outline
+        :param int depth: Nesting level of the outline
+        :param bool is_comment: Whether the outline is commented or not
+        :param bool is_breakpoint: Whether a breakpoint is set on the outline
+        :param values: Raw values of the string attributes, in the order of :data:`STRING_COLUMNS`
+        :rtype: int
+        """
+        row = len(self.parents)
+
+        self.parents.append(parent)
+        self.depths.append(depth)
+        self.ends.append(row + 1)
+        self.is_comment.append(is_comment)
+        self.is_breakpoint.append(is_breakpoint)
+
+        code = self.code
+
+        for name, value in zip(STRING_COLUMNS, values):
+            self.columns[name].append(code(value))
+
+        return row
+
+    @classmethod
+    def from_document(cls, document):
+        """Create a table from a document.
+
+        :param opml.OpmlDocument document: The document
+        :rtype: opml.table.OpmlTable
+        """
+        return cls.from_packed(pack(document), type(document))
+
+    @classmethod
+    def from_packed(cls, packed, document_class=None):
+        """Create a table from a packed document (see :mod:`opml.packed`).
+
+        :param tuple packed: The packed document
+        :param type document_class: Class of the table's document. Defaults to :class:`opml.OpmlDocument`
+        :rtype: opml.table.OpmlTable
+        """
+        if document_class is None:
+            from opml.document import OpmlDocument
+
+            document_class = OpmlDocument
+
+        head, outlines = packed
+
+        table = cls(document_class(**dict(zip(HEAD_ATTRIBUTES, head))))
+        ends = table.ends
+        dates = {}
+        stack = []
+
+        for depth, text, type, is_comment, is_breakpoint, created, xml_url, description, html_url, language, title, version, url, categories in outlines:
+            while len(stack) > depth:
+                ends[stack.pop()] = len(ends)
+
+            if created:
+                date = dates.get(created)
+
+                if date is None:
+                    date = dates[created] = datetime_to_rfc2822(created)
+
+                created = date
+
+            stack.append(table.append(stack[-1] if stack else -1, depth, is_comment, is_breakpoint, (
+                text,
+                type,
+                created,
+                xml_url,
+                description,
+                html_url,
+                language,
+                title,
+                version,
+                url,
+                ','.join(categories) if categories else None,
+            )))
+
+        for row in stack:
+            ends[row] = len(ends)
+
+        return table
+
+    @classmethod
+    def loads(cls, s, validation=STRICT, parser=None):
+        """Create a table from OPML 2.0 data given as a string, without creating any :class:`opml.OpmlOutline`.
+
+        :raises opml.exceptions.OpmlReadError:
+        :param str s: The OPML 2.0 data
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :rtype: opml.table.OpmlTable
+        """
+        return cls.unbuild_tree((parser or default_parser).fromstring(s.encode()), validation)
+
+    @classmethod
+    def load(cls, fp, validation=STRICT, parser=None):
+        """Create a table from OPML 2.0 data read from a filename or file-like object, without creating any
+        :class:`opml.OpmlOutline`.
+
+        :raises opml.exceptions.OpmlReadError:
+        :param fp: A filename or file-like object
+        :param validation: How outlines are validated: ``strict`` (raise the first error, the default), ``off`` (don't validate, for trusted data) or an :class:`opml.validation.OpmlValidator` instance (collect all the errors)
+        :param opml.parser.OpmlParser parser: The parser to use. Defaults to :data:`opml.parser.default_parser`
+        :rtype: opml.table.OpmlTable
+        """
+        return cls.unbuild_tree((parser or default_parser).parse(fp), validation)
+
+    @classmethod
+    def unbuild_tree(cls, root, validation=STRICT):
+        from opml.document import OpmlDocument
+
+        check_validation(validation)
+
+        OpmlDocument.check_root(root)
+
+        head = root.find('head')
+
+        if head is None:
+            raise OpmlReadError('"head" node not found')
+
+        document = OpmlDocument()
+        document.unbuild_head(head)
+
+        body = root.find('body')
+
+        if body is None:
+            raise OpmlReadError('"body" node not found')
+
+        table = cls(document)
+        parents = table.parents.append
+        depths = table.depths.append
+        ends = table.ends
+        is_comment = table.is_comment.append
+        is_breakpoint = table.is_breakpoint.append
+        columns = [table.columns[name].append for name in STRING_COLUMNS]
+        codes = table.codes
+        strings = table.strings
+        stack = []
+
+        for event, node in etree.iterwalk(body, events=('start', 'end'), tag='outline'):
+            if event == 'end':
+                ends[stack.pop()] = len(ends)
+
+                continue
+
+            attributes = dict(node.items())
+            values = list(map(attributes.get, XML_ATTRIBUTES))
+            text, type, created, xml_url, description, html_url, language, title, version, url, categories = values
+
+            if validation == STRICT:
+                OpmlOutline.validate(OpmlReadError, text, type, xml_url, version, url)
+            elif validation != OFF:
+                validation.validate(OpmlReadError, node, text, type, xml_url, version, url)
+
+            row = len(ends)
+
+            parents(stack[-1] if stack else -1)
+            depths(len(stack))
+            ends.append(row + 1)
+            is_comment(attributes.get('isComment') == 'true')
+            is_breakpoint(attributes.get('isBreakpoint') == 'true')
+
+            for append, value in zip(columns, values):
+                code = codes.get(value)
+
+                if code is None:
+                    code = codes[value] = len(strings)
+
+                    strings.append(value)
+
+                append(code)
+
+            stack.append(row)
+
+        return table
+
+    def pack(self):
+        """Return the table as a packed document (see :mod:`opml.packed`).
+
+        :rtype: tuple
+        """
+        head = tuple(
+            getattr(self.document, attribute) for attribute in HEAD_ATTRIBUTES
+        )
+
+        strings = self.strings
+        dates = [None] * len(strings)
+        categories = [None] * len(strings)
+
+        for code in set(self.columns['created']):
+            if code:
+                dates[code] = rfc2822_to_datetime(strings[code])
+
+        for code in set(self.columns['categories']):
+            if code:
+                categories[code] = tuple(strings[code].split(','))
+
+        columns = self.columns
+
+        return head, list(zip(
+            self.depths,
+            map(strings.__getitem__, columns['text']),
+            map(strings.__getitem__, columns['type']),
+            map(bool, self.is_comment),
+            map(bool, self.is_breakpoint),
+            map(dates.__getitem__, columns['created']),
+            map(strings.__getitem__, columns['xml_url']),
+            map(strings.__getitem__, columns['description']),
+            map(strings.__getitem__, columns['html_url']),
+            map(strings.__getitem__, columns['language']),
+            map(strings.__getitem__, columns['title']),
+            map(strings.__getitem__, columns['version']),
+            map(strings.__getitem__, columns['url']),
+            map(categories.__getitem__, columns['categories']),
+        ))
+
+    def to_document(self, document_class=None):
+        """Create a document from the table. Outlines aren't validated.
+
+        :param type document_class: Class of the returned document. Defaults to the class of :attr:`document`
+        :rtype: opml.OpmlDocument
+        """
+        return unpack(self.pack(), document_class or type(self.document))
@@ -0,0 +1,58 @@
+STRICT = 'strict'
+OFF = 'off'
+
+
+def check(validation):
+    """Raise an error if a ``validation`` argument is neither ``strict``, ``off`` nor a validator.
+
+    :raises ValueError:
+    """
+    if isinstance(validation, str) and validation not in (STRICT, OFF):
+        raise ValueError('Unsupported validation: "{}". Must be one of {}, {} or an OpmlValidator instance'.format(validation, STRICT, OFF))
+
+
+class OpmlValidator:
+    """Validator which collects all the validation errors instead of raising the first one.
+
+    Pass an instance of this class as the ``validation`` argument of :meth:`opml.OpmlDocument.load`,
+    :meth:`opml.OpmlDocument.loads`, :meth:`opml.OpmlDocument.dump` or :meth:`opml.OpmlDocument.dumps`: the document is
+    then entirely loaded or dumped, invalid outlines included, and errors may be inspected afterwards. The same instance
+    may be used several times, errors accumulating.
+
+    :ivar errors: :class:`opml.exceptions.OpmlReadError` or :class:`opml.exceptions.OpmlWriteError` instances, in the order they were encountered. Their ``path`` attribute is an XPath expression locating the invalid outline in the document (e.g. ``/opml/body/outline[2]/outline[1]``)
+    :vartype errors: list
+    """
+    def __init__(self):
+        self.errors = []
+
+    def validate(self, exception, source, text, type, xml_url, version, url):
+        from opml.outline import OpmlOutline
+
+        try:
+            OpmlOutline.validate(exception, text, type, xml_url, version, url)
+        except exception as e:
+            e.path = self.get_path(source)
+
+            self.errors.append(e)
+
+    @staticmethod
+    def get_path(source):
+        path = []
+
+        if hasattr(source, 'getparent'):
+            # Positions are always given, like for outlines, while lxml's getpath() omits them for only children
+            while source.tag == 'outline':
+                path.append('outline[{}]'.format(
+                    sum(1 for sibling in source.itersiblings(tag='outline', preceding=True)) + 1
+                ))
+
+                source = source.getparent()
+        else:
+            while getattr(source, 'parent', None) is not None:
+                path.append('outline[{}]'.format(
+                    next(i for i, outline in enumerate(source.parent.outlines, start=1) if outline is source)
+                ))
+
+                source = source.parent
+
+        return '/'.join(['/opml/body'] + list(reversed(path)))
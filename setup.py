@@ -22,7 +22,10 @@ EXTRAS = {
         'Sphinx',
         'pytest',
         'twine',
-    }
+    },
+    'zstd': {
+        'zstandard',
+    },
 }
 
 here = os.path.abspath(os.path.dirname(__file__))
@@ -0,0 +1,118 @@
+from opml import OpmlDocument, OpmlWriter
+from opml.compression import detect, infer, open_compressed
+import pytest
+import gzip
+import lzma
+import bz2
+import io
+
+OPENERS = {
+    'gzip': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
+
+
+@pytest.mark.parametrize('compression,extension', [
+    ('gzip', '.gz'),
+    ('bz2', '.bz2'),
+    ('xz', '.xz'),
+])
+def test_filename_round_trip(tmp_path, document_with_everything, compression, extension):
+    filename = str(tmp_path / ('document.opml' + extension))
+
+    document_with_everything.dump(filename, pretty=True)
+
+    assert detect(filename) == compression
+
+    with OPENERS[compression](filename, 'rb') as f:
+        assert f.read().decode() == document_with_everything.dumps(pretty=True)
+
+    assert OpmlDocument.load(filename).dumps() == document_with_everything.dumps()
+
+
+def test_file_object_round_trip(document_with_everything):
+    f = io.BytesIO()
+
+    document_with_everything.dump(f, compression='bz2')
+
+    assert f.getvalue().startswith(b'BZh')
+
+    f.seek(0)
+
+    assert OpmlDocument.load(f).dumps() == document_with_everything.dumps()
+
+
+def test_incremental(tmp_path, document_with_everything):
+    filename = str(tmp_path / 'document.opml.gz')
+
+    document_with_everything.dump(filename, incremental=True)
+
+    assert OpmlDocument.load(filename).dumps() == document_with_everything.dumps()
+
+
+def test_explicit(tmp_path, document_with_everything):
+    filename = str(tmp_path / 'document.bin')
+
+    document_with_everything.dump(filename, compression='xz')
+
+    assert infer(filename) is None
+    assert detect(filename) == 'xz'
+    assert OpmlDocument.load(filename, compression='xz').dumps() == document_with_everything.dumps()
+
+    filename = str(tmp_path / 'document.opml.gz')
+
+    document_with_everything.dump(filename, compression=None)
+
+    assert detect(filename) is None
+    assert OpmlDocument.load(filename).dumps() == document_with_everything.dumps()
+
+
+def test_uncompressed():
+    assert detect('tests/fixtures/valid.opml') is None
+    assert detect(io.StringIO('<opml/>')) is None
+
+
+def test_stream(tmp_path, document_with_everything):
+    filename = str(tmp_path / 'document.opml.xz')
+
+    with OpmlWriter(filename, document_with_everything, pretty=True) as writer:
+        writer.write_many(document_with_everything.outlines)
+
+    with lzma.open(filename, 'rb') as f:
+        assert f.read().decode() == document_with_everything.dumps(pretty=True)
+
+    iterator = OpmlDocument.iterload(filename)
+
+    assert iterator.document.title == document_with_everything.title
+    assert [outline.text for outline, depth, path in iterator if depth == 0] == [
+        outline.text for outline in document_with_everything.outlines
+    ]
+
+
+def test_cache_dir(tmp_path, document_with_everything):
+    filename = str(tmp_path / 'document.opml.gz')
+
+    document_with_everything.dump(filename)
+
+    for i in range(2):
+        document = OpmlDocument.load(filename, cache_dir=str(tmp_path / 'cache'))
+
+        assert document.dumps() == document_with_everything.dumps()
+
+
+def test_zstd(tmp_path, document_with_everything):
+    pytest.importorskip('zstandard')
+
+    filename = str(tmp_path / 'document.opml.zst')
+
+    document_with_everything.dump(filename)
+
+    assert detect(filename) == 'zstd'
+    assert OpmlDocument.load(filename).dumps() == document_with_everything.dumps()
+
+
+def test_unsupported():
+    with pytest.raises(ValueError, match='Unsupported compression'):
+        with open_compressed(io.BytesIO(), 'rb', 'rar'):
+            pass
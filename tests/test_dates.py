@@ -0,0 +1,68 @@
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timedelta, timezone
+from opml import dates
+import pytest
+
+
+@pytest.mark.parametrize('value', [
+    'Thu, 16 Sep 2021 20:07:59 -0000',
+    'Thu, 16 Sep 2021 20:07:59 +0000',
+    'Thu, 16 Sep 2021 20:07:59 +0530',
+    'Thu, 16 Sep 2021 20:07:59 -0800',
+    '16 sep 2021 20:07:59 -0000',
+    'Thu, 16 Sep 21 20:07:59 -0000',
+    'Thu, 16 Sep 0021 20:07:59 -0000',
+    'Thu, 16 Sep 2021 20:07:59 GMT',
+    'Thu, 16 Sep 2021 20:07 -0000',
+])
+def test_rfc2822_to_datetime(value):
+    dates.clear()
+
+    assert repr(dates.rfc2822_to_datetime(value)) == repr(parsedate_to_datetime(value))
+    assert dates.rfc2822_to_datetime(value) is dates.rfc2822_to_datetime(value)
+
+
+@pytest.mark.parametrize('value', [
+    'Not a date',
+    'Thu, 31 Feb 2021 20:07:59 -0000',
+])
+def test_rfc2822_to_datetime_invalid(value):
+    with pytest.raises(ValueError):
+        dates.rfc2822_to_datetime(value)
+
+
+@pytest.mark.parametrize('value', [
+    datetime(2021, 9, 16, 20, 7, 59),
+    datetime(2021, 9, 16, 20, 7, 59, tzinfo=timezone.utc),
+    datetime(2021, 9, 16, 20, 7, 59, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+    datetime(2021, 9, 16, 20, 7, 59, tzinfo=timezone(-timedelta(hours=8))),
+    datetime(2021, 9, 16, 20, 7, 59, tzinfo=timezone(timedelta(seconds=61))),
+    datetime(21, 9, 16, 20, 7, 59),
+])
+def test_datetime_to_rfc2822(value):
+    dates.clear()
+
+    assert dates.datetime_to_rfc2822(value) == format_datetime(value)
+    assert dates.datetime_to_rfc2822(value) == format_datetime(value)
+
+
+def test_datetime_to_rfc2822_same_instant():
+    utc = datetime(2021, 9, 16, 20, 7, 59, tzinfo=timezone.utc)
+    paris = datetime(2021, 9, 16, 22, 7, 59, tzinfo=timezone(timedelta(hours=2)))
+
+    assert utc == paris
+    assert dates.datetime_to_rfc2822(utc) == 'Thu, 16 Sep 2021 20:07:59 +0000'
+    assert dates.datetime_to_rfc2822(paris) == 'Thu, 16 Sep 2021 22:07:59 +0200'
+
+
+def test_bounded(monkeypatch):
+    monkeypatch.setattr(dates, 'MAX_SIZE', 2)
+
+    dates.clear()
+
+    for day in range(1, 6):
+        dates.rfc2822_to_datetime('{} Sep 2021 20:07:59 -0000'.format(day))
+        dates.datetime_to_rfc2822(datetime(2021, 9, day))
+
+    assert len(dates.parsed) <= 2
+    assert len(dates.formatted) <= 2
@@ -0,0 +1,147 @@
+from opml.diff import diff, merge
+from opml.packed import pack, unpack
+from opml import OpmlDocument
+
+
+def make_document():
+    document = OpmlDocument(title='Subscriptions')
+
+    news = document.add_outline('News')
+    news.add_rss('CIA News Feed', 'https://hendley-associates.com/feeds/cia.rss')
+    news.add_rss('FBI News Feed', 'https://hendley-associates.com/feeds/fbi.rss')
+
+    tech = document.add_outline('Tech')
+    tech.add_rss('NSA News Feed', 'https://hendley-associates.com/feeds/nsa.rss')
+    tech.add_link('Campus', 'https://hendley-associates.com/campus')
+
+    document.add_outline('Empty')
+
+    return document
+
+
+def copy(document):
+    return unpack(pack(document))
+
+
+def test_no_differences():
+    assert not diff(make_document(), make_document())
+
+
+def test_diff():
+    old = make_document()
+    new = copy(old)
+
+    new.outlines[0].outlines[0].title = 'CIA'
+    new.outlines[0].outlines[1].categories = ['intelligence']
+    new.outlines[1].remove_outline(new.outlines[1].outlines[1])
+    nsa = new.outlines[1].outlines[0]
+    new.outlines[1].remove_outline(nsa)
+    new.outlines[2].outlines.append(nsa)
+    nsa.parent = new.outlines[2]
+    new.outlines[2].add_rss('DIA News Feed', 'https://hendley-associates.com/feeds/dia.rss')
+
+    result = diff(old, new)
+
+    assert [key for key, outline in result.added] == [('xml_url', 'https://hendley-associates.com/feeds/dia.rss', 0)]
+    assert [key for key, outline in result.removed] == [('url', 'https://hendley-associates.com/campus', 0)]
+    assert [key for key, old_outline, new_outline in result.moved] == [('xml_url', 'https://hendley-associates.com/feeds/nsa.rss', 0)]
+    assert [key for key, old_outline, new_outline in result.changed] == [
+        ('xml_url', 'https://hendley-associates.com/feeds/cia.rss', 0),
+        ('xml_url', 'https://hendley-associates.com/feeds/fbi.rss', 0),
+    ]
+
+    target = copy(old)
+
+    assert result.apply(target) == []
+    assert target.dumps() == new.dumps()
+
+
+def test_duplicate_keys():
+    old = OpmlDocument()
+    old.add_outline('Folder').add_outline('Misc')
+    old.add_outline('Folder').add_outline('Misc')
+
+    new = copy(old)
+    new.outlines[1].outlines[0].title = 'Second'
+
+    result = diff(old, new)
+
+    assert [key for key, old_outline, new_outline in result.changed] == [('text', 'Misc', 1)]
+
+
+def test_merge():
+    base = make_document()
+    ours = copy(base)
+    theirs = copy(base)
+
+    ours.outlines[0].outlines[0].language = 'en_US'
+    ours.outlines[0].outlines[1].title = 'Ours'
+    ours.outlines[2].add_rss('Our feed', 'https://hendley-associates.com/feeds/ours.rss')
+
+    theirs.outlines[0].outlines[0].title = 'CIA'
+    theirs.outlines[0].outlines[1].title = 'Theirs'
+    theirs.outlines[0].add_rss('Their feed', 'https://hendley-associates.com/feeds/theirs.rss')
+    theirs.remove_outline(theirs.outlines[1])
+
+    conflicts = merge(base, ours, theirs)
+
+    assert conflicts == [(('xml_url', 'https://hendley-associates.com/feeds/fbi.rss', 0), 'Attribute "title" changed in both documents')]
+    assert [outline.text for outline in ours.outlines] == ['News', 'Empty']
+    assert [outline.text for outline in ours.outlines[0].outlines] == ['CIA News Feed', 'FBI News Feed', 'Their feed']
+    assert ours.outlines[0].outlines[0].language == 'en_US'
+    assert ours.outlines[0].outlines[0].title == 'CIA'
+    assert ours.outlines[0].outlines[1].title == 'Theirs'
+    assert ours.outlines[0].outlines[2].parent is ours.outlines[0]
+    assert [outline.text for outline in ours.outlines[1].outlines] == ['Our feed']
+
+
+def test_merge_prefer_ours():
+    base = make_document()
+    ours = copy(base)
+    theirs = copy(base)
+
+    ours.outlines[0].outlines[1].title = 'Ours'
+    theirs.outlines[0].outlines[1].title = 'Theirs'
+
+    assert len(merge(base, ours, theirs, prefer='ours')) == 1
+    assert ours.outlines[0].outlines[1].title == 'Ours'
+
+
+def test_merge_missing_parent():
+    base = make_document()
+    ours = copy(base)
+    theirs = copy(base)
+
+    ours.remove_outline(ours.outlines[2])
+    theirs.outlines[2].add_rss('Their feed', 'https://hendley-associates.com/feeds/theirs.rss')
+
+    assert merge(base, ours, theirs) == [
+        (('xml_url', 'https://hendley-associates.com/feeds/theirs.rss', 0), 'Parent outline not found in the target document'),
+    ]
+
+
+def test_merge_keeps_index():
+    base = make_document()
+    ours = copy(base)
+    theirs = copy(base)
+
+    ours.build_index()
+    theirs.outlines[2].add_rss('Their feed', 'https://hendley-associates.com/feeds/theirs.rss')
+
+    merge(base, ours, theirs)
+
+    assert ours.find_by_xml_url('https://hendley-associates.com/feeds/theirs.rss')[0][0] is ours.outlines[2].outlines[0]
+
+
+def test_merge_keeps_category_index():
+    base = make_document()
+    ours = copy(base)
+    theirs = copy(base)
+
+    ours.build_index(categories=True)
+    theirs.outlines[2].add_rss('Their feed', 'https://hendley-associates.com/feeds/theirs.rss', categories=['/Intelligence/USA'])
+
+    merge(base, ours, theirs)
+
+    assert 'category' in ours.index.tables
+    assert [outline for outline, path in ours.find_by_category('/Intelligence')] == [ours.outlines[2].outlines[0]]
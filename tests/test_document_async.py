@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from opml.exceptions import OpmlReadError, OpmlWriteError
+from test_document_unserialize import validate_valid_opml_document
+from opml.parser import OpmlParser
+from opml import OpmlDocument
+import threading
+import asyncio
+import pytest
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class AsyncFile:
+    def __init__(self, f):
+        self.f = f
+
+    async def read(self, size):
+        return self.f.read(size)
+
+    async def write(self, data):
+        return self.f.write(data)
+
+
+def test_aload():
+    filename = 'tests/fixtures/valid.opml'
+
+    with open(filename, 'r') as f:
+        file_as_string = f.read()
+
+    validate_valid_opml_document(run(OpmlDocument.aloads(file_as_string)))
+
+    validate_valid_opml_document(run(OpmlDocument.aload(filename)))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        validate_valid_opml_document(run(OpmlDocument.aload(filename, lazy=True, executor=executor)))
+
+    with open(filename, 'rb') as f:
+        validate_valid_opml_document(run(OpmlDocument.aload(f)))
+
+    with open(filename, 'rb') as f:
+        validate_valid_opml_document(run(OpmlDocument.aload(AsyncFile(f))))
+
+
+class RecordingParser(OpmlParser):
+    def create(self):
+        parser = super().create()
+        threads = self.threads
+
+        class Parser:
+            def feed(self, data):
+                threads.append(threading.get_ident())
+
+                return parser.feed(data)
+
+            def close(self):
+                threads.append(threading.get_ident())
+
+                return parser.close()
+
+        return Parser()
+
+
+def test_aload_parses_off_the_loop():
+    parser = RecordingParser()
+    parser.threads = []
+
+    validate_valid_opml_document(run(OpmlDocument.aload('tests/fixtures/valid.opml', parser=parser)))
+
+    assert parser.threads
+    assert threading.get_ident() not in parser.threads
+
+
+def test_aload_error():
+    with pytest.raises(OpmlReadError, match='"body" node not found'):
+        run(OpmlDocument.aload('tests/fixtures/no_body.opml'))
+
+
+def test_adump(document_with_everything, tmp_path):
+    with open('tests/fixtures/valid.opml', 'r') as f:
+        valid_opml_document_as_string = f.read()
+
+    filename = str(tmp_path / 'test.opml')
+
+    assert run(document_with_everything.adumps(pretty=True)) == valid_opml_document_as_string
+
+    run(document_with_everything.adump(filename, pretty=True))
+
+    with open(filename, 'r') as f:
+        assert f.read() == valid_opml_document_as_string
+
+    with open(filename, 'wb') as f:
+        run(document_with_everything.adump(AsyncFile(f), pretty=True))
+
+    with open(filename, 'r') as f:
+        assert f.read() == valid_opml_document_as_string
+
+
+def test_adump_error(document_with_rss_outline, tmp_path):
+    document_with_rss_outline.outlines[0].outlines[0].text = None
+
+    with pytest.raises(OpmlWriteError, match='Required outline attribute "text" not found'):
+        run(document_with_rss_outline.adump(str(tmp_path / 'test.opml')))
@@ -0,0 +1,161 @@
+from opml import OpmlDocument
+import pytest
+
+
+@pytest.mark.parametrize('indexed', [False, True])
+def test_find(document_with_everything, indexed):
+    if indexed:
+        document_with_everything.build_index()
+
+    results = document_with_everything.find_by_xml_url('https://hendley-associates.com/feeds/cia.rss')
+
+    assert len(results) == 1
+
+    outline, path = results[0]
+
+    assert outline.text == 'CIA News Feed'
+    assert path == (document_with_everything.outlines[0],)
+
+    results = document_with_everything.find_by_url('https://hendley-associates.com/feeds.opml')
+
+    assert [(outline.text, [parent.text for parent in path]) for outline, path in results] == [
+        ('All Feeds', ['Includes'])
+    ]
+
+    results = document_with_everything.find_by_text('Links')
+
+    assert [(outline.text, path) for outline, path in results] == [
+        ('Links', ())
+    ]
+
+    assert document_with_everything.find_by_text('Unknown') == []
+
+
+def test_index_kept_up_to_date(document_with_everything):
+    index = document_with_everything.build_index()
+
+    feeds = document_with_everything.outlines[0]
+    nested = feeds.add_outline('Nested')
+    rss = nested.add_rss('CIA News Feed', 'https://hendley-associates.com/feeds/cia.rss')
+
+    results = document_with_everything.find_by_xml_url('https://hendley-associates.com/feeds/cia.rss')
+
+    assert [path for outline, path in results] == [(feeds,), (feeds, nested)]
+    assert results[1][0] is rss
+
+    feeds.remove_outline(nested)
+
+    assert nested.parent is None
+    assert len(document_with_everything.find_by_xml_url('https://hendley-associates.com/feeds/cia.rss')) == 1
+    assert document_with_everything.find_by_text('Nested') == []
+
+    document_with_everything.remove_outline(feeds)
+
+    assert document_with_everything.find_by_xml_url('https://hendley-associates.com/feeds/cia.rss') == []
+    assert 'CIA News Feed' not in index.tables['text']
+
+    with pytest.raises(ValueError):
+        document_with_everything.remove_outline(feeds)
+
+
+def test_index_loaded_document():
+    for lazy in (False, True):
+        document = OpmlDocument.load('tests/fixtures/valid.opml', lazy=lazy)
+        document.build_index()
+
+        outline, path = document.find_by_text('All Feeds')[0]
+
+        assert outline.url == 'https://hendley-associates.com/feeds.opml'
+        assert [parent.text for parent in path] == ['Includes']
+        assert outline.get_root() is document
+
+
+@pytest.mark.parametrize('indexed', [False, True])
+def test_find_by_category(document_with_everything, indexed):
+    if indexed:
+        document_with_everything.build_index(categories=True)
+
+    feeds = document_with_everything.outlines[0]
+
+    feeds.add_rss('Russia', 'https://hendley-associates.com/feeds/russia.rss', categories=['/Intelligence/Russia'])
+
+    assert [outline.text for outline, path in document_with_everything.find_by_category('/Intelligence/USA')] == [
+        'CIA News Feed',
+        'Jack Ryan re-elected for second mandate',
+        'All Feeds',
+    ]
+
+    # Indexed outlines are found in the order they were indexed
+    assert sorted(outline.text for outline, path in document_with_everything.find_by_category('/Intelligence')) == [
+        'All Feeds',
+        'CIA News Feed',
+        'Jack Ryan re-elected for second mandate',
+        'Russia',
+    ]
+
+    assert [(outline.text, path) for outline, path in document_with_everything.find_by_category('/Intelligence/Russia')] == [
+        ('Russia', (feeds,))
+    ]
+
+    assert document_with_everything.find_by_category('/Intel') == []
+    assert document_with_everything.find_by_category('USA') == []
+
+
+def test_category_index_kept_up_to_date(document_with_everything):
+    index = document_with_everything.build_index(categories=True)
+
+    document_with_everything.remove_outline(document_with_everything.outlines[0])
+
+    assert len(document_with_everything.find_by_category('/Intelligence')) == 2
+
+    document_with_everything.remove_outline(document_with_everything.outlines[0])
+    document_with_everything.remove_outline(document_with_everything.outlines[0])
+
+    assert index.tables['category'] == {}
+
+    document_with_everything.add_outline('News', categories=['/News/World/Europe'])
+
+    assert sorted(index.tables['category']) == ['/News', '/News/World', '/News/World/Europe']
+
+
+def test_categories_interned():
+    document = OpmlDocument.load('tests/fixtures/valid.opml')
+
+    categories = [
+        outline.outlines[0].categories for outline in document.outlines
+    ]
+
+    assert categories[0] == ['/Intelligence/USA', 'intelligence']
+    assert all(category[0] is categories[0][0] for category in categories)
+
+
+def test_category_index_not_built(document_with_everything):
+    document_with_everything.build_index()
+
+    assert 'category' not in document_with_everything.index.tables
+    assert len(document_with_everything.find_by_category('intelligence')) == 3
+
+
+def test_index_deep_outlines():
+    document = OpmlDocument()
+    outline = document
+
+    for i in range(100):
+        outline = outline.add_outline('Folder')
+
+    index = document.build_index()
+
+    added = outline.add_outline('Deep')
+
+    assert added.index is index
+    assert [found for found, path in document.find_by_text('Deep')] == [added]
+
+    removed = document.outlines[0].outlines[0]
+    document.outlines[0].remove_outline(removed)
+
+    assert document.find_by_text('Deep') == []
+    assert added.index is None
+
+    removed.add_outline('Detached')
+
+    assert document.find_by_text('Detached') == []
@@ -1,3 +1,4 @@
+from opml import OpmlDocument
 from opml.exceptions import OpmlWriteError
 import pytest
 import re
@@ -89,3 +90,23 @@ def test_ok(document_with_everything, tmp_path):
         target_opml_document_as_string = f.read()
 
     assert target_opml_document_as_string == valid_opml_document_as_string
+
+
+def test_deep_outlines():
+    document = OpmlDocument()
+    outline = document
+
+    for i in range(5000):
+        outline = outline.add_outline('Outline {}'.format(i))
+
+    document = OpmlDocument.unbuild_tree(document.build_tree())
+
+    depth = 0
+    outline = document
+
+    while outline.outlines:
+        outline = outline.outlines[0]
+        depth += 1
+
+    assert depth == 5000
+    assert outline.text == 'Outline 4999'
@@ -0,0 +1,191 @@
+from opml import OpmlDocument, OpmlOutline, OpmlWriter
+from opml.exceptions import OpmlReadError, OpmlWriteError
+from datetime import datetime
+import pytest
+import re
+
+
+def run_read_error_suite(filename, error_message):
+    with pytest.raises(OpmlReadError, match=error_message):
+        list(OpmlDocument.iterload(filename))
+
+    with pytest.raises(OpmlReadError, match=error_message):
+        with open(filename, 'rb') as f:
+            list(OpmlDocument.iterload(f))
+
+
+def test_not_an_opml_document():
+    run_read_error_suite(
+        'tests/fixtures/not_an_opml_document.xml',
+        'Not an OPML document'
+    )
+
+
+def test_no_version():
+    run_read_error_suite(
+        'tests/fixtures/no_version.opml',
+        '"version" attribute not found in root node'
+    )
+
+
+def test_no_head():
+    run_read_error_suite(
+        'tests/fixtures/no_head.opml',
+        '"head" node not found'
+    )
+
+
+def test_no_body():
+    run_read_error_suite(
+        'tests/fixtures/no_body.opml',
+        '"body" node not found'
+    )
+
+
+def test_rss_outline_missing_xml_url():
+    run_read_error_suite(
+        'tests/fixtures/rss_outline_missing_xml_url.opml',
+        re.escape('"xml_url" attribute is required for outlines of type "rss" (outline: "CIA News Feed")')
+    )
+
+
+def test_valid():
+    filename = 'tests/fixtures/valid.opml'
+
+    with open(filename, 'r') as f:
+        iterator = OpmlDocument.iterload(f)
+
+        assert iterator.document.title == 'Hendley Associates Feed'
+        assert isinstance(iterator.document.date_created, datetime)
+        assert iterator.document.expansion_state == ['2', '5']
+        assert iterator.document.outlines == []
+
+        items = list(iterator)
+
+    assert [(outline.text, depth, [parent.text for parent in path]) for outline, depth, path in items] == [
+        ('CIA News Feed', 1, ['Feeds']),
+        ('Feeds', 0, []),
+        ('Jack Ryan re-elected for second mandate', 1, ['Links']),
+        ('Links', 0, []),
+        ('All Feeds', 1, ['Includes']),
+        ('Includes', 0, []),
+    ]
+
+    rss_outline, depth, path = items[0]
+
+    assert isinstance(rss_outline, OpmlOutline)
+    assert rss_outline.type == 'rss'
+    assert rss_outline.xml_url == 'https://hendley-associates.com/feeds/cia.rss'
+    assert rss_outline.categories == ['/Intelligence/USA', 'intelligence']
+    assert rss_outline.outlines == []
+    assert path[0] is items[1][0]
+
+
+def test_frees_processed_nodes(tmp_path):
+    document = OpmlDocument()
+
+    for i in range(100):
+        folder = document.add_outline('Folder {}'.format(i))
+
+        for j in range(10):
+            folder.add_rss('Feed {}'.format(j), 'https://example.com/{}/{}.rss'.format(i, j))
+
+    filename = str(tmp_path / 'big.opml')
+
+    document.dump(filename)
+
+    iterator = OpmlDocument.iterload(filename)
+
+    assert sum(1 for item in iterator) == 1100
+
+    body = iterator.root.find('body')
+
+    assert len(body) == 1
+    assert len(body[0]) == 0
+
+
+def test_writer_ok(document_with_everything, tmp_path):
+    with open('tests/fixtures/valid.opml', 'rb') as f:
+        valid_opml_document_as_bytes = f.read()
+
+    filename = str(tmp_path / 'test.opml')
+
+    with OpmlWriter(filename, document_with_everything, pretty=True) as writer:
+        writer.write_many(document_with_everything.outlines)
+
+    with open(filename, 'rb') as f:
+        assert f.read() == valid_opml_document_as_bytes
+
+    with open(filename, 'wb') as f:
+        with OpmlWriter(f, document_with_everything, pretty=True) as writer:
+            for outline in document_with_everything.outlines:
+                with writer.outline(outline.text):
+                    for child in outline.outlines:
+                        writer.write(child)
+
+    with open(filename, 'rb') as f:
+        assert f.read() == valid_opml_document_as_bytes
+
+
+def write_outlines(writer, outlines):
+    for outline in outlines:
+        if outline.outlines:
+            with writer.outline(outline.text, type=outline.type, url=outline.url):
+                write_outlines(writer, outline.outlines)
+        else:
+            writer.write(outline)
+
+
+@pytest.mark.parametrize('pretty', [False, True])
+def test_writer_same_as_dump(document_with_everything, tmp_path, pretty):
+    filename = str(tmp_path / 'test.opml')
+
+    document_with_everything.add_outline('Empty folder')
+
+    nested = document_with_everything.add_outline('Nested')
+
+    for i in range(3):
+        nested = nested.add_link('Level {}'.format(i), 'https://example.com/{}'.format(i))
+
+    with OpmlWriter(filename, document_with_everything, pretty=pretty) as writer:
+        write_outlines(writer, document_with_everything.outlines)
+
+    with open(filename, 'r') as f:
+        assert f.read() == document_with_everything.dumps(pretty=pretty)
+
+    with OpmlWriter(filename, OpmlDocument(), pretty=pretty):
+        pass
+
+    with open(filename, 'r') as f:
+        assert f.read() == OpmlDocument().dumps(pretty=pretty)
+
+
+def test_writer_deep_outlines(tmp_path):
+    filename = str(tmp_path / 'test.opml')
+    document = OpmlDocument()
+    nested = document
+
+    # libxml2 stops indenting past 30 levels
+    for i in range(40):
+        nested = nested.add_outline('Level {}'.format(i))
+
+    with OpmlWriter(filename, document, pretty=True) as writer:
+        write_outlines(writer, document.outlines)
+
+    with open(filename, 'r') as f:
+        assert f.read() == document.dumps(pretty=True)
+
+    with OpmlWriter(filename, document, pretty=True) as writer:
+        writer.write(document.outlines[0])
+
+    with open(filename, 'r') as f:
+        assert f.read() == document.dumps(pretty=True)
+
+
+def test_writer_error(tmp_path):
+    filename = str(tmp_path / 'test.opml')
+
+    with pytest.raises(OpmlWriteError, match=re.escape('"url" attribute is required for outlines of type "link" and "include" (outline: "Link")')):
+        with OpmlWriter(filename) as writer:
+            with writer.outline('Links'):
+                writer.write(OpmlOutline('Link', type='link'))
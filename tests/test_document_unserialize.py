@@ -1,5 +1,7 @@
 from opml import OpmlDocument, OpmlOutline
+from opml.outline import LazyOpmlOutline
 from opml.exceptions import OpmlReadError
+from opml.validation import OpmlValidator
 from datetime import datetime
 import pytest
 import re
@@ -179,3 +181,74 @@ def test_valid():
 
     with open(filename, 'r') as f:
         validate_valid_opml_document(OpmlDocument.load(f))
+
+
+def test_valid_lazy():
+    filename = 'tests/fixtures/valid.opml'
+
+    with open(filename, 'r') as f:
+        file_as_string = f.read()
+
+    validate_valid_opml_document(OpmlDocument.loads(file_as_string, lazy=True))
+
+    validate_valid_opml_document(OpmlDocument.load(filename, lazy=True))
+
+    with open(filename, 'r') as f:
+        validate_valid_opml_document(OpmlDocument.load(f, lazy=True))
+
+
+def test_lazy_outlines_materialization():
+    document = OpmlDocument.load('tests/fixtures/valid.opml', lazy=True)
+
+    feeds_outline = document.outlines[0]
+
+    assert isinstance(feeds_outline, LazyOpmlOutline)
+    assert feeds_outline._node is not None
+
+    assert feeds_outline.text == 'Feeds'
+    assert feeds_outline._node is None
+
+    rss_outline = feeds_outline.outlines[0]
+
+    assert isinstance(rss_outline, LazyOpmlOutline)
+    assert rss_outline._node is not None
+
+    rss_outline.language = 'fr_FR'
+
+    assert rss_outline._node is None
+    assert rss_outline.language == 'fr_FR'
+    assert rss_outline.version == 'RSS2'
+
+    with pytest.raises(AttributeError):
+        rss_outline.unknown
+
+    assert 'language="fr_FR"' in document.dumps()
+
+
+def test_lazy_outline_read_error():
+    document = OpmlDocument.load('tests/fixtures/rss_outline_missing_xml_url.opml', lazy=True)
+
+    rss_outline = document.outlines[0].outlines[0]
+
+    for i in range(2):
+        with pytest.raises(OpmlReadError, match=re.escape('"xml_url" attribute is required for outlines of type "rss" (outline: "CIA News Feed")')):
+            rss_outline.text
+
+
+def test_lazy_outline_validation():
+    validator = OpmlValidator()
+
+    document = OpmlDocument.load('tests/fixtures/rss_outline_missing_xml_url.opml', lazy=True, validation=validator)
+
+    assert validator.errors == []
+
+    assert document.outlines[0].outlines[0].text == 'CIA News Feed'
+
+    assert [error.path for error in validator.errors] == ['/opml/body/outline[1]/outline[1]']
+
+    document = OpmlDocument.load('tests/fixtures/rss_outline_missing_xml_url.opml', lazy=True, validation='off')
+
+    assert document.outlines[0].outlines[0].text == 'CIA News Feed'
+
+    with pytest.raises(ValueError):
+        OpmlDocument.load('tests/fixtures/valid.opml', lazy=True, validation='collect')
@@ -0,0 +1,179 @@
+from opml.includes import IncludeResolver, DictFetcher, FileFetcher
+from opml.exceptions import OpmlReadError
+from opml import OpmlDocument
+import pytest
+import re
+
+OPML_TEMPLATE = '''<?xml version='1.0' encoding='UTF-8'?>
+<opml version="2.0">
+  <head/>
+  <body>{}</body>
+</opml>'''
+
+
+class CountingFetcher(DictFetcher):
+    def __init__(self, documents):
+        super(CountingFetcher, self).__init__(documents)
+
+        self.calls = []
+
+    def __call__(self, url):
+        self.calls.append(url)
+
+        return super(CountingFetcher, self).__call__(url)
+
+
+def test_resolve():
+    fetcher = CountingFetcher({
+        'https://example.com/feeds.opml': OPML_TEMPLATE.format(
+            '<outline text="CIA" type="rss" xmlUrl="https://example.com/cia.rss"/>'
+            '<outline text="More" type="include" url="more/feeds.opml"/>'
+        ),
+        'https://example.com/more/feeds.opml': OPML_TEMPLATE.format(
+            '<outline text="FBI" type="rss" xmlUrl="https://example.com/fbi.rss"/>'
+        ),
+    })
+
+    document = OpmlDocument()
+    document.build_index()
+
+    folder = document.add_outline('Folder')
+    folder.add_include('All Feeds', 'https://example.com/feeds.opml')
+    document.add_include('All Feeds again', 'https://example.com/feeds.opml')
+
+    assert document.resolve_includes(fetcher) is document
+
+    assert sorted(fetcher.calls) == ['https://example.com/feeds.opml', 'https://example.com/more/feeds.opml']
+
+    include = folder.outlines[0]
+
+    assert [outline.text for outline in include.outlines] == ['CIA', 'More']
+    assert [outline.text for outline in include.outlines[1].outlines] == ['FBI']
+    assert include.outlines[0].parent is include
+
+    include_again = document.outlines[1]
+
+    assert [outline.text for outline in include_again.outlines] == ['CIA', 'More']
+    assert include_again.outlines[0] is not include.outlines[0]
+
+    assert [[parent.text for parent in path] for outline, path in document.find_by_xml_url('https://example.com/fbi.rss')] == [
+        ['Folder', 'All Feeds', 'More'],
+        ['All Feeds again', 'More'],
+    ]
+
+
+def test_resolve_twice():
+    fetcher = CountingFetcher({
+        'https://example.com/feeds.opml': OPML_TEMPLATE.format(
+            '<outline text="CIA" type="rss" xmlUrl="https://example.com/cia.rss"/>'
+            '<outline text="More" type="include" url="more/feeds.opml"/>'
+        ),
+        'https://example.com/more/feeds.opml': OPML_TEMPLATE.format(
+            '<outline text="FBI" type="rss" xmlUrl="https://example.com/fbi.rss"/>'
+        ),
+    })
+
+    document = OpmlDocument()
+    document.add_include('All Feeds', 'https://example.com/feeds.opml')
+
+    document.resolve_includes(fetcher)
+    document.resolve_includes(fetcher)
+
+    include = document.outlines[0]
+
+    assert [outline.text for outline in include.outlines] == ['CIA', 'More']
+    assert [outline.text for outline in include.outlines[1].outlines] == ['FBI']
+
+    document = OpmlDocument.loads(document.dumps())
+    document.resolve_includes(fetcher)
+
+    include = document.outlines[0]
+
+    assert [outline.text for outline in include.outlines] == ['CIA', 'More']
+    assert [outline.text for outline in include.outlines[1].outlines] == ['FBI']
+
+
+def test_cycle():
+    fetcher = DictFetcher({
+        'https://example.com/a.opml': OPML_TEMPLATE.format('<outline text="B" type="include" url="b.opml"/>'),
+        'https://example.com/b.opml': OPML_TEMPLATE.format('<outline text="A" type="include" url="a.opml"/>'),
+    })
+
+    document = OpmlDocument()
+    document.add_include('A', 'https://example.com/a.opml')
+
+    with pytest.raises(OpmlReadError, match=re.escape('Include cycle detected: https://example.com/a.opml -> https://example.com/b.opml -> https://example.com/a.opml')):
+        document.resolve_includes(fetcher)
+
+    document = OpmlDocument()
+    document.add_include('B', 'b.opml')
+
+    with pytest.raises(OpmlReadError, match='Include cycle detected'):
+        document.resolve_includes(fetcher, base_url='https://example.com/a.opml')
+
+
+def test_max_depth():
+    fetcher = DictFetcher({
+        'https://example.com/{}.opml'.format(i): OPML_TEMPLATE.format(
+            '<outline text="{0}" type="include" url="{0}.opml"/>'.format(i + 1)
+        ) for i in range(10)
+    })
+
+    document = OpmlDocument()
+    document.add_include('0', 'https://example.com/0.opml')
+
+    with pytest.raises(OpmlReadError, match='Includes are nested deeper than 3 levels'):
+        document.resolve_includes(fetcher, max_depth=3)
+
+
+def test_invalid_included_document():
+    fetcher = DictFetcher({
+        'https://example.com/a.opml': OPML_TEMPLATE.format('<outline type="rss"/>'),
+    })
+
+    document = OpmlDocument()
+    document.add_include('A', 'https://example.com/a.opml')
+
+    with pytest.raises(OpmlReadError, match='Required outline attribute "text" not found'):
+        document.resolve_includes(fetcher)
+
+    with pytest.raises(OpmlReadError, match=re.escape('Could not include "b.opml": Included document not found')):
+        IncludeResolver(fetcher).resolve(OpmlDocument.loads(OPML_TEMPLATE.format('<outline text="B" type="include" url="b.opml"/>')))
+
+
+def test_file_fetcher(tmp_path):
+    (tmp_path / 'feeds.opml').write_text(OPML_TEMPLATE.format('<outline text="CIA" type="rss" xmlUrl="https://example.com/cia.rss"/>'))
+
+    document = OpmlDocument()
+    document.add_include('All Feeds', 'feeds.opml')
+
+    IncludeResolver(FileFetcher(str(tmp_path))).resolve(document)
+
+    assert document.outlines[0].outlines[0].text == 'CIA'
+
+
+def test_file_fetcher_url(tmp_path):
+    (tmp_path / 'my feeds.opml').write_text(OPML_TEMPLATE.format('<outline text="CIA" type="rss" xmlUrl="https://example.com/cia.rss"/>'))
+
+    document = OpmlDocument()
+    document.add_include('All Feeds', (tmp_path / 'my feeds.opml').as_uri())
+
+    IncludeResolver(FileFetcher()).resolve(document)
+
+    assert document.outlines[0].outlines[0].text == 'CIA'
+
+
+def test_fetch_errors(tmp_path):
+    (tmp_path / 'broken.opml').write_text('<opml version="2.0"><body>')
+
+    document = OpmlDocument()
+    document.add_include('Missing', 'missing.opml')
+
+    with pytest.raises(OpmlReadError, match='Could not include "missing.opml"'):
+        IncludeResolver(FileFetcher(str(tmp_path))).resolve(document)
+
+    document = OpmlDocument()
+    document.add_include('Broken', 'broken.opml')
+
+    with pytest.raises(OpmlReadError, match='Could not include "broken.opml"'):
+        IncludeResolver(FileFetcher(str(tmp_path))).resolve(document)
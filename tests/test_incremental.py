@@ -0,0 +1,113 @@
+from opml.exceptions import OpmlWriteError
+from opml.validation import OpmlValidator
+from opml import OpmlDocument, OpmlOutline
+from opml.incremental import find_changes
+import pytest
+
+
+def make_document():
+    document = OpmlDocument(title='Subscriptions')
+
+    for i in range(3):
+        folder = document.add_outline('Folder {}'.format(i))
+
+        for j in range(3):
+            sub_folder = folder.add_outline('Sub-folder {}.{}'.format(i, j))
+
+            for k in range(3):
+                sub_folder.add_rss('Feed {}.{}.{}'.format(i, j, k), 'https://hendley-associates.com/feeds/{}/{}/{}.rss'.format(i, j, k))
+
+    return document
+
+
+@pytest.mark.parametrize('pretty', [False, True])
+def test_incremental(pretty):
+    document = make_document()
+
+    assert document.dumps(pretty=pretty, incremental=True) == document.dumps(pretty=pretty)
+    assert document.dumps(pretty=pretty, incremental=True) == document.dumps(pretty=pretty)
+
+    document.outlines[1].outlines[2].outlines[0].title = 'Changed'
+    document.outlines[0].outlines[0].outlines[1].categories.append('intelligence')
+    document.outlines[2].add_link('Added', 'https://hendley-associates.com')
+    document.outlines[0].remove_outline(document.outlines[0].outlines[2])
+
+    moved = document.outlines[2].outlines.pop(0)
+    document.outlines[1].outlines[0].outlines.append(moved)
+    moved.parent = document.outlines[1].outlines[0]
+
+    assert document.dumps(pretty=pretty, incremental=True) == document.dumps(pretty=pretty)
+    assert document.dumps(pretty=pretty, incremental=True) == document.dumps(pretty=pretty)
+
+    document.outlines.clear()
+
+    assert document.dumps(pretty=pretty, incremental=True) == document.dumps(pretty=pretty)
+
+
+def test_deep_outlines():
+    document = OpmlDocument()
+    nested = document
+
+    # libxml2 stops indenting past 30 levels
+    for i in range(40):
+        nested = nested.add_outline('Level {}'.format(i))
+
+    assert document.dumps(pretty=True, incremental=True) == document.dumps(pretty=True)
+
+    nested.add_outline('Added')
+
+    assert document.dumps(pretty=True, incremental=True) == document.dumps(pretty=True)
+
+
+def test_find_changes():
+    document = make_document()
+
+    assert len(find_changes(document)) == 39
+
+    document.dumps(incremental=True)
+
+    assert find_changes(document) == {}
+
+    changed = document.outlines[1].outlines[2].outlines[0]
+    changed.title = 'Changed'
+
+    assert set(find_changes(document)) == {id(changed), id(changed.parent), id(changed.parent.parent)}
+
+
+def test_pretty_change():
+    document = make_document()
+
+    document.dumps(incremental=True)
+
+    assert document.dumps(pretty=True, incremental=True) == document.dumps(pretty=True)
+
+
+def test_dump(tmp_path):
+    document = make_document()
+    filename = str(tmp_path / 'document.opml')
+
+    document.dump(filename, pretty=True, incremental=True)
+
+    with open(filename, 'r') as f:
+        assert f.read() == document.dumps(pretty=True)
+
+
+def test_validation():
+    document = make_document()
+    document.outlines[0].outlines.append(OpmlOutline('Invalid', type='rss'))
+
+    assert 'Invalid' in document.dumps(validation='off', incremental=True)
+
+    with pytest.raises(OpmlWriteError):
+        document.dumps(incremental=True)
+
+    document.outlines[0].outlines[-1].xml_url = 'https://hendley-associates.com/feeds/invalid.rss'
+
+    assert document.dumps(incremental=True) == document.dumps()
+
+    validator = OpmlValidator()
+    document.outlines[0].outlines[-1].xml_url = None
+
+    document.dumps(validation=validator, incremental=True)
+
+    assert len(validator.errors) == 1
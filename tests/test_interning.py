@@ -0,0 +1,45 @@
+from opml.interning import InternTable, TABLES, clear
+from opml import OpmlDocument
+
+
+def test_intern_table():
+    table = InternTable(2)
+    value = ''.join(['r', 's', 's'])
+
+    assert table.intern(None) is None
+    assert table.intern(value) is value
+    assert table.intern(''.join(['r', 's', 's'])) is value
+    assert len(table) == 1
+
+    table.intern('link')
+    table.intern('include')
+
+    # Full: the table started over
+    assert len(table) == 1
+    assert table.intern(''.join(['r', 's', 's'])) is not value
+
+    table.clear()
+
+    assert len(table) == 0
+
+
+def test_loaded_values_shared():
+    document = OpmlDocument.loads('''<?xml version='1.0' encoding='UTF-8'?>
+<opml version="2.0">
+  <head/>
+  <body>
+    <outline text="A" type="rss" xmlUrl="https://example.com/a.rss" htmlUrl="https://example.com/" language="en_US" version="RSS2" category="news"/>
+    <outline text="B" type="rss" xmlUrl="https://example.com/b.rss" htmlUrl="https://example.com/" language="en_US" version="RSS2" category="news,tech"/>
+  </body>
+</opml>''')
+
+    a, b = document.outlines
+
+    for attribute in ('type', 'html_url', 'language', 'version'):
+        assert getattr(a, attribute) is getattr(b, attribute)
+
+    assert a.categories[0] is b.categories[0]
+
+    clear()
+
+    assert all(len(table) == 0 for table in TABLES.values())
@@ -0,0 +1,118 @@
+from opml import OpmlDocument
+import pytest
+
+
+def make_document(expansion_state=None, vert_scroll_state=None):
+    document = OpmlDocument(expansion_state=expansion_state or [], vert_scroll_state=vert_scroll_state)
+
+    a = document.add_outline('a')
+    a1 = a.add_outline('a1')
+    a1.add_outline('a1x')
+    a1.add_outline('a1y')
+    a.add_outline('a2')
+    b = document.add_outline('b')
+    b.add_outline('b1')
+    document.add_outline('c')
+
+    return document
+
+
+def texts(window):
+    return [outline.text for outline, depth in window]
+
+
+def test_collapsed():
+    lines = make_document().build_lines()
+
+    assert len(lines) == 3
+    assert texts(lines.visible_window(1, 10)) == ['a', 'b', 'c']
+    assert lines.get_expansion_state() == []
+
+
+def test_expansion_state():
+    # Lines are counted once the previous ones are expanded: a, a1, a1x, a1y, a2, b
+    document = make_document(expansion_state=['1', '2', '6'], vert_scroll_state='2')
+    lines = document.build_lines()
+
+    assert len(lines) == 8
+    assert lines.visible_window(count=3) == [
+        (document.outlines[0].outlines[0], 1),
+        (document.outlines[0].outlines[0].outlines[0], 2),
+        (document.outlines[0].outlines[0].outlines[1], 2),
+    ]
+    assert lines.get_expansion_state() == [1, 2, 6]
+    assert lines.get_outline(8) is document.outlines[2]
+    assert lines.get_line(document.outlines[1].outlines[0]) == 7
+
+    with pytest.raises(IndexError):
+        lines.get_outline(9)
+
+
+def test_expand_collapse():
+    document = make_document()
+    lines = document.build_lines()
+    a = document.outlines[0]
+    a1 = a.outlines[0]
+
+    lines.expand(a1)
+
+    assert len(lines) == 3
+    assert lines.get_line(a1) is None
+    assert lines.is_expanded(a1)
+
+    lines.expand(a)
+
+    assert texts(lines.visible_window(1, 10)) == ['a', 'a1', 'a1x', 'a1y', 'a2', 'b', 'c']
+    assert lines.get_line(document.outlines[2]) == 7
+
+    lines.collapse(a1)
+
+    assert texts(lines.visible_window(2, 10)) == ['a1', 'a2', 'b', 'c']
+    assert lines.get_expansion_state() == [1]
+
+    lines.collapse(a)
+    lines.expand(a)
+
+    assert texts(lines.visible_window(1, 3)) == ['a', 'a1', 'a2']
+    assert lines.visible_window(10, 3) == []
+
+
+def test_large():
+    document = OpmlDocument()
+
+    for i in range(100):
+        folder = document.add_outline(str(i))
+
+        for j in range(10):
+            folder.add_outline('{}.{}'.format(i, j))
+
+    lines = document.build_lines()
+
+    for folder in document.outlines[::2]:
+        lines.expand(folder)
+
+    expected = []
+
+    for i, folder in enumerate(document.outlines):
+        expected.append(folder)
+
+        if i % 2 == 0:
+            expected.extend(folder.outlines)
+
+    assert len(lines) == len(expected)
+    assert [lines.get_outline(line) for line in range(1, len(lines) + 1)] == expected
+    assert [lines.get_line(outline) for outline in expected] == list(range(1, len(expected) + 1))
+    assert [outline for outline, depth in lines.visible_window(500, 20)] == expected[499:519]
+
+    reloaded = OpmlDocument(expansion_state=lines.get_expansion_state())
+    reloaded.outlines = document.outlines
+
+    assert reloaded.build_lines().visible_window(1, len(expected)) == lines.visible_window(1, len(expected))
+
+
+def test_empty():
+    lines = OpmlDocument(expansion_state=['1']).build_lines()
+
+    assert len(lines) == 0
+    assert lines.visible_window() == []
+    assert lines.get_expansion_state() == []
@@ -0,0 +1,74 @@
+from opml.exceptions import OpmlReadError
+from opml.packed import pack, unpack
+from opml import OpmlDocument
+import shutil
+import pickle
+import re
+
+
+def test_pack_unpack(document_with_everything):
+    document_with_everything.outlines[0].outlines[0].add_outline('Nested')
+
+    packed = pickle.loads(pickle.dumps(pack(document_with_everything)))
+    document = unpack(packed)
+
+    assert document.dumps(pretty=True) == document_with_everything.dumps(pretty=True)
+    assert document.outlines[0].outlines[0].outlines[0].parent is document.outlines[0].outlines[0]
+    assert document.outlines[0].parent is document
+
+
+def test_load_many(tmp_path):
+    paths = []
+
+    for name in ('valid.opml', 'no_body.opml', 'valid.opml', 'not_an_opml_document.xml'):
+        path = str(tmp_path / '{}-{}'.format(len(paths), name))
+
+        shutil.copy('tests/fixtures/{}'.format(name), path)
+
+        paths.append(path)
+
+    paths.append(str(tmp_path / 'missing.opml'))
+
+    with open('tests/fixtures/valid.opml', 'r') as f:
+        expected = OpmlDocument.load(f).dumps()
+
+    results = list(OpmlDocument.load_many(paths, workers=2))
+
+    assert [path for path, document in results] == paths
+
+    assert results[0][1].dumps() == expected
+    assert results[2][1].dumps() == expected
+
+    for index, message in ((1, '"body" node not found'), (3, 'Not an OPML document'), (4, 'missing.opml')):
+        assert isinstance(results[index][1], OpmlReadError)
+        assert message in str(results[index][1])
+
+    results = list(OpmlDocument.load_many(paths, workers=2, ordered=False))
+
+    assert sorted(path for path, document in results) == sorted(paths)
+
+
+def test_load_many_invalid_date(tmp_path):
+    paths = []
+
+    for i in range(3):
+        path = str(tmp_path / '{}.opml'.format(i))
+
+        shutil.copy('tests/fixtures/valid.opml', path)
+
+        paths.append(path)
+
+    with open(paths[1], 'r') as f:
+        data = f.read()
+
+    assert '<dateCreated>' in data
+
+    with open(paths[1], 'w') as f:
+        f.write(re.sub(r'<dateCreated>[^<]*</dateCreated>', '<dateCreated>Not a date</dateCreated>', data))
+
+    results = list(OpmlDocument.load_many(paths, workers=2))
+
+    assert [path for path, document in results] == paths
+    assert isinstance(results[0][1], OpmlDocument)
+    assert isinstance(results[1][1], OpmlReadError)
+    assert isinstance(results[2][1], OpmlDocument)
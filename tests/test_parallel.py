@@ -0,0 +1,72 @@
+from opml.exceptions import OpmlWriteError
+from opml.fragments import is_supported
+from opml.parallel import split
+from opml.packed import pack_outlines
+from opml.validation import OpmlValidator
+from opml import OpmlDocument
+import pytest
+
+
+def make_document():
+    document = OpmlDocument(title='Subscriptions')
+
+    for i in range(8):
+        folder = document.add_outline('Folder {} & <co>'.format(i))
+
+        for j in range(i):
+            sub_folder = folder.add_outline('Sub-folder {}.{}'.format(i, j))
+
+            for k in range(3):
+                sub_folder.add_rss('Feed {}.{}.{} é'.format(i, j, k), 'https://hendley-associates.com/feeds/{}/{}/{}.rss'.format(i, j, k), categories=['a', 'b'])
+
+    document.add_link('Link', 'https://hendley-associates.com')
+
+    return document
+
+
+@pytest.mark.parametrize('pretty', [False, True])
+@pytest.mark.parametrize('encoding', ['UTF-8', 'ascii'])
+def test_parallel(pretty, encoding):
+    document = make_document()
+
+    assert document.serialize(pretty=pretty, encoding=encoding, workers=2) == document.serialize(pretty=pretty, encoding=encoding)
+    assert document.serialize(pretty=pretty, encoding=encoding, workers=1) == document.serialize(pretty=pretty, encoding=encoding)
+
+    document.outlines.clear()
+
+    assert document.serialize(pretty=pretty, encoding=encoding, workers=2) == document.serialize(pretty=pretty, encoding=encoding)
+
+
+def test_parallel_dump(tmp_path):
+    document = make_document()
+    path = tmp_path / 'parallel.opml'
+
+    document.dump(str(path), pretty=True, workers=2)
+
+    assert path.read_text() == document.dumps(pretty=True)
+
+
+def test_parallel_invalid():
+    document = make_document()
+    document.outlines[5].add_rss('Invalid', '')
+
+    with pytest.raises(OpmlWriteError):
+        document.dumps(workers=2)
+
+
+def test_split():
+    outlines = pack_outlines(make_document().outlines)
+    chunks = split(outlines, 4)
+
+    assert 1 < len(chunks) <= 4
+    assert [outline for chunk in chunks for outline in chunk] == outlines
+    assert all(chunk[0][0] == 0 for chunk in chunks)
+
+    assert split(outlines[:1], 4) == [outlines[:1]]
+
+
+def test_is_supported():
+    assert is_supported('UTF-8', 'strict')
+    assert is_supported('ascii', 'off')
+    assert not is_supported('UTF-16', 'strict')
+    assert not is_supported('UTF-8', OpmlValidator())
@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+from opml.parser import OpmlParser, default_parser
+from test_document_async import run
+from opml import OpmlDocument
+from opml.table import OpmlTable
+
+EXTERNAL_ENTITY = '''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE opml [<!ENTITY secret SYSTEM "file://{}">]>
+<opml version="2.0">
+  <head>
+    <title>&secret;</title>
+  </head>
+  <body>
+    <outline text="Feed" type="rss" xmlUrl="https://hendley-associates.com/feeds/cia.rss"/>
+  </body>
+</opml>'''
+
+INTERNAL_ENTITY = '''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE opml [<!ENTITY name "Hendley Associates">]>
+<opml version="2.0">
+  <head>
+    <ownerName>&name;</ownerName>
+  </head>
+  <body/>
+</opml>'''
+
+
+def test_external_entities(tmp_path):
+    secret = tmp_path / 'secret.txt'
+    secret.write_text('s3cr3t')
+
+    document = OpmlDocument.loads(EXTERNAL_ENTITY.format(secret))
+
+    assert 's3cr3t' not in document.dumps()
+
+
+def test_internal_entities():
+    assert not OpmlDocument.loads(INTERNAL_ENTITY).owner_name
+    assert OpmlDocument.loads(INTERNAL_ENTITY, parser=OpmlParser(resolve_entities=True)).owner_name == 'Hendley Associates'
+
+
+def test_blank_text():
+    with open('tests/fixtures/valid.opml', 'rb') as f:
+        root = default_parser.parse(f)
+
+    assert root.find('body').text is None
+    assert root.find('head').findtext('title') == 'Hendley Associates Feed'
+
+    with open('tests/fixtures/valid.opml', 'rb') as f:
+        root = OpmlParser(remove_blank_text=False).parse(f)
+
+    assert root.find('body').text.strip() == ''
+
+
+def test_per_thread():
+    parser = OpmlParser()
+
+    assert parser.parser is parser.parser
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(lambda: parser.parser).result()
+
+    assert other is not parser.parser
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        documents = list(executor.map(lambda i: OpmlDocument.load('tests/fixtures/valid.opml', parser=parser), range(16)))
+
+    assert len({document.dumps() for document in documents}) == 1
+
+
+def test_options():
+    parser = OpmlParser(huge_tree=True, remove_comments=False)
+
+    assert parser.options['huge_tree'] is True
+    assert parser.options['remove_comments'] is False
+    assert parser.parser is not default_parser.parser
+
+
+def test_load_variants():
+    parser = OpmlParser(resolve_entities=True)
+    expected = OpmlDocument.load('tests/fixtures/valid.opml').dumps()
+
+    with open('tests/fixtures/valid.opml') as f:
+        s = f.read()
+
+    assert OpmlDocument.loads(s, parser=parser).dumps() == expected
+    assert OpmlDocument.load('tests/fixtures/valid.opml', parser=parser).dumps() == expected
+    assert run(OpmlDocument.aload('tests/fixtures/valid.opml', parser=parser)).dumps() == expected
+    assert OpmlDocument.iterload('tests/fixtures/valid.opml', parser=parser).document.title == 'Hendley Associates Feed'
+    assert OpmlTable.load('tests/fixtures/valid.opml', parser=parser).to_document().dumps() == expected
@@ -0,0 +1,143 @@
+from opml.profiling import OpmlStats
+from opml.exceptions import OpmlReadError, OpmlWriteError
+from opml.validation import OpmlValidator
+from opml import OpmlDocument
+import pytest
+import io
+import os
+
+
+def test_loads(document_with_everything):
+    document_with_everything.outlines[0].outlines[0].add_outline('Nested')
+
+    data = document_with_everything.dumps()
+    stats = OpmlStats()
+
+    document = OpmlDocument.loads(data, stats=stats)
+
+    assert document.dumps() == data
+    assert set(stats.times) == {'parse', 'unbuild', 'validate', 'dates'}
+    assert stats.loads == 1
+    assert stats.outlines == 7
+    assert stats.dates == 3
+    assert stats.max_depth == 3
+    assert stats.bytes_in == len(data.encode())
+
+    OpmlDocument.loads(data, validation='off', stats=stats)
+
+    assert stats.loads == 2
+    assert stats.outlines == 14
+
+
+def test_load(tmp_path, document_with_everything):
+    path = str(tmp_path / 'document.opml.gz')
+    stats = OpmlStats()
+
+    document_with_everything.dump(path, pretty=True, stats=stats)
+
+    assert set(stats.times) == {'build', 'serialize', 'validate', 'dates'}
+    assert stats.dumps == 1
+    assert stats.bytes_out == os.path.getsize(path)
+
+    document = OpmlDocument.load(path, stats=stats)
+
+    assert document.dumps(pretty=True) == document_with_everything.dumps(pretty=True)
+    assert {'parse', 'unbuild'} <= set(stats.times)
+    assert stats.bytes_in == stats.bytes_out
+
+    OpmlDocument.load(path, cache_dir=str(tmp_path / 'cache'), stats=stats)
+
+    assert 'snapshot' in stats.times
+    assert stats.loads == 2
+
+
+def test_dumps(document_with_everything):
+    stats = OpmlStats()
+
+    assert document_with_everything.dumps(stats=stats) == document_with_everything.dumps()
+    assert document_with_everything.dumps(incremental=True, stats=stats) == document_with_everything.dumps()
+    assert stats.dumps == 2
+    assert stats.outlines == 12
+
+
+def test_errors():
+    stats = OpmlStats()
+
+    with pytest.raises(OpmlReadError):
+        OpmlDocument.load('tests/fixtures/missing_outline_text_attribute.opml', stats=stats)
+
+    validator = OpmlValidator()
+
+    OpmlDocument.load('tests/fixtures/missing_outline_text_attribute.opml', validation=validator, stats=stats)
+
+    assert len(validator.errors) == 1
+
+    document = OpmlDocument()
+    document.add_rss('Invalid', '')
+
+    with pytest.raises(OpmlWriteError):
+        document.dumps(stats=stats)
+
+    assert stats.times['validate'] > 0
+
+
+def test_unsupported_validation(document_with_everything):
+    with pytest.raises(ValueError):
+        OpmlDocument.load('tests/fixtures/valid.opml', validation='collect', stats=OpmlStats())
+
+    with pytest.raises(ValueError):
+        document_with_everything.dumps(validation='collect', stats=OpmlStats())
+
+
+def test_as_dict():
+    stats = OpmlStats()
+
+    with stats.phase('parse'):
+        pass
+
+    values = stats.as_dict()
+
+    assert values['parse_seconds'] >= 0
+    assert values['outlines'] == 0
+    assert 'parse_seconds=' in repr(stats)
+
+
+def test_load_file_objects(tmp_path, document_with_everything):
+    path = str(tmp_path / 'document.opml')
+
+    document_with_everything.dump(path, pretty=True)
+
+    expected = document_with_everything.dumps(pretty=True)
+
+    for mode in ('r', 'rb'):
+        stats = OpmlStats()
+
+        with open(path, mode) as f:
+            assert OpmlDocument.load(f, stats=stats).dumps(pretty=True) == expected
+
+        assert stats.bytes_in == os.path.getsize(path)
+
+    class Unseekable(io.RawIOBase):
+        def __init__(self, data):
+            self.data = io.BytesIO(data)
+
+        def readable(self):
+            return True
+
+        def readinto(self, buffer):
+            return self.data.readinto(buffer)
+
+    stats = OpmlStats()
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    assert OpmlDocument.load(Unseekable(data), stats=stats).dumps(pretty=True) == expected
+    assert stats.bytes_in == len(data)
+
+    stats = OpmlStats()
+    output = io.BytesIO()
+
+    document_with_everything.dump(output, pretty=True, stats=stats)
+
+    assert stats.bytes_out == len(output.getvalue())
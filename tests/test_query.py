@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+from opml.query import OpmlQuery, where, contains, category, depth, under, has_children
+from opml.validation import OpmlValidator
+from opml.exceptions import OpmlReadError
+from opml.outline import LazyOpmlOutline
+from opml import OpmlDocument
+import pytest
+
+DOCUMENT = '''<?xml version='1.0' encoding='UTF-8'?>
+<opml version="2.0">
+  <head/>
+  <body>
+    <outline text="Feeds">
+      <outline text="USA">
+        <outline text="CIA" type="rss" xmlUrl="https://example.com/cia.rss" category="/Intelligence/USA,intelligence"/>
+        <outline text="FBI" type="rss" xmlUrl="https://example.com/fbi.rss" category="/Intelligence/USA"/>
+      </outline>
+      <outline text="Russia" isComment="true">
+        <outline text="SVR" type="rss" xmlUrl="https://example.com/svr.rss" category="intelligence"/>
+      </outline>
+    </outline>
+    <outline text="Links">
+      <outline text="CIA" type="link" url="https://example.com/cia.html" category="intelligence"/>
+      <outline text="It's &quot;quoted&quot;" type="link" url="https://example.com/quoted.html"/>
+    </outline>
+  </body>
+</opml>'''
+
+
+def texts(query, **kvargs):
+    return [outline.text for outline in OpmlDocument.selects(DOCUMENT, query, **kvargs)]
+
+
+def test_where():
+    assert texts(where(type='rss')) == ['CIA', 'FBI', 'SVR']
+    assert texts(where(type='link', text='CIA')) == ['CIA']
+    assert texts(where(type=None)) == ['Feeds', 'USA', 'Russia', 'Links']
+    assert texts(where(is_comment=True)) == ['Russia']
+    assert texts(where(xml_url='https://example.com/fbi.rss')) == ['FBI']
+    assert texts(where(text='It\'s "quoted"')) == ['It\'s "quoted"']
+
+    with pytest.raises(ValueError):
+        where(xmlUrl='https://example.com/fbi.rss')
+
+
+def test_contains():
+    assert texts(contains('url', 'cia')) == ['CIA']
+    assert texts(contains('text', '"')) == ['It\'s "quoted"']
+
+
+def test_category():
+    assert texts(category('intelligence')) == ['CIA', 'SVR', 'CIA']
+    assert texts(category('/Intelligence/USA')) == ['CIA', 'FBI']
+    assert texts(category('/Intelligence')) == []
+
+
+def test_depth():
+    assert texts(depth(max=0)) == ['Feeds', 'Links']
+    assert texts(depth(min=2)) == ['CIA', 'FBI', 'SVR']
+    assert texts(depth(min=1, max=1)) == ['USA', 'Russia', 'CIA', 'It\'s "quoted"']
+
+
+def test_under():
+    assert texts(where(type='rss') & under(where(text='Russia'))) == ['SVR']
+    assert texts(category('intelligence') & under(where(text='Feeds') & depth(max=0))) == ['CIA', 'SVR']
+    assert texts(under(where(is_comment=True))) == ['SVR']
+
+
+def test_operators():
+    assert texts(where(type='rss') & ~category('intelligence')) == ['FBI']
+    assert texts(where(type='link') | where(text='SVR')) == ['SVR', 'CIA', 'It\'s "quoted"']
+    assert texts(has_children() & ~where(text='Feeds')) == ['USA', 'Russia', 'Links']
+    assert texts(OpmlQuery('@type="link" and not(@category)')) == ['It\'s "quoted"']
+
+
+def test_materialization():
+    outlines = OpmlDocument.selects(DOCUMENT, where(text='USA'))
+
+    assert len(outlines) == 1
+    assert outlines[0].parent is None
+    assert [outline.text for outline in outlines[0].outlines] == ['CIA', 'FBI']
+    assert outlines[0].outlines[0].categories == ['/Intelligence/USA', 'intelligence']
+
+    outlines = OpmlDocument.selects(DOCUMENT, where(text='USA'), lazy=True)
+
+    assert isinstance(outlines[0], LazyOpmlOutline)
+    assert [outline.text for outline in outlines[0].outlines] == ['CIA', 'FBI']
+
+
+def test_select(tmp_path):
+    filename = str(tmp_path / 'document.opml')
+
+    with open(filename, 'w') as f:
+        f.write(DOCUMENT)
+
+    assert [outline.text for outline in OpmlDocument.select(filename, where(type='rss'))] == ['CIA', 'FBI', 'SVR']
+
+
+def test_validation():
+    with open('tests/fixtures/rss_outline_missing_xml_url.opml') as f:
+        s = f.read()
+
+    with pytest.raises(OpmlReadError):
+        OpmlDocument.selects(s, where(type='rss'))
+
+    assert len(OpmlDocument.selects(s, where(type='link'))) == 1
+    assert len(OpmlDocument.selects(s, where(type='rss'), validation='off')) == 1
+
+    validator = OpmlValidator()
+
+    assert len(OpmlDocument.selects(s, where(type='rss'), validation=validator)) == 1
+    assert len(validator.errors) == 1
+
+
+def test_not_an_opml_document():
+    with pytest.raises(OpmlReadError):
+        OpmlDocument.select('tests/fixtures/not_an_opml_document.xml', where(type='rss'))
+
+    with pytest.raises(OpmlReadError):
+        OpmlDocument.select('tests/fixtures/no_body.opml', where(type='rss'))
+
+
+def test_queries_from_threads():
+    def build(i):
+        return [where(text='Feed {}'.format(i), type='rss') & category('news') for j in range(200)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        queries = [query for queries in executor.map(build, range(16)) for query in queries]
+
+    names = [name for query in queries for name in query.variables]
+
+    assert len(names) == len(set(names))
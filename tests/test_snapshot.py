@@ -0,0 +1,75 @@
+from email.utils import parsedate_to_datetime as rfc2822_to_datetime
+from opml.exceptions import OpmlReadError
+from opml import OpmlDocument, snapshot
+import pytest
+import shutil
+import os
+
+
+def test_round_trip(document_with_everything):
+    document_with_everything.outlines[0].outlines[0].created = rfc2822_to_datetime('Thu, 16 Sep 2021 22:07:59 +0200')
+    document_with_everything.date_modified = None
+
+    data = snapshot.dumps(document_with_everything, key='key')
+
+    assert snapshot.loads(data, key='key').dumps() == document_with_everything.dumps()
+    assert snapshot.loads(data, key='other key') is None
+    assert snapshot.loads(b'not a snapshot') is None
+
+
+def test_validated():
+    document = OpmlDocument()
+
+    assert snapshot.loads(snapshot.dumps(document, validated=False), validated=True) is None
+    assert snapshot.loads(snapshot.dumps(document, validated=True), validated=False) is not None
+
+
+def test_cache_filename(tmp_path):
+    filename = str(tmp_path / 'document.opml')
+    cache_dir = str(tmp_path / 'cache')
+
+    shutil.copy('tests/fixtures/valid.opml', filename)
+
+    document = OpmlDocument.load(filename, cache_dir=cache_dir)
+
+    snapshots = os.listdir(cache_dir)
+
+    assert len(snapshots) == 1
+
+    cached_document = OpmlDocument.load(filename, cache_dir=cache_dir)
+
+    assert cached_document is not document
+    assert cached_document.dumps() == document.dumps()
+    assert os.listdir(cache_dir) == snapshots
+
+    document.add_outline('New outline')
+    document.dump(filename)
+
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert OpmlDocument.load(filename, cache_dir=cache_dir).outlines[-1].text == 'New outline'
+    assert os.listdir(cache_dir) == snapshots
+
+
+def test_cache_file_object(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+
+    with open('tests/fixtures/valid.opml', 'rb') as f:
+        document = OpmlDocument.load(f, cache_dir=cache_dir)
+
+    with open('tests/fixtures/valid.opml', 'rb') as f:
+        assert OpmlDocument.load(f, cache_dir=cache_dir).dumps() == document.dumps()
+
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_cache_validation(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+
+    document = OpmlDocument.load('tests/fixtures/rss_outline_missing_xml_url.opml', validation='off', cache_dir=cache_dir)
+
+    assert document.outlines[0].outlines[0].xml_url is None
+
+    with pytest.raises(OpmlReadError):
+        OpmlDocument.load('tests/fixtures/rss_outline_missing_xml_url.opml', cache_dir=cache_dir)
@@ -0,0 +1,89 @@
+from opml.exceptions import OpmlReadError
+from opml.validation import OpmlValidator
+from opml.table import OpmlTable
+from opml import OpmlDocument
+import pytest
+
+
+def test_from_document_round_trip(document_with_everything):
+    table = OpmlTable.from_document(document_with_everything)
+
+    assert len(table) == 6
+    assert list(table.parents) == [-1, 0, -1, 2, -1, 4]
+    assert list(table.depths) == [0, 1, 0, 1, 0, 1]
+    assert list(table.ends) == [2, 2, 4, 4, 6, 6]
+    assert table.document.title == 'Hendley Associates Feed'
+    assert table.to_document().dumps() == document_with_everything.dumps()
+
+
+def test_load():
+    table = OpmlTable.load('tests/fixtures/valid.opml')
+
+    assert table.column('text') == [
+        'Feeds',
+        'CIA News Feed',
+        'Links',
+        'Jack Ryan re-elected for second mandate',
+        'Includes',
+        'All Feeds',
+    ]
+    assert table.get(1, 'created') == 'Thu, 16 Sep 2021 20:07:59 -0000'
+    assert table.get(1, 'categories') == '/Intelligence/USA,intelligence'
+    assert table.get(0, 'type') is None
+    assert table.document.owner_name == 'Gerry Hendley'
+
+    with open('tests/fixtures/valid.opml', 'r') as f:
+        assert table.to_document().dumps(pretty=True) == OpmlDocument.loads(f.read()).dumps(pretty=True)
+
+
+def test_strings_are_interned():
+    table = OpmlTable.load('tests/fixtures/valid.opml')
+
+    assert table.columns['created'][1] == table.columns['created'][3] == table.columns['created'][5]
+    assert table.strings.count('Thu, 16 Sep 2021 20:07:59 -0000') == 1
+
+
+def test_select():
+    document = OpmlDocument()
+    folder = document.add_outline('Folder')
+    sub_folder = folder.add_outline('Sub-folder')
+    sub_folder.add_rss('Feed 1', 'https://hendley-associates.com/feeds/1.rss', language='en_US')
+    folder.add_link('Link', 'https://hendley-associates.com')
+    folder.add_rss('Feed 2', 'https://hendley-associates.com/feeds/2.rss')
+    document.add_rss('Feed 3', 'https://hendley-associates.com/feeds/3.rss', language='en_US')
+
+    table = OpmlTable.from_document(document)
+
+    assert table.select(type='rss') == [2, 4, 5]
+    assert table.select(under=0, type='rss') == [2, 4]
+    assert table.select(under=1, type='rss') == [2]
+    assert table.select(type='rss', language='en_US') == [2, 5]
+    assert table.select(type='unknown') == []
+    assert table.children(-1) == [0, 5]
+    assert table.children(0) == [1, 3, 4]
+    assert table.path(2) == [0, 1]
+
+
+def test_validation():
+    with pytest.raises(OpmlReadError, match='"xml_url" attribute is required'):
+        OpmlTable.load('tests/fixtures/rss_outline_missing_xml_url.opml')
+
+    validator = OpmlValidator()
+
+    table = OpmlTable.load('tests/fixtures/rss_outline_missing_xml_url.opml', validation=validator)
+
+    assert len(table) == 6
+    assert [error.path for error in validator.errors] == ['/opml/body/outline[1]/outline[1]']
+
+    with pytest.raises(ValueError):
+        OpmlTable.load('tests/fixtures/valid.opml', validation='collect')
+
+
+@pytest.mark.parametrize('filename, error_message', [
+    ('tests/fixtures/no_head.opml', '"head" node not found'),
+    ('tests/fixtures/no_body.opml', '"body" node not found'),
+    ('tests/fixtures/unsupported_version.opml', 'This package only supports OPML 2.0 specification'),
+])
+def test_invalid_documents(filename, error_message):
+    with pytest.raises(OpmlReadError, match=error_message):
+        OpmlTable.load(filename)
@@ -0,0 +1,102 @@
+from opml import OpmlDocument, OpmlOutline
+from opml.exceptions import OpmlReadError, OpmlWriteError
+from opml.validation import OpmlValidator
+import pytest
+
+
+def test_collect_load():
+    validator = OpmlValidator()
+
+    document = OpmlDocument.load('tests/fixtures/rss_outline_missing_xml_url.opml', validation=validator)
+
+    assert len(document.outlines) == 3
+    assert document.outlines[0].outlines[0].text == 'CIA News Feed'
+    assert document.outlines[0].outlines[0].xml_url is None
+
+    assert len(validator.errors) == 1
+    assert isinstance(validator.errors[0], OpmlReadError)
+    assert validator.errors[0].path == '/opml/body/outline[1]/outline[1]'
+    assert '"xml_url" attribute is required' in str(validator.errors[0])
+
+
+def test_collect_loads_accumulates():
+    with open('tests/fixtures/link_outline_missing_url.opml', 'r') as f:
+        link = f.read()
+
+    with open('tests/fixtures/include_outline_missing_url.opml', 'r') as f:
+        include = f.read()
+
+    validator = OpmlValidator()
+
+    OpmlDocument.loads(link, validation=validator)
+    OpmlDocument.loads(include, validation=validator)
+
+    assert [error.path for error in validator.errors] == [
+        '/opml/body/outline[2]/outline[1]',
+        '/opml/body/outline[3]/outline[1]',
+    ]
+
+
+def test_collect_dumps(document):
+    document.add_outline('Valid')
+    folder = document.add_outline('Folder')
+    folder.add_link('Valid link', 'https://hendley-associates.com')
+    folder.outlines.append(OpmlOutline('Invalid link', type='link'))
+    folder.outlines[-1].parent = folder
+    folder.outlines.append(OpmlOutline('Invalid rss', type='rss'))
+    folder.outlines[-1].parent = folder
+
+    validator = OpmlValidator()
+
+    dumped = document.dumps(validation=validator)
+
+    assert '<outline text="Invalid link" type="link"/>' in dumped
+    assert [error.path for error in validator.errors] == [
+        '/opml/body/outline[2]/outline[2]',
+        '/opml/body/outline[2]/outline[3]',
+    ]
+    assert all(isinstance(error, OpmlWriteError) for error in validator.errors)
+
+
+def test_strict_is_default(document):
+    document.outlines.append(OpmlOutline('Invalid link', type='link'))
+
+    with pytest.raises(OpmlWriteError):
+        document.dumps()
+
+    with pytest.raises(OpmlWriteError):
+        document.dumps(validation='strict')
+
+
+def test_off(document):
+    document.outlines.append(OpmlOutline('Invalid link', type='link'))
+
+    assert '<outline text="Invalid link" type="link"/>' in document.dumps(validation='off')
+
+    document = OpmlDocument.load('tests/fixtures/rss_outline_missing_xml_url.opml', validation='off')
+
+    assert document.outlines[0].outlines[0].type == 'rss'
+
+
+def test_same_paths_on_read_and_write():
+    read = OpmlValidator()
+    document = OpmlDocument.load('tests/fixtures/rss_outline_missing_xml_url.opml', validation=read)
+
+    written = OpmlValidator()
+    document.dumps(validation=written)
+
+    assert [error.path for error in read.errors] == [error.path for error in written.errors]
+
+
+@pytest.mark.parametrize('validation', ['collect', 'STRICT'])
+def test_unsupported_validation(document, validation):
+    document.add_outline('Valid')
+
+    with pytest.raises(ValueError):
+        document.dumps(validation=validation)
+
+    with pytest.raises(ValueError):
+        OpmlDocument.load('tests/fixtures/valid.opml', validation=validation)
+
+    with pytest.raises(ValueError):
+        OpmlDocument().dumps(validation=validation)
@@ -0,0 +1,78 @@
+from opml import OpmlDocument
+import pytest
+
+
+def make_document():
+    document = OpmlDocument()
+
+    a = document.add_outline('a')
+    a1 = a.add_outline('a1')
+    a1.add_outline('a1x')
+    a.add_outline('a2')
+    b = document.add_outline('b')
+    b.add_outline('b1')
+
+    return document
+
+
+@pytest.mark.parametrize('order, expected', [
+    ('pre', ['a', 'a1', 'a1x', 'a2', 'b', 'b1']),
+    ('post', ['a1x', 'a1', 'a2', 'a', 'b1', 'b']),
+    ('breadth', ['a', 'b', 'a1', 'a2', 'b1', 'a1x']),
+])
+def test_walk(order, expected):
+    document = make_document()
+    items = list(document.walk(order))
+
+    assert [outline.text for outline, depth, parent in items] == expected
+
+    for outline, depth, parent in items:
+        assert parent is outline.parent
+        assert depth == len(outline.get_path())
+
+    assert [outline.text for outline in document.iter_outlines(order)] == expected
+
+
+@pytest.mark.parametrize('order, expected', [
+    ('pre', ['a', 'a1', 'a2', 'b', 'b1']),
+    ('post', ['a1', 'a2', 'a', 'b1', 'b']),
+    ('breadth', ['a', 'b', 'a1', 'a2', 'b1']),
+])
+def test_walk_prune(order, expected):
+    document = make_document()
+
+    assert [
+        outline.text for outline in document.iter_outlines(order, prune=lambda outline, depth: outline.text == 'a1')
+    ] == expected
+
+
+def test_walk_outline():
+    document = make_document()
+
+    assert [
+        (outline.text, depth) for outline, depth, parent in document.outlines[0].walk()
+    ] == [('a1', 0), ('a1x', 1), ('a2', 0)]
+
+    assert list(document.outlines[1].outlines[0].walk()) == []
+
+
+def test_walk_deep():
+    document = OpmlDocument()
+    outline = document
+
+    for i in range(10000):
+        outline = outline.add_outline(str(i))
+
+    assert sum(1 for outline in document.iter_outlines('post')) == 10000
+    assert list(document.walk())[-1][1] == 9999
+
+
+def test_walk_lazy():
+    document = OpmlDocument.loads(make_document().dumps(), lazy=True)
+
+    assert [outline.text for outline in document.iter_outlines()] == ['a', 'a1', 'a1x', 'a2', 'b', 'b1']
+
+
+def test_walk_invalid_order():
+    with pytest.raises(ValueError):
+        make_document().iter_outlines('random')